@@ -137,7 +137,7 @@ def get_news_endpoint(symbol: str = "BTCUSDT", hours: int = 1):
         
         # Fetch news
         print(f"\n[GET NEWS] Fetching news for {symbol} ({hours}h)...")
-        news_list = fetch_all_news(symbol, hours)
+        news_list = fetch_all_news(symbol, hours, include_duplicates=True)
         
         if not news_list:
             # Nếu không có tin, vẫn trả về response với empty list
@@ -16,13 +16,15 @@ MONGO_URI = os.getenv(
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "cryptonews")
 
 
-def fetch_all_news(symbol: str, hours: int = 1) -> List[Dict]:
+def fetch_all_news(symbol: str, hours: int = 1, include_duplicates: bool = False) -> List[Dict]:
     """
     Lấy TẤT CẢ tin liên quan đến symbol trong N giờ gần đây
     
     Args:
         symbol: BTCUSDT, ETHUSDT, ...
         hours: Số giờ lấy tin (default: 1)
+        include_duplicates: Lấy cả tin trùng lặp (ExtraJson.duplicateOf, do crawler
+            đánh dấu bằng SimHash) - mặc định bỏ qua để mỗi câu chuyện chỉ tính 1 lần
     
     Returns:
         List of news dicts (KHÔNG LIMIT)
@@ -49,6 +51,10 @@ def fetch_all_news(symbol: str, hours: int = 1) -> List[Dict]:
             except:
                 extra = {}
             
+            # Bản sao gần giống của tin từ nguồn khác -> không đếm lại
+            if not include_duplicates and isinstance(extra, dict) and extra.get('duplicateOf'):
+                continue
+            
             symbols = extra.get('symbols', [])
             trading_pairs = extra.get('trading_pairs', [])
             
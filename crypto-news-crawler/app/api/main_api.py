@@ -6,7 +6,7 @@ FastAPI application for serving news, prices, analysis, and user management.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
@@ -16,7 +16,8 @@ from bson import ObjectId
 
 from app.core.storage import db_session
 from app.core.storage import BACKEND as STORAGE_BACKEND
-from app.services.sentiment_analyzer import analyze_news_sentiment, batch_analyze_sentiment
+from app.core.crawl_metrics import read_metrics_file, render_prometheus
+from app.services.sentiment_analyzer import analyze_news_sentiment_batch, batch_analyze_sentiment, sentiment_status, warm_up
 # TODO: from app.services.binance_service import get_binance_service
 # TODO: from app.services.ai_service import get_ai_service
 
@@ -39,6 +40,13 @@ TEMPLATES_DIR.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
+@app.on_event("startup")
+def start_sentiment_warmup():
+    # Load FinBERT in the background so the server accepts requests immediately
+    if os.getenv("SENTIMENT_WARMUP", "1") == "1":
+        warm_up(background=True)
+
+
 # ============ Schemas ============
 
 class NewsItemSchema(BaseModel):
@@ -88,7 +96,14 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "sentiment": sentiment_status()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Crawler metrics (Prometheus text format) from CRAWL_METRICS_FILE written by the crawler process."""
+    text = read_metrics_file()
+    return PlainTextResponse(text if text is not None else render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 # ============ News Endpoints ============
@@ -149,6 +164,16 @@ def get_news(
                         src_docs = list(db.NewsSources.find({"_id": {"$in": obj_ids}}))
                         src_map = {str(s["_id"]): s for s in src_docs}
 
+                # If sentiment missing, compute in one batch without updating DB (to keep read-only)
+                missing = [a for a in articles if a.get("SentimentLabel") is None]
+                computed = {}
+                if missing:
+                    results = analyze_news_sentiment_batch([
+                        {"title": a.get("Title") or "", "content": a.get("Content") or "", "summary": a.get("Summary") or ""}
+                        for a in missing
+                    ])
+                    computed = {id(a): r for a, r in zip(missing, results)}
+
                 news_list = []
                 for a in articles:
                     src_doc = src_map.get(a.get("SourceId"))
@@ -156,13 +181,8 @@ def get_news(
                     sentiment_score = a.get("SentimentScore")
                     sentiment_label = a.get("SentimentLabel")
 
-                    # If sentiment missing, compute without updating DB (to keep read-only)
                     if sentiment_label is None:
-                        sres = analyze_news_sentiment(
-                            title=a.get("Title") or "",
-                            content=a.get("Content") or "",
-                            summary=a.get("Summary") or ""
-                        )
+                        sres = computed[id(a)]
                         sentiment_score = sres["score"]
                         sentiment_label = sres["label"]
 
@@ -202,19 +222,20 @@ def get_news(
                 (News.Summary.ilike(search_term))
             )
         articles = query.offset(offset).limit(limit).all()
-        news_list = []
-        for article in articles:
-            source_name = article.source_ref.Code if article.source_ref else "unknown"
-            if not article.SentimentLabel:
-                sentiment_res = analyze_news_sentiment(
-                    title=article.Title or "",
-                    content=article.Content or "",
-                    summary=article.Summary or ""
-                )
+        missing = [a for a in articles if not a.SentimentLabel]
+        if missing:
+            results = analyze_news_sentiment_batch([
+                {"title": a.Title or "", "content": a.Content or "", "summary": a.Summary or ""}
+                for a in missing
+            ])
+            for article, sentiment_res in zip(missing, results):
                 article.SentimentScore = sentiment_res["score"]
                 article.SentimentLabel = sentiment_res["label"]
                 article.SentimentModel = "VADER"
-                db.commit()
+            db.commit()
+        news_list = []
+        for article in articles:
+            source_name = article.source_ref.Code if article.source_ref else "unknown"
             news_list.append({
                 "id": article.Id,
                 "source": source_name,
@@ -0,0 +1,145 @@
+"""
+app/core/article_document.py
+
+ArticleDocument: one fetched article page, parsed once.
+
+Holds the raw page, a single lxml tree and indexes built in one pass over the
+tree: <meta> tags by (attribute, value), canonical/og:url links, the first
+<time> element and the decoded JSON-LD blocks. Extraction steps (title,
+content, date, author) read from these indexes and query the tree with
+compiled CSS/XPath selectors instead of rescanning the page. A BeautifulSoup
+tree is only built if some caller still asks for `soup`.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from app.core.fetcher import fetch_html
+
+# Attributes a <meta> tag can be keyed by in extraction configs
+_META_ATTRS = ("name", "property", "itemprop")
+
+_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+# Same strings BeautifulSoup's get_text() returns: no comments, scripts, styles or templates
+_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+@lru_cache(maxsize=512)
+def compile_selector(selector: str) -> Optional[Callable]:
+    """Compiled CSS selector (XPath when it starts with '/' or '('); None if unsupported."""
+    try:
+        if selector.lstrip().startswith(("/", "(")):
+            return etree.XPath(selector)
+        return CSSSelector(selector, translator="html")
+    except Exception as e:
+        print(f"[Article] Unsupported selector {selector!r}: {e}")
+        return None
+
+
+def element_text(el, sep: str = "") -> str:
+    """Stripped text nodes of `el` joined by `sep` (BeautifulSoup get_text(sep, strip=True))."""
+    return sep.join(t for t in (s.strip() for s in _TEXT(el)) if t)
+
+
+class ArticleDocument:
+    def __init__(self, url: str, html: str = "", raw: Optional[bytes] = None) -> None:
+        self.url = url
+        self.html = html or ""
+        self._raw = raw
+        self._soup: Optional[BeautifulSoup] = None
+        try:
+            self.tree = lxml.html.document_fromstring(self.html.encode("utf-8"), parser=_PARSER)
+        except (etree.ParserError, ValueError):
+            self.tree = lxml.html.document_fromstring("<html></html>")  # empty or unparseable page
+        self._meta: Dict[Tuple[str, str], Any] = {}
+        self.canonical_urls: List[str] = []
+        self.time_tag = None
+        # One entry per <script type="application/ld+json">: the list of top-level items
+        self.jsonld: List[List[Any]] = []
+        self._index()
+
+    @staticmethod
+    def download(url: str) -> str:
+        """Page HTML for `url`; empty string on HTTP errors."""
+        try:
+            return fetch_html(url)
+        except Exception as e:
+            print(f"[Article] Fetch failed for {url}: {e}")
+            return ""
+
+    @classmethod
+    def fetch(cls, url: str) -> "ArticleDocument":
+        """Fetch `url` once; on HTTP errors return an empty document."""
+        return cls(url, cls.download(url))
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """BeautifulSoup tree of the page, built on first use."""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "lxml")
+        return self._soup
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            self._raw = self.html.encode("utf-8")
+        return self._raw
+
+    def _index(self) -> None:
+        canonical = None
+        og_url = None
+        for el in self.tree.iter("meta", "link", "script", "time"):
+            name = el.tag
+            if name == "meta":
+                for attr in _META_ATTRS:
+                    val = el.get(attr)
+                    if isinstance(val, str) and val:
+                        # Keep the first occurrence, like soup.find() would
+                        self._meta.setdefault((attr, val), el)
+            elif name == "link":
+                rel = (el.get("rel") or "").lower().split()
+                if canonical is None and "canonical" in rel and el.get("href"):
+                    canonical = str(el.get("href")).strip()
+            elif name == "script":
+                if el.get("type") == "application/ld+json":
+                    try:
+                        data = json.loads(el.text or "{}")
+                    except Exception:
+                        continue
+                    self.jsonld.append(data if isinstance(data, list) else [data])
+            elif name == "time" and self.time_tag is None:
+                self.time_tag = el
+        og = self._meta.get(("property", "og:url"))
+        if og is not None and og.get("content"):
+            og_url = str(og.get("content")).strip()
+        self.canonical_urls = [u for u in (canonical, og_url) if u]
+
+    def meta(self, attr: str, value: str):
+        """First <meta {attr}="{value}"> element, if any."""
+        return self._meta.get((attr, value))
+
+    def meta_content(self, attr: str, value: str) -> Optional[str]:
+        el = self._meta.get((attr, value))
+        content = el.get("content") if el is not None else None
+        return content or None
+
+    def jsonld_items(self) -> List[Any]:
+        return [it for items in self.jsonld for it in items]
+
+    # ---------- Selectors on the lxml tree ----------
+    def select(self, selector: str) -> List[Any]:
+        """Elements matching a CSS (or XPath) selector, in document order."""
+        compiled = compile_selector(selector)
+        if compiled is None:
+            return []
+        return [el for el in compiled(self.tree) if isinstance(el, etree._Element)]
+
+    def select_one(self, selector: str):
+        found = self.select(selector)
+        return found[0] if found else None
@@ -0,0 +1,137 @@
+"""
+app/core/article_writer.py
+
+Buffered bulk writer for normalized articles.
+
+Articles are queued with `add()` and written with one unordered insert_many per
+source when the buffer reaches WRITE_BATCH_SIZE articles or the oldest queued
+article is older than WRITE_FLUSH_SECONDS. Duplicate URLs are reported per
+article (callback receives None) without failing the rest of the batch; an
+article whose write failed (insert error, DB unavailable) gets INSERT_FAILED,
+so the caller can retry it instead of taking it for a duplicate.
+Pending articles are flushed on `close()` and at interpreter exit.
+
+Env vars:
+- WRITE_BATCH_SIZE (default 50)      # articles per insert_many
+- WRITE_FLUSH_SECONDS (default 2)    # max time an article waits in the buffer
+"""
+
+import atexit
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.storage import INSERT_FAILED, db_session, insert_articles
+
+# Called with the inserted id, None for a duplicate, or INSERT_FAILED
+SavedCallback = Callable[[object], None]
+
+
+class ArticleWriter:
+    def __init__(self, batch_size: Optional[int] = None, flush_seconds: Optional[float] = None) -> None:
+        self.batch_size = max(1, batch_size or int(os.getenv("WRITE_BATCH_SIZE", "50")))
+        self.flush_seconds = flush_seconds or float(os.getenv("WRITE_FLUSH_SECONDS", "2"))
+        self._buffer: List[Tuple[object, dict, Optional[SavedCallback]]] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+        # Serializes flushes so callbacks run in insertion order
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self.stats: Dict[str, int] = {"queued": 0, "inserted": 0, "duplicates": 0, "flushes": 0, "errors": 0}
+        # source_id -> [seconds spent in bulk inserts, number of inserts]
+        self._write_time: Dict[object, List[float]] = {}
+
+    def _ensure_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._timer_loop, name="article-writer", daemon=True)
+            self._timer.start()
+
+    def _timer_loop(self) -> None:
+        while not self._stop.wait(min(1.0, self.flush_seconds)):
+            with self._lock:
+                due = self._oldest is not None and time.time() - self._oldest >= self.flush_seconds
+            if due:
+                self.flush()
+
+    def add(self, source_id, article: dict, on_saved: Optional[SavedCallback] = None) -> None:
+        """Queue one normalized article for `source_id`."""
+        with self._lock:
+            self._buffer.append((source_id, article, on_saved))
+            self.stats["queued"] += 1
+            if self._oldest is None:
+                self._oldest = time.time()
+            full = len(self._buffer) >= self.batch_size
+        self._ensure_timer()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of inserted articles."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                self._oldest = None
+            if not batch:
+                return 0
+            by_source: Dict[object, List[Tuple[dict, Optional[SavedCallback]]]] = {}
+            for source_id, article, cb in batch:
+                by_source.setdefault(source_id, []).append((article, cb))
+            inserted = 0
+            for source_id, items in by_source.items():
+                t0 = time.perf_counter()
+                try:
+                    with db_session() as db:
+                        ids = insert_articles(db, source_id, [a for a, _ in items])
+                except Exception as e:
+                    print(f"[Writer] Bulk insert failed ({len(items)} articles): {e}")
+                    ids = [INSERT_FAILED] * len(items)
+                spent = self._write_time.setdefault(source_id, [0.0, 0])
+                spent[0] += time.perf_counter() - t0
+                spent[1] += 1
+                self.stats["flushes"] += 1
+                for (_, cb), new_id in zip(items, ids):
+                    if new_id is INSERT_FAILED:
+                        self.stats["errors"] += 1
+                    elif new_id is not None:
+                        inserted += 1
+                        self.stats["inserted"] += 1
+                    else:
+                        self.stats["duplicates"] += 1
+                    if cb is not None:
+                        try:
+                            cb(new_id)
+                        except Exception as e:
+                            print(f"[Writer] Callback failed: {e}")
+            return inserted
+
+    def write_time(self, source_id) -> Tuple[float, int]:
+        """(seconds, bulk inserts) spent writing articles of `source_id` so far."""
+        with self._flush_lock:
+            seconds, count = self._write_time.get(source_id, (0.0, 0))
+        return seconds, int(count)
+
+    def close(self) -> None:
+        """Stop the timer thread and flush pending articles."""
+        self._stop.set()
+        self.flush()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+
+_writer: Optional[ArticleWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_article_writer() -> ArticleWriter:
+    """Process-wide ArticleWriter, flushed at interpreter exit."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ArticleWriter()
+                atexit.register(_writer.close)
+    return _writer
@@ -0,0 +1,332 @@
+"""
+app/core/backfill.py
+
+Historical backfill: article discovery from sitemaps and archive pages, date
+chunks and per-chunk progress.
+
+BaseNewsCrawler.crawl_by_date_range(start, end) uses it to:
+- discover article URLs published in [start, end], including those that have
+  long left the RSS feed: the sitemaps listed in robots.txt (else
+  /sitemap_index.xml, /sitemap.xml, /news-sitemap.xml, or the config's
+  "sitemap_urls") and, when the config has an "archive_url" template such as
+  "https://example.com/archive/{date:%Y/%m/%d}", the archive page of each day;
+- split the range into BACKFILL_CHUNK_HOURS chunks and crawl BACKFILL_PARALLEL
+  chunks at a time (each through the crawl engine or pipeline, so the per-host
+  rate limiter still bounds the load on the site);
+- record every finished chunk in the Mongo `BackfillProgress` collection, so a
+  restarted backfill resumes with the unfinished chunks. URLs already stored
+  are skipped before any fetch, so a half-done chunk is cheap to redo.
+
+Sitemap index children are only fetched when they can hold articles in range:
+a child whose <lastmod> is before the start, or whose URL carries a year/month
+or day outside the range (".../2024/05/", "sitemap-2024-05-14.xml"), is
+skipped. An entry's date is its <news:publication_date>, else a date in the
+article URL, else its <lastmod>. lastmod is the last modification, so entries
+modified up to BACKFILL_LASTMOD_SLACK_HOURS after the end are kept too; every
+article is checked against the range after extraction anyway. Entries without
+any date are ignored.
+
+A chunk is "done" once all its articles were stored or dropped; a chunk with
+failed fetches is "partial" and crawled again on the next run. With the SQL
+backend progress is kept in memory only.
+
+Env vars:
+- BACKFILL_CHUNK_HOURS (default 24)
+- BACKFILL_PARALLEL (default 2)                 # chunks crawled at once
+- BACKFILL_MAX_SITEMAPS (default 500)           # sitemap documents fetched per backfill
+- BACKFILL_LASTMOD_SLACK_HOURS (default 72)
+"""
+
+import bisect
+import gzip
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from lxml import etree
+
+from app.core.checkpoints import parse_feed_date
+
+DEFAULT_SITEMAPS = ("/sitemap_index.xml", "/sitemap.xml", "/news-sitemap.xml")
+
+DONE = "done"
+PARTIAL = "partial"
+
+_DAY_RE = re.compile(r"(?<!\d)(20\d{2})[-/_.]?(0[1-9]|1[0-2])[-/_.]?(0[1-9]|[12]\d|3[01])(?!\d)")
+_MONTH_RE = re.compile(r"(?<!\d)(20\d{2})[-/_.](0[1-9]|1[0-2])(?!\d)")
+_ROBOTS_SITEMAP_RE = re.compile(r"^\s*sitemap\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+
+
+def chunk_hours() -> float:
+    return float(os.getenv("BACKFILL_CHUNK_HOURS", "24"))
+
+
+def backfill_parallel() -> int:
+    return max(1, int(os.getenv("BACKFILL_PARALLEL", "2")))
+
+
+def url_date_span(url: str) -> Optional[Tuple[datetime, datetime]]:
+    """[start, end) of the day or month a URL's path is dated with, None when undated."""
+    path = urlsplit(url).path
+    m = _DAY_RE.search(path)
+    if m:
+        try:
+            day = datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            day = None
+        if day is not None:
+            return day, day + timedelta(days=1)
+    m = _MONTH_RE.search(path)
+    if m:
+        year, month = int(m.group(1)), int(m.group(2))
+        first = datetime(year, month, 1)
+        return first, datetime(year + month // 12, month % 12 + 1, 1)
+    return None
+
+
+def _local(el) -> str:
+    return etree.QName(el).localname if isinstance(el.tag, str) else ""
+
+
+def _child_text(el, name: str) -> Optional[str]:
+    for child in el.iter():
+        if _local(child) == name and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def parse_sitemap(body: bytes):
+    """Sitemap document -> (child sitemaps [(loc, lastmod)], entries [(loc, published, lastmod)])."""
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    parser = etree.XMLParser(recover=True, huge_tree=True, resolve_entities=False, no_network=True)
+    try:
+        root = etree.fromstring(body, parser=parser)
+    except etree.XMLSyntaxError:
+        root = None
+    children: List[Tuple[str, Optional[datetime]]] = []
+    entries: List[Tuple[str, Optional[datetime], Optional[datetime]]] = []
+    if root is None:
+        return children, entries
+    for el in root:
+        kind = _local(el)
+        if kind not in ("sitemap", "url"):
+            continue
+        loc = None
+        for child in el:
+            if _local(child) == "loc" and child.text:
+                loc = child.text.strip()
+                break
+        if not loc:
+            continue
+        lastmod = parse_feed_date(_child_text(el, "lastmod"))
+        if kind == "sitemap":
+            children.append((loc, lastmod))
+        else:
+            entries.append((loc, parse_feed_date(_child_text(el, "publication_date")), lastmod))
+    return children, entries
+
+
+class SitemapDiscovery:
+    """Dated article URLs in [start, end] from a site's sitemaps, pruning sitemaps out of range."""
+
+    def __init__(self, fetch: Callable[[str], bytes], max_sitemaps: Optional[int] = None) -> None:
+        self.fetch = fetch
+        self.max_sitemaps = max_sitemaps or int(os.getenv("BACKFILL_MAX_SITEMAPS", "500"))
+        self.slack = timedelta(hours=float(os.getenv("BACKFILL_LASTMOD_SLACK_HOURS", "72")))
+        self.stats = {"sitemaps": 0, "pruned": 0, "entries": 0, "in_range": 0, "undated": 0, "errors": 0}
+
+    def roots(self, base_url: str, configured: Optional[Iterable[str]] = None) -> List[str]:
+        """Configured sitemaps, else the ones robots.txt lists, else the usual locations."""
+        if configured:
+            return list(configured)
+        try:
+            robots = self.fetch(urljoin(base_url + "/", "robots.txt")).decode("utf-8", errors="replace")
+            listed = _ROBOTS_SITEMAP_RE.findall(robots)
+        except Exception:
+            listed = []
+        return list(dict.fromkeys(listed)) or [base_url.rstrip("/") + path for path in DEFAULT_SITEMAPS]
+
+    def _may_overlap(self, loc: str, lastmod: Optional[datetime], start: datetime, end: datetime) -> bool:
+        if lastmod is not None and lastmod < start:
+            return False
+        span = url_date_span(loc)
+        return span is None or (span[0] <= end and span[1] > start)
+
+    def _entry_date(self, loc: str, published: Optional[datetime], lastmod: Optional[datetime]):
+        """(date, whether it is only the lastmod) for a sitemap entry."""
+        if published is not None:
+            return published, False
+        span = url_date_span(loc)
+        if span is not None:
+            return span[0], False
+        return lastmod, True
+
+    def discover(self, roots: Iterable[str], start: datetime, end: datetime) -> Dict[str, datetime]:
+        found: Dict[str, datetime] = {}
+        pending = list(dict.fromkeys(roots))
+        seen: Set[str] = set(pending)
+        while pending and self.stats["sitemaps"] < self.max_sitemaps:
+            url = pending.pop(0)
+            try:
+                body = self.fetch(url)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[Backfill] Sitemap {url} failed: {e}")
+                continue
+            self.stats["sitemaps"] += 1
+            children, entries = parse_sitemap(body)
+            for loc, lastmod in children:
+                if loc in seen:
+                    continue
+                seen.add(loc)
+                if self._may_overlap(loc, lastmod, start, end):
+                    pending.append(loc)
+                else:
+                    self.stats["pruned"] += 1
+            for loc, published, lastmod in entries:
+                self.stats["entries"] += 1
+                dt, modified = self._entry_date(loc, published, lastmod)
+                if dt is None:
+                    self.stats["undated"] += 1
+                    continue
+                # lastmod only bounds the publication date from above
+                upper = end + self.slack if modified else end
+                if start <= dt <= upper:
+                    found[loc] = min(dt, end)
+                    self.stats["in_range"] += 1
+        if pending:
+            print(f"[Backfill] Sitemap limit reached ({self.max_sitemaps}), {len(pending)} sitemaps not read")
+        return found
+
+
+def archive_pages(template: str, start: datetime, end: datetime) -> List[Tuple[str, datetime]]:
+    """One archive page URL per day of the range from a "{date:%Y/%m/%d}" template."""
+    pages: List[Tuple[str, datetime]] = []
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day <= end:
+        pages.append((template.format(date=day), day))
+        day += timedelta(days=1)
+    return pages
+
+
+@dataclass
+class Chunk:
+    start: datetime
+    end: datetime
+    urls: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.start:%Y-%m-%dT%H:%M}/{self.end:%Y-%m-%dT%H:%M}"
+
+
+def date_chunks(start: datetime, end: datetime, hours: Optional[float] = None) -> List[Chunk]:
+    """Consecutive chunks of `hours` covering [start, end]."""
+    step = timedelta(hours=hours or chunk_hours())
+    chunks: List[Chunk] = []
+    lo = start
+    while True:
+        hi = min(lo + step, end)
+        chunks.append(Chunk(lo, hi))
+        if hi >= end:
+            return chunks
+        lo = hi
+
+
+def assign_urls(chunks: List[Chunk], dated: Dict[str, datetime]) -> None:
+    """Put each URL in the chunk its date falls in (dates are clamped to the range)."""
+    starts = [c.start for c in chunks]
+    for url, dt in sorted(dated.items(), key=lambda item: item[1]):
+        i = max(0, bisect.bisect_right(starts, dt) - 1)
+        chunks[i].urls.append(url)
+
+
+class BackfillProgress:
+    """Finished chunks per source (Mongo `BackfillProgress`, memory with the SQL backend)."""
+
+    def __init__(self) -> None:
+        self._memory: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._use_mongo = True
+
+    def _collection(self):
+        if not self._use_mongo:
+            return None
+        try:
+            from app.core.storage import BACKEND, db_session
+
+            if BACKEND != "mongo":
+                self._use_mongo = False
+                return None
+            with db_session() as db:
+                return db.BackfillProgress
+        except Exception as e:
+            print(f"[Backfill] Mongo unavailable, progress kept in memory: {e}")
+            self._use_mongo = False
+            return None
+
+    @staticmethod
+    def _id(source_code: str, chunk: Chunk) -> str:
+        return f"{source_code}:{chunk.key}"
+
+    def done(self, source_code: str, chunks: List[Chunk]) -> Set[str]:
+        """Keys of the chunks already finished."""
+        ids = {self._id(source_code, c): c.key for c in chunks}
+        coll = self._collection()
+        if coll is not None:
+            try:
+                docs = coll.find({"_id": {"$in": list(ids)}, "State": DONE}, {"_id": 1})
+                return {ids[d["_id"]] for d in docs}
+            except Exception as e:
+                print(f"[Backfill] Progress load failed for {source_code}: {e}")
+        with self._lock:
+            return {key for _id, key in ids.items() if self._memory.get(_id, {}).get("State") == DONE}
+
+    def record(self, source_code: str, chunk: Chunk, counts: Dict[str, int]) -> None:
+        doc = {
+            "Source": source_code,
+            "Start": chunk.start,
+            "End": chunk.end,
+            "State": PARTIAL if counts.get("failed") else DONE,
+            "Counts": counts,
+            "UpdatedAt": datetime.utcnow(),
+        }
+        coll = self._collection()
+        if coll is not None:
+            try:
+                coll.update_one({"_id": self._id(source_code, chunk)}, {"$set": doc}, upsert=True)
+                return
+            except Exception as e:
+                print(f"[Backfill] Progress save failed for {source_code} {chunk.key}: {e}")
+        with self._lock:
+            self._memory[self._id(source_code, chunk)] = doc
+
+    def clear(self, source_code: str) -> None:
+        coll = self._collection()
+        if coll is not None:
+            try:
+                coll.delete_many({"Source": source_code})
+            except Exception as e:
+                print(f"[Backfill] Progress reset failed for {source_code}: {e}")
+        with self._lock:
+            for _id in [k for k, v in self._memory.items() if v["Source"] == source_code]:
+                del self._memory[_id]
+
+
+_progress: Optional[BackfillProgress] = None
+_progress_lock = threading.Lock()
+
+
+def get_backfill_progress() -> BackfillProgress:
+    """Process-wide BackfillProgress."""
+    global _progress
+    if _progress is None:
+        with _progress_lock:
+            if _progress is None:
+                _progress = BackfillProgress()
+    return _progress
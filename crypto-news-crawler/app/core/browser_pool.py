@@ -0,0 +1,263 @@
+"""
+app/core/browser_pool.py
+
+Persistent Playwright browser for rendered fetches.
+
+- One Chromium process is launched lazily and reused across pages.
+- A fixed pool of browser contexts is reused (default 4); each page is closed
+  after use, the context stays warm.
+- Request interception aborts images, fonts, media and known third-party
+  trackers before they hit the network.
+- Pages wait for DOMContentLoaded, then optionally for a CSS selector (e.g. the
+  article body) with a short timeout, instead of `networkidle`.
+- The browser is recycled after RENDER_RECYCLE_PAGES pages to bound memory growth.
+
+Playwright runs on its own asyncio loop in a background thread, so
+`render()` can be called from any crawler worker thread.
+
+Env vars:
+- RENDER_POOL_SIZE (default 4)         # reusable browser contexts
+- RENDER_RECYCLE_PAGES (default 200)   # relaunch Chromium after N pages
+- RENDER_SELECTOR_TIMEOUT (default 3)  # seconds to wait for the early-exit selector
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    from playwright.async_api import async_playwright
+except Exception:
+    async_playwright = None
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOST_SUFFIXES = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "facebook.net",
+    "scorecardresearch.com",
+    "chartbeat.com",
+    "chartbeat.net",
+    "quantserve.com",
+    "taboola.com",
+    "outbrain.com",
+    "hotjar.com",
+    "segment.io",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+)
+
+
+def _is_blocked_host(host: str) -> bool:
+    host = (host or "").lower()
+    return any(host == s or host.endswith("." + s) for s in BLOCKED_HOST_SUFFIXES)
+
+
+def _process_tree_rss_kb(pid: int) -> Optional[int]:
+    """Resident memory of `pid` plus all descendants (Linux /proc only)."""
+    proc = Path("/proc")
+    if not proc.exists():
+        return None
+    total = 0
+    stack = [pid]
+    seen = set()
+    while stack:
+        p = stack.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        try:
+            for line in (proc / str(p) / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1])
+                    break
+            for task in (proc / str(p) / "task").iterdir():
+                children = (task / "children").read_text().split()
+                stack.extend(int(c) for c in children)
+        except Exception:
+            continue
+    return total
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        recycle_after: Optional[int] = None,
+        selector_timeout: Optional[float] = None,
+    ) -> None:
+        self.pool_size = pool_size or int(os.getenv("RENDER_POOL_SIZE", "4"))
+        self.recycle_after = recycle_after or int(os.getenv("RENDER_RECYCLE_PAGES", "200"))
+        self.selector_timeout = selector_timeout or float(os.getenv("RENDER_SELECTOR_TIMEOUT", "3"))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._contexts: Optional[asyncio.Queue] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._in_flight = 0
+        self._pages_since_launch = 0
+        self.stats: Dict[str, float] = {
+            "pages": 0,
+            "failures": 0,
+            "blocked_requests": 0,
+            "launches": 0,
+            "render_seconds": 0.0,
+            "peak_rss_kb": 0,
+        }
+        self._started_at = time.time()
+
+    # ---------- event loop thread ----------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+        return self._loop
+
+    # ---------- browser lifecycle (runs on the pool loop) ----------
+    async def _launch(self) -> None:
+        from app.core.fetcher import DEFAULT_HEADERS
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._contexts = asyncio.Queue()
+        for _ in range(self.pool_size):
+            context = await self._browser.new_context(
+                user_agent=DEFAULT_HEADERS.get("User-Agent"),
+                extra_http_headers={
+                    k: v
+                    for k, v in DEFAULT_HEADERS.items()
+                    if k not in {"User-Agent", "Connection"}
+                },
+                bypass_csp=True,
+            )
+            await context.route("**/*", self._route)
+            self._contexts.put_nowait(context)
+        self._pages_since_launch = 0
+        self.stats["launches"] += 1
+
+    async def _close_browser(self) -> None:
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        self._browser = None
+        self._contexts = None
+
+    async def _route(self, route) -> None:
+        req = route.request
+        if req.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(urlsplit(req.url).hostname or ""):
+            self.stats["blocked_requests"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire(self):
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            # Recycle only when no page is in flight on the old browser
+            if self._browser is not None and self._pages_since_launch >= self.recycle_after:
+                while self._in_flight:
+                    await asyncio.sleep(0.05)
+                await self._close_browser()
+            if self._browser is None:
+                await self._launch()
+            self._in_flight += 1
+            self._pages_since_launch += 1
+            contexts = self._contexts
+        return contexts, await contexts.get()
+
+    async def _render(self, url: str, timeout: float, wait_selector: Optional[str]) -> str:
+        contexts, context = await self._acquire()
+        page = None
+        start = time.perf_counter()
+        try:
+            page = await context.new_page()
+            page.set_default_timeout(int(timeout * 1000))
+            await page.goto(url, wait_until="domcontentloaded")
+            if wait_selector:
+                try:
+                    await page.wait_for_selector(wait_selector, timeout=int(self.selector_timeout * 1000))
+                except Exception:
+                    pass  # DOM is ready; selector is only an early-exit hint
+            html = await page.content()
+            self.stats["pages"] += 1
+            return html
+        except Exception:
+            self.stats["failures"] += 1
+            raise
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self.stats["render_seconds"] += time.perf_counter() - start
+            rss = _process_tree_rss_kb(os.getpid())
+            if rss and rss > self.stats["peak_rss_kb"]:
+                self.stats["peak_rss_kb"] = rss
+            contexts.put_nowait(context)
+            self._in_flight -= 1
+
+    # ---------- public API (any thread) ----------
+    def render(self, url: str, timeout: float = 30.0, wait_selector: Optional[str] = None) -> str:
+        if async_playwright is None:
+            raise RuntimeError("playwright is not installed")
+        loop = self._ensure_loop()
+        fut = asyncio.run_coroutine_threadsafe(self._render(url, timeout, wait_selector), loop)
+        return fut.result(timeout=timeout + self.selector_timeout + 5)
+
+    def render_stats(self) -> Dict[str, float]:
+        stats = dict(self.stats)
+        minutes = max(1e-9, (time.time() - self._started_at) / 60.0)
+        stats["pages_per_minute"] = stats["pages"] / minutes
+        stats["avg_render_seconds"] = (stats["render_seconds"] / stats["pages"]) if stats["pages"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+
+        async def _shutdown():
+            await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), self._loop).result(timeout=30)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide BrowserPool singleton."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.close)
+    return _pool
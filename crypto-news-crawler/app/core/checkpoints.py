@@ -0,0 +1,282 @@
+"""
+app/core/checkpoints.py
+
+Per-source crawl checkpoints (high-water marks).
+
+A checkpoint records, for each source, the newest feed pubDate processed, the
+GUIDs seen near that mark, and the feed's conditional-GET validators (ETag,
+Last-Modified, body hash). With it a crawl cycle:
+- seeds the fetcher's validators, so an unchanged feed (304 or same body hash)
+  skips the whole cycle even right after a restart or on another worker;
+- drops feed entries at or below the high-water mark before any dedup query or
+  article fetch.
+
+Entries dated up to CHECKPOINT_GRACE_MINUTES before the mark are still
+considered unless their GUID was already seen, because feeds often publish
+items with a pubDate earlier than ones already listed.
+
+The mark only advances past entries that were processed: if any article of the
+cycle failed, the mark stays below the oldest failure and the feed validators
+are not stored, so the next cycle retries it.
+
+Checkpoints live in the Mongo `CrawlCheckpoints` collection (one document per
+source code). Updates are compare-and-set on a version field; a worker that
+loses the race merges with the stored checkpoint (newest mark wins) and retries,
+so concurrent workers never move a mark backwards. With the SQL backend
+checkpoints are kept in memory only.
+
+Env vars:
+- CRAWL_CHECKPOINTS (default 1)          # 0 disables checkpoints
+- CHECKPOINT_GRACE_MINUTES (default 60)  # look-back below the mark, GUID-deduped
+- CHECKPOINT_MAX_GUIDS (default 500)     # GUIDs kept per source
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.dates import parse_date
+from app.core.feed_snapshot import FeedEntry, FeedSnapshot
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """pubDate / updated string -> naive UTC datetime (None when unparseable)."""
+    dt = parse_date(value)
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _entry_key(entry: FeedEntry) -> str:
+    return entry.guid or entry.link
+
+
+@dataclass
+class Checkpoint:
+    source_code: str
+    last_published_at: Optional[datetime] = None
+    last_guid: Optional[str] = None
+    guids: List[str] = field(default_factory=list)
+    list_url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    feed_hash: Optional[str] = None
+    version: int = 0
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_doc(cls, doc: Dict) -> "Checkpoint":
+        return cls(
+            source_code=doc["_id"],
+            last_published_at=doc.get("LastPublishedAt"),
+            last_guid=doc.get("LastGuid"),
+            guids=list(doc.get("Guids") or []),
+            list_url=doc.get("ListUrl"),
+            etag=doc.get("ETag"),
+            last_modified=doc.get("LastModified"),
+            feed_hash=doc.get("FeedHash"),
+            version=int(doc.get("Version") or 0),
+            updated_at=doc.get("UpdatedAt"),
+        )
+
+    def to_doc(self) -> Dict:
+        return {
+            "LastPublishedAt": self.last_published_at,
+            "LastGuid": self.last_guid,
+            "Guids": self.guids,
+            "ListUrl": self.list_url,
+            "ETag": self.etag,
+            "LastModified": self.last_modified,
+            "FeedHash": self.feed_hash,
+            "UpdatedAt": self.updated_at,
+        }
+
+    def validators(self) -> Dict[str, Optional[str]]:
+        return {"etag": self.etag, "last_modified": self.last_modified, "body_hash": self.feed_hash}
+
+
+class CheckpointStore:
+    def __init__(self, grace_minutes: Optional[float] = None, max_guids: Optional[int] = None) -> None:
+        self.grace = timedelta(minutes=float(os.getenv("CHECKPOINT_GRACE_MINUTES", "60")) if grace_minutes is None else grace_minutes)
+        self.max_guids = max_guids or int(os.getenv("CHECKPOINT_MAX_GUIDS", "500"))
+        self._memory: Dict[str, Checkpoint] = {}
+        self._lock = threading.Lock()
+        self._use_mongo = True
+
+    def _collection(self):
+        if not self._use_mongo:
+            return None
+        try:
+            from app.core.storage import BACKEND, db_session
+
+            if BACKEND != "mongo":
+                self._use_mongo = False
+                return None
+            with db_session() as db:
+                return db.CrawlCheckpoints
+        except Exception as e:
+            print(f"[Checkpoint] Mongo unavailable, memory only: {e}")
+            self._use_mongo = False
+            return None
+
+    def load(self, source_code: str) -> Checkpoint:
+        coll = self._collection()
+        if coll is not None:
+            try:
+                doc = coll.find_one({"_id": source_code})
+                if doc:
+                    return Checkpoint.from_doc(doc)
+                return Checkpoint(source_code)
+            except Exception as e:
+                print(f"[Checkpoint] Load failed for {source_code}: {e}")
+        with self._lock:
+            cp = self._memory.get(source_code)
+            return Checkpoint(**vars(cp)) if cp else Checkpoint(source_code)
+
+    # ---------- High-water mark ----------
+    def filter_new(self, cp: Checkpoint, feed: Optional[FeedSnapshot], urls: List[str]) -> Tuple[List[str], int]:
+        """Drop URLs whose feed entry is at or below the checkpoint. Returns (kept, skipped).
+
+        URLs without a feed entry (HTML discovery) are always kept.
+        """
+        if feed is None or not feed.entries or (cp.last_published_at is None and not cp.guids):
+            return urls, 0
+        seen = set(cp.guids)
+        floor = cp.last_published_at - self.grace if cp.last_published_at else None
+        kept: List[str] = []
+        for url in urls:
+            entry = feed.lookup(url)
+            if entry is not None:
+                if _entry_key(entry) in seen:
+                    continue
+                pub = parse_feed_date(entry.published)
+                if pub is not None and floor is not None and pub <= floor:
+                    continue
+            kept.append(url)
+        return kept, len(urls) - len(kept)
+
+    def advance(
+        self,
+        cp: Checkpoint,
+        feed: Optional[FeedSnapshot],
+        failed_urls: Iterable[str] = (),
+        validators: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Checkpoint:
+        """Checkpoint after a cycle over `feed`; entries at/after the oldest failure are not passed."""
+        if feed is None or not feed.entries:
+            return cp
+        dated: List[Tuple[datetime, FeedEntry]] = []
+        undated: List[FeedEntry] = []
+        # A pubDate in the future (bad timezone) must not push the mark past real articles
+        horizon = datetime.utcnow() + timedelta(hours=1)
+        for entry in feed.entries:
+            pub = parse_feed_date(entry.published)
+            if pub is None or pub > horizon:
+                undated.append(entry)
+            else:
+                dated.append((pub, entry))
+        failed = set()
+        for url in failed_urls:
+            entry = feed.lookup(url)
+            if entry is not None:
+                failed.add(_entry_key(entry))
+        failed_dates = [pub for pub, e in dated if _entry_key(e) in failed]
+        limit = min(failed_dates) if failed_dates else None
+
+        ok = [(pub, e) for pub, e in dated if _entry_key(e) not in failed and (limit is None or pub < limit)]
+        nxt = Checkpoint(**vars(cp))
+        nxt.list_url = feed.list_url
+        if ok:
+            pub, entry = max(ok, key=lambda item: item[0])
+            if nxt.last_published_at is None or pub > nxt.last_published_at:
+                nxt.last_published_at = pub
+                nxt.last_guid = _entry_key(entry)
+        # GUIDs near the mark (inside the grace window) plus undated entries, newest first
+        recent: List[str] = []
+        floor = nxt.last_published_at - self.grace if nxt.last_published_at else None
+        for pub, e in sorted(ok, key=lambda item: item[0], reverse=True):
+            if floor is None or pub > floor:
+                recent.append(_entry_key(e))
+        recent += [_entry_key(e) for e in undated if _entry_key(e) not in failed]
+        nxt.guids = list(dict.fromkeys(recent + cp.guids))[: self.max_guids]
+        if failed:
+            # Force a full fetch next cycle so failed entries are retried
+            nxt.etag = nxt.last_modified = nxt.feed_hash = None
+        elif validators:
+            nxt.etag = validators.get("etag")
+            nxt.last_modified = validators.get("last_modified")
+            nxt.feed_hash = validators.get("body_hash")
+        return nxt
+
+    # ---------- Atomic save ----------
+    def _merge(self, ours: Checkpoint, theirs: Checkpoint) -> Checkpoint:
+        """Combine a checkpoint with one another worker stored first; the newest mark wins."""
+        merged = Checkpoint(**vars(ours))
+        merged.version = theirs.version
+        if theirs.last_published_at and (ours.last_published_at is None or theirs.last_published_at > ours.last_published_at):
+            merged.last_published_at = theirs.last_published_at
+            merged.last_guid = theirs.last_guid
+            merged.etag, merged.last_modified, merged.feed_hash = theirs.etag, theirs.last_modified, theirs.feed_hash
+        merged.guids = list(dict.fromkeys(ours.guids + theirs.guids))[: self.max_guids]
+        return merged
+
+    def save(self, cp: Checkpoint, retries: int = 5) -> Checkpoint:
+        """Store `cp` with compare-and-set on its version. Returns the stored checkpoint."""
+        cp.updated_at = datetime.utcnow()
+        coll = self._collection()
+        if coll is None:
+            with self._lock:
+                current = self._memory.get(cp.source_code)
+                if current is not None and current.version != cp.version:
+                    cp = self._merge(cp, current)
+                cp.version += 1
+                self._memory[cp.source_code] = cp
+            return cp
+        from pymongo.errors import DuplicateKeyError
+
+        for _ in range(retries):
+            try:
+                if cp.version == 0:
+                    coll.insert_one({"_id": cp.source_code, "Version": 1, **cp.to_doc()})
+                    cp.version = 1
+                    return cp
+                res = coll.update_one(
+                    {"_id": cp.source_code, "Version": cp.version},
+                    {"$set": cp.to_doc(), "$inc": {"Version": 1}},
+                )
+                if res.modified_count == 1:
+                    cp.version += 1
+                    return cp
+            except DuplicateKeyError:
+                pass
+            except Exception as e:
+                print(f"[Checkpoint] Save failed for {cp.source_code}: {e}")
+                return cp
+            # Another worker saved first: merge with its checkpoint and retry
+            doc = coll.find_one({"_id": cp.source_code})
+            if doc:
+                cp = self._merge(cp, Checkpoint.from_doc(doc))
+        print(f"[Checkpoint] Gave up saving {cp.source_code} after {retries} conflicts")
+        return cp
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def checkpoints_enabled() -> bool:
+    return os.getenv("CRAWL_CHECKPOINTS", "1") == "1"
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Process-wide CheckpointStore."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CheckpointStore()
+    return _store
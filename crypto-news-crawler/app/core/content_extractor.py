@@ -2,10 +2,12 @@ import json
 from typing import List, Optional, Tuple
 from urllib.parse import urljoin
 
-import dateparser
 import trafilatura
 from bs4 import BeautifulSoup
 
+from .article_document import ArticleDocument, element_text
+from .dates import parse_date
+from .fast_extract import extract_fast, fast_extract_enabled, metadata_date
 from .structure_learner import Template
 
 DATE_META_SELECTORS = [
@@ -79,7 +81,7 @@ def extract_links(list_html: str, template: Template, base_url: Optional[str]) -
 
     return list(urls)
 
-def _try_parse_date_from_meta(soup: BeautifulSoup, custom_selector: Optional[str]) -> Optional[str]:
+def _try_parse_date_from_meta(doc: ArticleDocument, custom_selector: Optional[str]) -> Optional[str]:
     # normalize “article:published_time” -> meta[property='article:published_time']
     selectors = []
     if custom_selector:
@@ -89,36 +91,43 @@ def _try_parse_date_from_meta(soup: BeautifulSoup, custom_selector: Optional[str
     selectors.extend(DATE_META_SELECTORS)
 
     for sel in selectors:
-        el = soup.select_one(sel)
-        if el:
+        el = doc.select_one(sel)
+        if el is not None:
             val = el.get("content") or el.get("datetime")
             if val:
                 return val
     return None
 
 def extract_article_from_html(article_html: str, template: Template) -> Optional[dict]:
-    soup = BeautifulSoup(article_html, "lxml")
+    doc = ArticleDocument("", article_html)
 
     title = None
     content = None
     published_at = None
     author = None
 
-    if template.article_title_selector:
-        el = soup.select_one(template.article_title_selector)
-        if el:
-            title = el.get_text(strip=True)
-
-    if template.article_content_selector:
-        el = soup.select_one(template.article_content_selector)
-        if el:
-            content = el.get_text("\n", strip=True)
+    # Tier 1: template selectors on the lxml tree (see app/core/fast_extract.py)
+    fast = None
+    if fast_extract_enabled():
+        fast = extract_fast(doc, template.article_title_selector, template.article_content_selector)
+    if fast is not None:
+        title, content = fast
+    else:
+        if template.article_title_selector:
+            el = doc.select_one(template.article_title_selector)
+            if el is not None:
+                title = element_text(el)
+
+        if template.article_content_selector:
+            el = doc.select_one(template.article_content_selector)
+            if el is not None:
+                content = element_text(el, "\n")
 
     # author via selector
     if getattr(template, "article_author_selector", None):
-        el = soup.select_one(template.article_author_selector)
-        if el:
-            author = el.get_text(strip=True)
+        el = doc.select_one(template.article_author_selector)
+        if el is not None:
+            author = element_text(el)
 
     # author via meta fallbacks
     if not author:
@@ -130,35 +139,46 @@ def extract_article_from_html(article_html: str, template: Template) -> Optional
             "a[rel='author']",
             ".byline, .byline__name, .article__byline, .author, .author-name",
         ]:
-            el = soup.select_one(sel)
-            if el:
-                val = el.get("content") if el.name == "meta" else el.get_text(strip=True)
+            el = doc.select_one(sel)
+            if el is not None:
+                val = el.get("content") if el.tag == "meta" else element_text(el)
                 if val:
                     author = val
                     break
 
     # date via meta selectors
     date_selector = getattr(template, "article_date_selector_meta", None) or getattr(template, "article_date_selector", None)
-    date_str = _try_parse_date_from_meta(soup, date_selector)
+    date_str = _try_parse_date_from_meta(doc, date_selector)
     if date_str:
         try:
-            published_at = dateparser.parse(date_str)
+            published_at = parse_date(date_str)
         except Exception:
             published_at = None
 
     # fallback time tag
     if not published_at:
-        time_el = soup.find("time")
-        if time_el:
-            val = time_el.get("datetime") or time_el.get_text(strip=True)
+        time_el = doc.time_tag
+        if time_el is not None:
+            val = time_el.get("datetime") or element_text(time_el)
+            if val:
+                try:
+                    published_at = parse_date(val)
+                except Exception:
+                    published_at = None
+
+    # fallback JSON-LD date
+    if not published_at:
+        for it in doc.jsonld_items():
+            val = it.get("datePublished") if isinstance(it, dict) else None
             if val:
                 try:
-                    published_at = dateparser.parse(val)
+                    published_at = parse_date(str(val))
                 except Exception:
                     published_at = None
+                break
 
-    # fallback trafilatura
-    if not title or not content or not published_at:
+    # fallback trafilatura (second parse), only when tier 1 did not pass its quality checks
+    if fast is None and (not title or not content or not published_at):
         try:
             extracted = trafilatura.extract(
                 article_html,
@@ -173,11 +193,14 @@ def extract_article_from_html(article_html: str, template: Template) -> Optional
                 content = content or data.get("text")
                 if not published_at and data.get("date"):
                     try:
-                        published_at = dateparser.parse(data["date"])
+                        published_at = parse_date(data["date"])
                     except Exception:
                         published_at = None
         except Exception:
             pass
+    elif not published_at:
+        # Tier 1 content is good, but nothing on the page gave a date
+        published_at = metadata_date(article_html)
 
     if not content:
         return None
@@ -187,4 +210,4 @@ def extract_article_from_html(article_html: str, template: Template) -> Optional
         "content": content,
         "published_at": published_at,
         "author": author,
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,159 @@
+"""
+app/core/crawl_engine.py
+
+Concurrent crawl engine used by BaseNewsCrawler.
+
+- Article HTML is fetched with asyncio over one shared httpx.AsyncClient.
+- A global limit and a per-host limit bound the number of in-flight requests.
+- CPU-bound work (extraction, symbols, sentiment, DB write) runs in a worker pool
+  so fetching of the next articles continues while earlier ones are processed.
+- With a `source`, fetches go through the source's circuit breaker
+  (app/core/politeness.py): once it opens, the remaining URLs are not fetched
+  and come back in `failed_urls` so the next cycle retries them.
+
+Env vars:
+- CRAWL_CONCURRENCY (default 8)      # max in-flight fetches overall
+- CRAWL_PER_HOST_LIMIT (default 4)   # max in-flight fetches per host
+- CRAWL_WORKERS (default min(4, cpu)) # worker threads for extraction/enrichment
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.fetcher import fetch_html_async, new_async_client
+from app.core.politeness import get_circuit_breaker
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+@dataclass
+class CrawlStats:
+    total: int = 0
+    skipped: int = 0
+    fetched: int = 0
+    processed: int = 0
+    failed: int = 0
+    short_circuited: int = 0
+    elapsed: float = 0.0
+    failed_urls: List[str] = field(default_factory=list)
+
+    @property
+    def articles_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class CrawlEngine:
+    """Fetch URLs concurrently and hand each (url, html) pair to a processing callback."""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        workers: Optional[int] = None,
+        timeout: float = 20.0,
+        metrics=None,
+        source: Optional[str] = None,
+    ) -> None:
+        # Optional CycleMetrics (app/core/crawl_metrics.py): receives per-URL fetch times
+        self.metrics = metrics
+        self.breaker = get_circuit_breaker(source) if source else None
+        self.concurrency = concurrency or _env_int("CRAWL_CONCURRENCY", 8)
+        self.per_host_limit = per_host_limit or _env_int("CRAWL_PER_HOST_LIMIT", 4)
+        self.workers = workers or _env_int("CRAWL_WORKERS", min(4, os.cpu_count() or 1))
+        self.timeout = timeout
+
+    async def _fetch(
+        self,
+        client,
+        url: str,
+        stats: CrawlStats,
+        global_sem: asyncio.Semaphore,
+        host_sems: Dict[str, asyncio.Semaphore],
+    ) -> Optional[str]:
+        """Fetch one URL under the global/per-host limits and the breaker; None when it failed or was skipped."""
+        host = urlsplit(url).netloc.lower()
+        host_sem = host_sems.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        breaker = self.breaker
+        async with global_sem:
+            async with host_sem:
+                if breaker is not None and not breaker.allow():
+                    stats.short_circuited += 1
+                    stats.failed_urls.append(url)
+                    return None
+                t0 = time.perf_counter()
+                try:
+                    html = await fetch_html_async(client, url, timeout=self.timeout)
+                except Exception as e:
+                    print(f"[Article] Fetch failed for {url}: {e}")
+                    stats.failed += 1
+                    stats.failed_urls.append(url)
+                    if breaker is not None:
+                        # A missing article says nothing about the host
+                        if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (404, 410):
+                            breaker.record_success()
+                        else:
+                            breaker.record_failure(time.perf_counter() - t0)
+                    return None
+                finally:
+                    if self.metrics is not None:
+                        self.metrics.record("fetch", time.perf_counter() - t0)
+        if breaker is not None:
+            breaker.record_success()
+        stats.fetched += 1
+        return html
+
+    async def _crawl_one(
+        self,
+        client,
+        pool: ThreadPoolExecutor,
+        url: str,
+        process: Callable[[str, str], None],
+        stats: CrawlStats,
+        global_sem: asyncio.Semaphore,
+        host_sems: Dict[str, asyncio.Semaphore],
+    ) -> None:
+        html = await self._fetch(client, url, stats, global_sem, host_sems)
+        if html is None:
+            return
+        # Processing happens outside the semaphores so the next fetches can start
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(pool, process, url, html)
+            stats.processed += 1
+        except Exception as e:
+            print(f"[Article] Failed {url}: {e}")
+            stats.failed += 1
+            stats.failed_urls.append(url)
+
+    async def crawl(self, urls: Iterable[str], process: Callable[[str, str], None]) -> CrawlStats:
+        urls = list(dict.fromkeys(urls))
+        stats = CrawlStats(total=len(urls))
+        if not urls:
+            return stats
+        start = time.perf_counter()
+        global_sem = asyncio.Semaphore(self.concurrency)
+        host_sems: Dict[str, asyncio.Semaphore] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawl") as pool:
+            async with new_async_client(max_connections=self.concurrency, timeout=self.timeout) as client:
+                await asyncio.gather(*[
+                    self._crawl_one(client, pool, u, process, stats, global_sem, host_sems)
+                    for u in urls
+                ])
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def run(self, urls: Iterable[str], process: Callable[[str, str], None]) -> CrawlStats:
+        """Blocking entry point for synchronous callers (scripts, schedulers)."""
+        return asyncio.run(self.crawl(urls, process))
@@ -0,0 +1,252 @@
+"""
+app/core/crawl_metrics.py
+
+Per-stage timers and counters for crawl cycles.
+
+Each BaseNewsCrawler cycle records wall time per stage (discover, fetch, parse,
+extract, near_dup, symbols, breaking, sentiment, store) and per-article counters
+(fetched, skipped, failed, saved, duplicates). At the end of a cycle:
+- a one-line JSON report is printed ("[Report] {...}") and, if configured,
+  appended to CRAWL_REPORT_FILE (JSON Lines);
+- process-wide totals per source are rendered in the Prometheus text format
+  and written atomically to CRAWL_METRICS_FILE (node_exporter textfile
+  collector); the API serves the same file at /metrics. Circuit breaker
+  states (app/core/politeness.py) are exported alongside.
+
+Stage times are summed over worker threads, so stages that run concurrently
+(fetch, extract, sentiment) can add up to more than the cycle's wall time.
+Stages timed on a worker thread also record that thread's CPU time (cpu_ms);
+fetch is awaited on the event loop and has wall time only.
+
+Env vars:
+- CRAWL_REPORT_FILE (optional)    # append one JSON report per cycle
+- CRAWL_METRICS_FILE (optional)   # Prometheus textfile, rewritten after every cycle
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.politeness import breaker_state_value, breaker_states
+
+STAGES = ("discover", "fetch", "parse", "extract", "near_dup", "symbols", "breaking", "sentiment", "store")
+COUNTERS = ("fetched", "skipped", "failed", "saved", "duplicates")
+
+
+class CycleMetrics:
+    """Stage timers and counters for one crawl cycle of one source (thread-safe)."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.started_at = datetime.utcnow()
+        self._t0 = time.perf_counter()
+        self.elapsed = 0.0
+        self.stage_seconds: Dict[str, float] = {s: 0.0 for s in STAGES}
+        self.stage_calls: Dict[str, int] = {s: 0 for s in STAGES}
+        self.stage_max: Dict[str, float] = {s: 0.0 for s in STAGES}
+        self.stage_cpu: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {c: 0 for c in COUNTERS}
+        # Extra report sections (e.g. "pipeline" from app/core/crawl_pipeline.py)
+        self.sections: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, calls: int = 1, cpu: Optional[float] = None) -> None:
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            if cpu is not None:
+                self.stage_cpu[stage] = self.stage_cpu.get(stage, 0.0) + cpu
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + calls
+            # Aggregated records (calls > 1) contribute their average
+            single = seconds / calls if calls else seconds
+            if single > self.stage_max.get(stage, 0.0):
+                self.stage_max[stage] = single
+
+    @contextmanager
+    def stage(self, name: str):
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0, cpu=time.thread_time() - c0)
+
+    def attach(self, name: str, section: Dict) -> None:
+        with self._lock:
+            self.sections[name] = section
+
+    def incr(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def finish(self) -> Dict:
+        self.elapsed = time.perf_counter() - self._t0
+        report = self.report()
+        _registry.add(self)
+        print(f"[Report] {json.dumps(report, ensure_ascii=False)}")
+        _write_outputs(report)
+        return report
+
+    def report(self) -> Dict:
+        with self._lock:
+            stages = {}
+            for name in self.stage_seconds:
+                calls = self.stage_calls.get(name, 0)
+                total = self.stage_seconds[name]
+                if not calls and not total:
+                    continue
+                stages[name] = {
+                    "calls": calls,
+                    "total_ms": round(total * 1000, 1),
+                    "avg_ms": round(total * 1000 / calls, 2) if calls else 0.0,
+                    "max_ms": round(self.stage_max.get(name, 0.0) * 1000, 1),
+                }
+                if name in self.stage_cpu:
+                    stages[name]["cpu_ms"] = round(self.stage_cpu[name] * 1000, 1)
+            counters = dict(self.counters)
+            sections = dict(self.sections)
+        slowest = max(stages, key=lambda s: stages[s]["total_ms"]) if stages else None
+        return {
+            "source": self.source,
+            "started_at": self.started_at.isoformat(timespec="seconds") + "Z",
+            "elapsed_s": round(self.elapsed, 3),
+            "counters": counters,
+            "stages": stages,
+            "slowest_stage": slowest,
+            **sections,
+        }
+
+
+class _Registry:
+    """Process-wide totals per source, rendered for Prometheus."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stage_seconds: Dict[tuple, float] = {}
+        self.stage_calls: Dict[tuple, int] = {}
+        self.articles: Dict[tuple, int] = {}
+        self.cycles: Dict[str, int] = {}
+        self.last_cycle: Dict[str, tuple] = {}
+        self.pipeline: Dict[str, Dict] = {}
+
+    def add(self, m: CycleMetrics) -> None:
+        with self._lock:
+            for stage, secs in m.stage_seconds.items():
+                key = (m.source, stage)
+                self.stage_seconds[key] = self.stage_seconds.get(key, 0.0) + secs
+                self.stage_calls[key] = self.stage_calls.get(key, 0) + m.stage_calls.get(stage, 0)
+            for name, n in m.counters.items():
+                key = (m.source, name)
+                self.articles[key] = self.articles.get(key, 0) + n
+            self.cycles[m.source] = self.cycles.get(m.source, 0) + 1
+            self.last_cycle[m.source] = (m.elapsed, time.time())
+            if "pipeline" in m.sections:
+                self.pipeline[m.source] = m.sections["pipeline"]
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP crawl_stage_seconds_total Time spent per crawl stage (summed over worker threads).",
+                "# TYPE crawl_stage_seconds_total counter",
+            ]
+            lines += [
+                f'crawl_stage_seconds_total{{source="{s}",stage="{st}"}} {v:.6f}'
+                for (s, st), v in sorted(self.stage_seconds.items())
+            ]
+            lines += ["# HELP crawl_stage_calls_total Calls per crawl stage.", "# TYPE crawl_stage_calls_total counter"]
+            lines += [
+                f'crawl_stage_calls_total{{source="{s}",stage="{st}"}} {v}'
+                for (s, st), v in sorted(self.stage_calls.items())
+            ]
+            lines += ["# HELP crawl_articles_total Articles by outcome.", "# TYPE crawl_articles_total counter"]
+            lines += [
+                f'crawl_articles_total{{source="{s}",result="{r}"}} {v}' for (s, r), v in sorted(self.articles.items())
+            ]
+            lines += ["# HELP crawl_cycles_total Completed crawl cycles.", "# TYPE crawl_cycles_total counter"]
+            lines += [f'crawl_cycles_total{{source="{s}"}} {v}' for s, v in sorted(self.cycles.items())]
+            lines += ["# HELP crawl_last_cycle_seconds Duration of the last cycle.", "# TYPE crawl_last_cycle_seconds gauge"]
+            lines += [f'crawl_last_cycle_seconds{{source="{s}"}} {v[0]:.3f}' for s, v in sorted(self.last_cycle.items())]
+            lines += [
+                "# HELP crawl_last_cycle_timestamp_seconds Unix time the last cycle finished.",
+                "# TYPE crawl_last_cycle_timestamp_seconds gauge",
+            ]
+            lines += [f'crawl_last_cycle_timestamp_seconds{{source="{s}"}} {v[1]:.0f}' for s, v in sorted(self.last_cycle.items())]
+            pipelines = sorted(self.pipeline.items())
+            lines += [
+                "# HELP crawl_pipeline_utilization Busy share of each pipeline stage's workers in the last cycle.",
+                "# TYPE crawl_pipeline_utilization gauge",
+            ]
+            lines += [
+                f'crawl_pipeline_utilization{{source="{s}",stage="{st}"}} {v["utilization"]}'
+                for s, p in pipelines for st, v in sorted(p["stages"].items())
+            ]
+            lines += [
+                "# HELP crawl_pipeline_queue_depth_max Max depth of each inter-stage queue in the last cycle.",
+                "# TYPE crawl_pipeline_queue_depth_max gauge",
+            ]
+            lines += [
+                f'crawl_pipeline_queue_depth_max{{source="{s}",queue="{q}"}} {v["max_depth"]}'
+                for s, p in pipelines for q, v in sorted(p["queues"].items())
+            ]
+        breakers = sorted(breaker_states().items())
+        lines += [
+            "# HELP crawl_breaker_state Circuit breaker state per source (0 closed, 1 half-open, 2 open).",
+            "# TYPE crawl_breaker_state gauge",
+        ]
+        lines += [f'crawl_breaker_state{{source="{s}"}} {breaker_state_value(b["state"])}' for s, b in breakers]
+        lines += ["# HELP crawl_breaker_trips_total Times the breaker opened.", "# TYPE crawl_breaker_trips_total counter"]
+        lines += [f'crawl_breaker_trips_total{{source="{s}"}} {b["trips"]}' for s, b in breakers]
+        lines += [
+            "# HELP crawl_breaker_saved_seconds_total Estimated fetch time saved by skipped fetches.",
+            "# TYPE crawl_breaker_saved_seconds_total counter",
+        ]
+        lines += [f'crawl_breaker_saved_seconds_total{{source="{s}"}} {b["saved_seconds"]:.1f}' for s, b in breakers]
+        return "\n".join(lines) + "\n"
+
+
+_registry = _Registry()
+
+
+def render_prometheus() -> str:
+    """Process-wide crawl metrics in the Prometheus text exposition format."""
+    return _registry.render()
+
+
+# Cycles of several sources can end at once (parallel crawler threads)
+_outputs_lock = threading.Lock()
+
+
+def _write_outputs(report: Dict) -> None:
+    report_file = os.getenv("CRAWL_REPORT_FILE")
+    metrics_file = os.getenv("CRAWL_METRICS_FILE")
+    if not report_file and not metrics_file:
+        return
+    with _outputs_lock:
+        if report_file:
+            try:
+                with open(report_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(report, ensure_ascii=False) + "\n")
+            except Exception as e:
+                print(f"[Metrics] Could not append report to {report_file}: {e}")
+        if metrics_file:
+            try:
+                # Write-then-rename so the textfile collector never reads a partial file;
+                # the pid keeps other crawler processes off this temp file
+                tmp = f"{metrics_file}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(render_prometheus())
+                os.replace(tmp, metrics_file)
+            except Exception as e:
+                print(f"[Metrics] Could not write {metrics_file}: {e}")
+
+
+def read_metrics_file() -> Optional[str]:
+    """Contents of CRAWL_METRICS_FILE written by the crawler process, if any."""
+    path = os.getenv("CRAWL_METRICS_FILE")
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
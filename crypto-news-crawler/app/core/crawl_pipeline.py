@@ -0,0 +1,305 @@
+"""
+app/core/crawl_pipeline.py
+
+Staged producer/consumer crawl pipeline.
+
+    fetch (asyncio) -> [fetched] -> extract (process pool) -> [extracted]
+        -> enrich (batched, thread) -> [enriched] -> store (bulk, thread)
+
+Each stage runs its own workers and hands items to the next stage through a
+bounded asyncio.Queue of CRAWL_QUEUE_SIZE items. A full queue blocks the
+producing stage (backpressure), so at most `concurrency` pages are in flight
+plus the queued items, however many URLs a cycle has.
+
+- fetch: CrawlEngine's async fetch (global/per-host limits, rate limiter,
+  circuit breaker); URLs are pulled by `concurrency` workers, not scheduled
+  all at once.
+- extract: parsing and extraction are CPU-bound and hold the GIL, so they run
+  in a process pool of CRAWL_EXTRACT_PROCESSES processes (0 = worker threads
+  in this process). The extract callable must be picklable.
+- enrich: takes up to CRAWL_ENRICH_BATCH extracted articles at a time, so
+  sentiment runs as one batched forward pass.
+- store: hands enriched articles to the bulk writer in batches.
+
+The cycle report gets a "pipeline" section: per stage busy time and
+utilization (busy / (wall time x workers)), time blocked on a full queue, and
+per queue the max and mean depth. Utilization and max depths are also
+exported as Prometheus gauges.
+
+Env vars:
+- CRAWL_PIPELINE (default 0)            # 1 = crawl cycles use this pipeline
+- CRAWL_QUEUE_SIZE (default 32)         # capacity of each inter-stage queue
+- CRAWL_EXTRACT_PROCESSES (default min(4, cpu))
+- CRAWL_ENRICH_BATCH (default 8)
+- CRAWL_ENRICH_BATCH_WAIT_MS (default 50) # wait for a fuller batch
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.crawl_engine import CrawlEngine, CrawlStats, _env_int
+from app.core.fetcher import new_async_client
+
+FETCH = "fetch"
+EXTRACT = "extract"
+ENRICH = "enrich"
+STORE = "store"
+
+# Queue shutdown marker
+_DONE = None
+
+
+def pipeline_enabled() -> bool:
+    return os.getenv("CRAWL_PIPELINE", "0") == "1"
+
+
+class PipelineStats:
+    """Busy/blocked time per stage and depth samples per queue for one run."""
+
+    def __init__(self, workers: Dict[str, int]) -> None:
+        self.workers = workers
+        self.busy: Dict[str, float] = {s: 0.0 for s in workers}
+        self.blocked: Dict[str, float] = {s: 0.0 for s in workers}
+        self.depth_max: Dict[str, int] = {}
+        self.depth_sum: Dict[str, int] = {}
+        self.depth_samples: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def add_busy(self, stage: str, seconds: float) -> None:
+        self.busy[stage] += seconds
+
+    async def put(self, stage: str, name: str, queue: asyncio.Queue, item: Any) -> None:
+        """Put into a bounded queue, counting the wait as the producing stage's blocked time."""
+        depth = queue.qsize()
+        self.depth_max[name] = max(self.depth_max.get(name, 0), depth + 1)
+        self.depth_sum[name] = self.depth_sum.get(name, 0) + depth
+        self.depth_samples[name] = self.depth_samples.get(name, 0) + 1
+        if queue.full():
+            t0 = time.perf_counter()
+            await queue.put(item)
+            self.blocked[stage] += time.perf_counter() - t0
+        else:
+            queue.put_nowait(item)
+
+    def report(self) -> Dict:
+        wall = self.elapsed or 1e-9
+        return {
+            "stages": {
+                s: {
+                    "workers": n,
+                    "busy_s": round(self.busy[s], 3),
+                    "utilization": round(min(1.0, self.busy[s] / (wall * n)), 3),
+                    "blocked_s": round(self.blocked[s], 3),
+                }
+                for s, n in self.workers.items()
+            },
+            "queues": {
+                q: {
+                    "max_depth": self.depth_max[q],
+                    "mean_depth": round(self.depth_sum[q] / self.depth_samples[q], 2),
+                }
+                for q in self.depth_max
+            },
+        }
+
+    def log_line(self, source: str) -> str:
+        report = self.report()
+        stages = ", ".join(f"{s} {v['utilization']:.0%}" for s, v in report["stages"].items())
+        queues = ", ".join(f"{q} max {v['max_depth']}" for q, v in report["queues"].items())
+        return f"[Pipeline] {source}: utilization {stages}; queues {queues or 'empty'}"
+
+
+_extract_pool: Optional[Executor] = None
+_extract_pool_lock = threading.Lock()
+
+
+def _shutdown_extract_pool() -> None:
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is not None:
+            _extract_pool.shutdown(wait=False, cancel_futures=True)
+            _extract_pool = None
+
+
+def extract_processes() -> int:
+    return max(0, int(os.getenv("CRAWL_EXTRACT_PROCESSES", str(min(4, os.cpu_count() or 1)))))
+
+
+def get_extract_pool() -> Optional[Executor]:
+    """Process-wide extraction process pool (None when CRAWL_EXTRACT_PROCESSES=0).
+
+    Worker processes are started with "spawn" (the parent has model and writer
+    threads, which fork does not copy safely) and live for the whole process,
+    so the interpreter start-up and imports are paid once.
+    """
+    global _extract_pool
+    processes = extract_processes()
+    if processes <= 0:
+        return None
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_shutdown_extract_pool)
+        return _extract_pool
+
+
+async def _take_batch(queue: asyncio.Queue, size: int, wait: float) -> Optional[List]:
+    """Up to `size` items: blocks for the first, then waits at most `wait` for more. None when done."""
+    first = await queue.get()
+    if first is _DONE:
+        return None
+    batch = [first]
+    deadline = time.perf_counter() + wait
+    while len(batch) < size:
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+        if item is _DONE:
+            queue.put_nowait(_DONE)  # leave the marker for the next take
+            break
+        batch.append(item)
+    return batch
+
+
+class CrawlPipeline(CrawlEngine):
+    """CrawlEngine variant that runs fetch / extract / enrich / store as separate stages.
+
+    - `extract(url, html)` -> extracted item; runs in the process pool. With
+      `metas`, it is called as `extract(url, html, metas.get(url))`, so each
+      pool task pickles only its own URL's data.
+    - `enrich(items)` with items [(url, extracted)] -> one result per item: the
+      document to store, None (nothing to store) or an Exception (article failed).
+    - `store(docs)` with docs [(url, document)].
+    """
+
+    def __init__(self, *args, queue_size: Optional[int] = None, batch_size: Optional[int] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.queue_size = queue_size or _env_int("CRAWL_QUEUE_SIZE", 32)
+        self.batch_size = batch_size or _env_int("CRAWL_ENRICH_BATCH", 8)
+        self.batch_wait = float(os.getenv("CRAWL_ENRICH_BATCH_WAIT_MS", "50")) / 1000.0
+        self.stats: Optional[PipelineStats] = None
+
+    def _fail(self, stats: CrawlStats, url: str, e: Exception) -> None:
+        print(f"[Article] Failed {url}: {e}")
+        stats.failed += 1
+        stats.failed_urls.append(url)
+
+    async def crawl_stages(
+        self,
+        urls: Iterable[str],
+        extract: Callable[[str, str], Any],
+        enrich: Callable[[List[Tuple[str, Any]]], List[Any]],
+        store: Callable[[List[Tuple[str, Any]]], None],
+        metas: Optional[Dict[str, Any]] = None,
+    ) -> CrawlStats:
+        urls = list(dict.fromkeys(urls))
+        stats = CrawlStats(total=len(urls))
+        if not urls:
+            return stats
+        loop = asyncio.get_running_loop()
+        process_pool = get_extract_pool()
+        extract_workers = extract_processes() if process_pool is not None else self.workers
+        pstats = self.stats = PipelineStats({FETCH: self.concurrency, EXTRACT: extract_workers, ENRICH: 1, STORE: 1})
+        fetched: asyncio.Queue = asyncio.Queue(self.queue_size)
+        extracted: asyncio.Queue = asyncio.Queue(self.queue_size)
+        enriched: asyncio.Queue = asyncio.Queue(self.queue_size)
+        pending = iter(urls)
+        global_sem = asyncio.Semaphore(self.concurrency)
+        host_sems: Dict[str, asyncio.Semaphore] = {}
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers + 2, thread_name_prefix="crawl") as threads:
+            extract_pool = process_pool or threads
+
+            async def fetch_worker(client) -> None:
+                for url in pending:
+                    t0 = time.perf_counter()
+                    html = await self._fetch(client, url, stats, global_sem, host_sems)
+                    pstats.add_busy(FETCH, time.perf_counter() - t0)
+                    if html is not None:
+                        await pstats.put(FETCH, "fetched", fetched, (url, html))
+
+            async def extract_worker() -> None:
+                while True:
+                    item = await fetched.get()
+                    if item is _DONE:
+                        return
+                    url, html = item
+                    args = (url, html) if metas is None else (url, html, metas.get(url))
+                    t0 = time.perf_counter()
+                    try:
+                        result = await loop.run_in_executor(extract_pool, extract, *args)
+                    except Exception as e:
+                        self._fail(stats, url, e)
+                        continue
+                    finally:
+                        pstats.add_busy(EXTRACT, time.perf_counter() - t0)
+                    await pstats.put(EXTRACT, "extracted", extracted, (url, result))
+
+            async def enrich_worker() -> None:
+                while True:
+                    batch = await _take_batch(extracted, self.batch_size, self.batch_wait)
+                    if batch is None:
+                        return
+                    t0 = time.perf_counter()
+                    try:
+                        results = await loop.run_in_executor(threads, enrich, batch)
+                    except Exception as e:
+                        results = [e] * len(batch)
+                    pstats.add_busy(ENRICH, time.perf_counter() - t0)
+                    for (url, _), result in zip(batch, results):
+                        if isinstance(result, Exception):
+                            self._fail(stats, url, result)
+                        elif result is None:
+                            stats.processed += 1
+                        else:
+                            await pstats.put(ENRICH, "enriched", enriched, (url, result))
+
+            async def store_worker() -> None:
+                while True:
+                    batch = await _take_batch(enriched, self.batch_size, 0.0)
+                    if batch is None:
+                        return
+                    t0 = time.perf_counter()
+                    try:
+                        await loop.run_in_executor(threads, store, batch)
+                        stats.processed += len(batch)
+                    except Exception as e:
+                        for url, _ in batch:
+                            self._fail(stats, url, e)
+                    pstats.add_busy(STORE, time.perf_counter() - t0)
+
+            async with new_async_client(max_connections=self.concurrency, timeout=self.timeout) as client:
+                extractors = [asyncio.create_task(extract_worker()) for _ in range(extract_workers)]
+                enricher = asyncio.create_task(enrich_worker())
+                storer = asyncio.create_task(store_worker())
+                # Shut the stages down in order: each one drains its queue before the next gets the marker
+                await asyncio.gather(*[fetch_worker(client) for _ in range(min(self.concurrency, len(urls)))])
+            for _ in extractors:
+                await fetched.put(_DONE)
+            await asyncio.gather(*extractors)
+            await extracted.put(_DONE)
+            await enricher
+            await enriched.put(_DONE)
+            await storer
+        stats.elapsed = pstats.elapsed = time.perf_counter() - start
+        if self.metrics is not None:
+            self.metrics.attach("pipeline", pstats.report())
+        return stats
+
+    def run_stages(self, urls: Iterable[str], extract, enrich, store, metas: Optional[Dict[str, Any]] = None) -> CrawlStats:
+        """Blocking entry point for synchronous callers."""
+        return asyncio.run(self.crawl_stages(urls, extract, enrich, store, metas))
@@ -0,0 +1,126 @@
+"""
+app/core/dates.py
+
+Fast date parsing for feed, meta, <time> and JSON-LD dates.
+
+parse_date() is a drop-in for dateparser.parse() on the formats crawled
+sources use. It tries, in order:
+- ISO 8601 (datetime.fromisoformat: "2025-10-14T12:01:02.123Z", "+07:00", date only);
+- RFC 822 / RFC 2822 (email.utils, the RSS pubDate format) with a numeric or
+  known zone ("Tue, 14 Oct 2025 12:01:02 GMT");
+- dateparser for everything else (language detection, fuzzy formats).
+
+Like dateparser, the result is timezone-aware only when the string carries a
+zone. Results are memoized per string (the same pubDate is read from the feed,
+the page meta and JSON-LD several times per article). Fallback results are
+only memoized for strings with a 4-digit year, so relative dates such as
+"2 hours ago" are always evaluated against the current time.
+
+Env vars:
+- DATE_CACHE_SIZE (default 4096)   # distinct date strings remembered
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_tz
+from typing import Dict, Optional
+
+import dateparser
+
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$")
+_YEAR_RE = re.compile(r"\d{4}")
+_FRACTION_RE = re.compile(r"([.,])(\d{1,6})\d*(?=Z|[+-]|$)")
+# Zones email.utils really knows; it reads any other (or a missing) zone as UTC
+_RFC822_ZONE_RE = re.compile(r"\s(?:[+-]\d{4}|UT|UTC|GMT|Z|[ECMP][SD]T)$", re.IGNORECASE)
+
+
+def _iso(value: str) -> Optional[datetime]:
+    if not _ISO_RE.match(value):
+        return None
+    # fromisoformat (3.11) takes Z and any fraction length, but normalise the rare forms
+    value = _FRACTION_RE.sub(lambda m: "." + m.group(2), value)
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _rfc822(value: str) -> Optional[datetime]:
+    if not _RFC822_ZONE_RE.search(value):
+        return None
+    parsed = parsedate_tz(value)
+    if parsed is None or parsed[9] is None:
+        return None
+    try:
+        naive = datetime(*parsed[:6])
+    except ValueError:
+        return None
+    return naive.replace(tzinfo=timezone(timedelta(seconds=parsed[9])))
+
+
+class DateParser:
+    """parse(value) with the fast paths, the dateparser fallback and an LRU memo (thread-safe)."""
+
+    def __init__(self, cache_size: Optional[int] = None) -> None:
+        self.cache_size = int(os.getenv("DATE_CACHE_SIZE", "4096")) if cache_size is None else cache_size
+        self._cache: "OrderedDict[str, Optional[datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"iso": 0, "rfc822": 0, "fallback": 0, "cache_hits": 0, "failed": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def parse(self, value) -> Optional[datetime]:
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value
+        value = str(value).strip()
+        if not value:
+            return None
+        with self._lock:
+            if value in self._cache:
+                self._cache.move_to_end(value)
+                self.stats["cache_hits"] += 1
+                return self._cache[value]
+        dt = _iso(value)
+        if dt is not None:
+            self._count("iso")
+        else:
+            dt = _rfc822(value)
+            if dt is not None:
+                self._count("rfc822")
+            else:
+                try:
+                    dt = dateparser.parse(value)
+                except Exception:
+                    dt = None
+                self._count("fallback" if dt is not None else "failed")
+                if not _YEAR_RE.search(value):
+                    return dt  # relative or year-less: depends on today
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[value] = dt
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return dt
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_parser = DateParser()
+
+
+def parse_date(value) -> Optional[datetime]:
+    """Datetime from a date string (None when unparseable); never raises."""
+    return _parser.parse(value)
+
+
+def get_date_parser() -> DateParser:
+    return _parser
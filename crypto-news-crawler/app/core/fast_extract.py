@@ -0,0 +1,197 @@
+"""
+app/core/fast_extract.py
+
+Tiered article extraction.
+
+Tier "fast" reads the title and body straight from the page's lxml tree with
+the source's configured selectors (compiled once, see ArticleDocument.select).
+Tier "full" is trafilatura, which parses the page a second time and runs its
+boilerplate heuristics; it only runs when the fast tier fails the quality checks:
+- a title was found (title selector, <h1> or og:title);
+- the body has at least FAST_EXTRACT_MIN_CHARS characters spread over at least
+  FAST_EXTRACT_MIN_BLOCKS paragraphs / headings / list items;
+- no more than FAST_EXTRACT_MAX_LINK_DENSITY of the body text is link text;
+- the body is not just the title.
+
+The fast tier reads no date: when the page's meta / <time> / JSON-LD dates
+are missing too, `metadata_date` runs trafilatura's metadata pass (not the
+body extraction) so fast-tier articles get the same date fallback.
+
+A comma-separated content selector is read as an ordered list of alternatives:
+the first alternative that matches is used, so a wrapper listed after the
+real body selector does not duplicate the text.
+
+Which tier served each article is counted per source along with the
+extraction CPU time, so the fast-path hit ratio and the CPU saved can be logged.
+
+Env vars:
+- FAST_EXTRACT (default 1)                      # 0 = always use trafilatura
+- FAST_EXTRACT_MIN_CHARS (default 400)
+- FAST_EXTRACT_MIN_BLOCKS (default 3)
+- FAST_EXTRACT_MAX_LINK_DENSITY (default 0.5)
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from app.core.article_document import ArticleDocument
+
+FAST = "fast"
+FULL = "full"
+
+_EXCLUDED = "ancestor::script or ancestor::style or ancestor::template"
+# Block elements of the body; blocks nested in another block or in page furniture are skipped
+_BLOCKS = etree.XPath(
+    ".//*[self::p or self::h2 or self::h3 or self::h4 or self::li or self::blockquote or self::pre]"
+    "[not(ancestor::p or ancestor::li or ancestor::blockquote"
+    " or ancestor::aside or ancestor::nav or ancestor::figure or ancestor::footer or ancestor::form)]"
+)
+_TEXT = etree.XPath(f".//text()[not({_EXCLUDED})]")
+_LINK_TEXT = etree.XPath(f".//a//text()[not({_EXCLUDED})]")
+
+
+def fast_extract_enabled() -> bool:
+    return os.getenv("FAST_EXTRACT", "1") == "1"
+
+
+def split_selectors(selector: Optional[str]) -> List[str]:
+    """Top-level alternatives of a selector list ("a, b[x='1,2']" -> ["a", "b[x='1,2']"])."""
+    if not selector:
+        return []
+    parts: List[str] = []
+    depth, quote, start = 0, None, 0
+    for i, ch in enumerate(selector):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(selector[start:i].strip())
+            start = i + 1
+    parts.append(selector[start:].strip())
+    return [p for p in parts if p]
+
+
+def _inline(el) -> str:
+    """Text of `el` with inline markup merged and whitespace collapsed."""
+    return " ".join("".join(_TEXT(el)).split())
+
+
+def _first_match(doc: ArticleDocument, selector: Optional[str]) -> List:
+    for alternative in split_selectors(selector):
+        nodes = doc.select(alternative)
+        if nodes:
+            return nodes
+    return []
+
+
+def _title(doc: ArticleDocument, selector: Optional[str]) -> Optional[str]:
+    nodes = _first_match(doc, selector) or doc.select("h1")
+    for node in nodes:
+        text = (node.get("content") or "").strip() if node.tag == "meta" else _inline(node)
+        if text:
+            return text
+    og = doc.meta_content("property", "og:title")
+    return og.strip() if og else None
+
+
+def extract_fast(doc: ArticleDocument, title_selector: Optional[str], content_selector: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(title, content) from configured selectors, or None when the result fails the quality checks."""
+    nodes = _first_match(doc, content_selector)
+    if not nodes:
+        return None
+    title = _title(doc, title_selector)
+    if not title:
+        return None
+    blocks: List[str] = []
+    link_chars = 0
+    for node in nodes:
+        found = _BLOCKS(node)
+        for block in found or [node]:
+            text = _inline(block)
+            if text:
+                blocks.append(text)
+                link_chars += len("".join(_LINK_TEXT(block)).strip())
+    content = "\n\n".join(blocks)
+    total = len(content)
+    if (
+        total < int(os.getenv("FAST_EXTRACT_MIN_CHARS", "400"))
+        or len(blocks) < int(os.getenv("FAST_EXTRACT_MIN_BLOCKS", "3"))
+        or link_chars > float(os.getenv("FAST_EXTRACT_MAX_LINK_DENSITY", "0.5")) * total
+        or content.strip() == title.strip()
+    ):
+        return None
+    return title, content
+
+
+def metadata_date(html: str):
+    """Publication date from trafilatura's metadata pass (htmldate heuristics), or None."""
+    import trafilatura
+
+    from app.core.dates import parse_date
+
+    try:
+        meta = trafilatura.extract_metadata(html)
+        return parse_date(meta.date) if meta is not None and meta.date else None
+    except Exception:
+        return None
+
+
+class TierStats:
+    """Per-source count and extraction CPU time for each tier (thread-safe, process-wide)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, List[float]]] = {}
+
+    def record(self, source: str, tier: str, cpu_seconds: float) -> None:
+        with self._lock:
+            slot = self._data.setdefault(source, {FAST: [0, 0.0], FULL: [0, 0.0]})[tier]
+            slot[0] += 1
+            slot[1] += cpu_seconds
+
+    def summary(self, source: str) -> Optional[Dict]:
+        with self._lock:
+            data = self._data.get(source)
+            if not data:
+                return None
+            (fast_n, fast_cpu), (full_n, full_cpu) = data[FAST], data[FULL]
+        fast_avg = fast_cpu / fast_n if fast_n else None
+        full_avg = full_cpu / full_n if full_n else None
+        saved = fast_n * (full_avg - fast_avg) if fast_avg is not None and full_avg is not None else None
+        return {
+            "fast": int(fast_n),
+            "full": int(full_n),
+            "hit_ratio": fast_n / (fast_n + full_n),
+            "fast_cpu_ms": fast_avg * 1000 if fast_avg is not None else None,
+            "full_cpu_ms": full_avg * 1000 if full_avg is not None else None,
+            # Estimate: fast-path articles times the per-article CPU difference between tiers
+            "cpu_saved_ms": max(0.0, saved * 1000) if saved is not None else None,
+        }
+
+    def log_line(self, source: str) -> Optional[str]:
+        s = self.summary(source)
+        if s is None:
+            return None
+        line = f"[Extract] {source}: fast path {s['fast']}/{s['fast'] + s['full']} ({s['hit_ratio']:.0%})"
+        if s["fast_cpu_ms"] is not None and s["full_cpu_ms"] is not None:
+            line += (
+                f", {s['fast_cpu_ms']:.1f} vs {s['full_cpu_ms']:.1f} ms CPU/article, "
+                f"~{s['cpu_saved_ms']:.0f} ms CPU saved"
+            )
+        return line + " (process-wide)"
+
+
+_tier_stats = TierStats()
+
+
+def get_tier_stats() -> TierStats:
+    return _tier_stats
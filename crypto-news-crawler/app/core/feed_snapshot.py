@@ -0,0 +1,175 @@
+"""
+app/core/feed_snapshot.py
+
+One parsed RSS/Atom feed per crawl cycle.
+
+The feed is downloaded and parsed once; entries are indexed by normalized URL,
+by URL path (query/fragment dropped) and by numeric article id so extraction
+stages can look up RSS metadata (title, summary, date, author) in O(1)
+instead of re-parsing the feed for every article.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import feedparser  # RSS/Atom parser
+except Exception:
+    feedparser = None
+
+from app.core.fetcher import fetch_feed, fetch_html
+
+_HTTP_RE = re.compile(r"^http://", re.IGNORECASE)
+_QUERY_RE = re.compile(r"[?#].*$")
+_PATH_ID_RE = re.compile(r"/(\d{4,})/")
+_QUERY_ID_RE = re.compile(r"[?&]p=(\d+)")
+
+
+def norm_url(u: Optional[str]) -> Optional[str]:
+    """Strip, drop trailing slash and unify scheme to https."""
+    if not u:
+        return None
+    u = str(u).strip()
+    if u.endswith("/"):
+        u = u[:-1]
+    return _HTTP_RE.sub("https://", u)
+
+
+def norm_url_path(u: Optional[str]) -> Optional[str]:
+    """Like norm_url but also drops query string and fragment."""
+    if not u:
+        return None
+    u = _QUERY_RE.sub("", _HTTP_RE.sub("https://", str(u).strip()))
+    if u.endswith("/"):
+        u = u[:-1]
+    return u
+
+
+def url_id(u: Optional[str]) -> Optional[str]:
+    """Numeric article id embedded in the URL (/12345/ or ?p=123), if any."""
+    if not u:
+        return None
+    m = _PATH_ID_RE.search(u) or _QUERY_ID_RE.search(u)
+    return m.group(1) if m else None
+
+
+@dataclass
+class FeedEntry:
+    link: str
+    guid: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    published: Optional[str] = None
+    author: Optional[str] = None
+
+
+def _entry_author(entry) -> Optional[str]:
+    if hasattr(entry, "author") and entry.author:
+        return str(entry.author).strip()
+    if hasattr(entry, "authors") and entry.authors:
+        names = []
+        for a in entry.authors:
+            name = (a.get("name") if isinstance(a, dict) else None) or None
+            if name:
+                names.append(str(name).strip())
+        if names:
+            return ", ".join(list(dict.fromkeys(names)))
+    if "dc_creator" in entry and entry["dc_creator"]:
+        return str(entry["dc_creator"]).strip()
+    return None
+
+
+class FeedSnapshot:
+    def __init__(
+        self,
+        list_url: str,
+        raw: str = "",
+        entries: Optional[List[FeedEntry]] = None,
+        unchanged: bool = False,
+    ) -> None:
+        self.list_url = list_url
+        self.raw = raw
+        # True when a conditional fetch found the feed identical to the previous cycle
+        self.unchanged = unchanged
+        self.entries: List[FeedEntry] = entries or []
+        self._by_url: Dict[str, FeedEntry] = {}
+        self._by_path: Dict[str, FeedEntry] = {}
+        self._by_id: Dict[str, FeedEntry] = {}
+        for entry in self.entries:
+            self._index(entry)
+
+    def _index(self, entry: FeedEntry) -> None:
+        # First entry wins, matching the feed order used by the old linear scans
+        for cand in (entry.link, entry.guid):
+            if not cand:
+                continue
+            nc = norm_url(cand)
+            if nc:
+                self._by_url.setdefault(nc, entry)
+            npc = norm_url_path(cand)
+            if npc:
+                self._by_path.setdefault(npc, entry)
+            cid = url_id(cand)
+            if cid:
+                self._by_id.setdefault(cid, entry)
+
+    @classmethod
+    def load(cls, list_url: str, conditional: bool = False) -> "FeedSnapshot":
+        """Download `list_url` once and parse it. Never raises; entries may be empty.
+
+        With `conditional=True` the fetch sends the stored ETag/Last-Modified
+        validators; an unchanged feed yields an empty snapshot with `unchanged=True`
+        and is not parsed at all.
+        """
+        try:
+            raw = fetch_feed(list_url) if conditional else fetch_html(list_url)
+        except Exception as e:
+            print(f"[Feed] Fetch failed for {list_url}: {e}")
+            return cls(list_url)
+        if raw is None:
+            return cls(list_url, unchanged=True)
+        return cls.from_text(list_url, raw)
+
+    @classmethod
+    def from_text(cls, list_url: str, raw: str) -> "FeedSnapshot":
+        if feedparser is None or not raw:
+            return cls(list_url, raw=raw)
+        try:
+            feed = feedparser.parse(raw)
+        except Exception:
+            return cls(list_url, raw=raw)
+        entries: List[FeedEntry] = []
+        for e in getattr(feed, "entries", []) or []:
+            link = getattr(e, "link", None) or getattr(e, "id", None)
+            if not link:
+                continue
+            guid = getattr(e, "id", None) or getattr(e, "guid", None)
+            title = getattr(e, "title", None)
+            summary = getattr(e, "summary", None)
+            pub = getattr(e, "published", None) or getattr(e, "updated", None)
+            entries.append(FeedEntry(
+                link=norm_url(link) or link,
+                guid=str(guid).strip() if guid else None,
+                title=str(title).strip() if title else None,
+                summary=str(summary).strip() if summary else None,
+                published=str(pub).strip() if pub else None,
+                author=_entry_author(e),
+            ))
+        return cls(list_url, raw=raw, entries=entries)
+
+    def urls(self) -> List[str]:
+        return list(dict.fromkeys(e.link for e in self.entries))
+
+    def lookup(self, url: Optional[str], canonical_urls: Iterable[Optional[str]] = ()) -> Optional[FeedEntry]:
+        """Find the feed entry for an article URL (or its canonical/og:url variants)."""
+        targets = [url] + [c for c in canonical_urls if c]
+        for t in targets:
+            hit = self._by_url.get(norm_url(t) or "") or self._by_path.get(norm_url_path(t) or "")
+            if hit:
+                return hit
+        tid = url_id(url)
+        return self._by_id.get(tid) if tid else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,238 @@
+"""
+app/core/fetch_archive.py
+
+Record and replay HTTP responses fetched through app/core/fetcher.py.
+
+In record mode every response (feeds, list pages, article pages) is passed
+through to the crawler and also written to an archive directory. In replay
+mode the same responses are served from the archive without touching the
+network, so crawl benchmarks are deterministic and run offline / in CI.
+
+Archive layout (content-addressed, bodies stored once):
+    <dir>/index.jsonl                 # one JSON line per response: method, url, status, headers, sha256
+    <dir>/blobs/ab/abcdef...gz        # gzip-compressed body, named by the SHA-256 of the body
+
+Bodies are stored decoded (Content-Encoding removed). When a URL was recorded
+more than once (e.g. a feed over several cycles) replay serves the responses in
+recording order and then keeps serving the last one. A request for a URL that
+is not in the archive fails like a connection error. Replay answers
+If-None-Match with 304 when the recorded ETag matches.
+
+Rendered fetches (Playwright) are not archived; with an archive active
+fetch_html_rendered uses the plain HTTP fetch.
+
+Env vars:
+- FETCH_ARCHIVE_MODE (optional)           # record | replay (unset = live network only)
+- FETCH_ARCHIVE_DIR (default fetch_archive)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Headers that describe the original transfer, not the (decoded) body we store
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "set-cookie"}
+
+
+class FetchArchive:
+    """Content-addressed store of HTTP responses keyed by (method, url)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._index_path = os.path.join(path, "index.jsonl")
+        self._entries: Dict[Tuple[str, str], List[Dict]] = {}
+        self._cursor: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0, "blobs_written": 0}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted recording
+                self._entries.setdefault((entry["method"], entry["url"]), []).append(entry)
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.path, "blobs", digest[:2], f"{digest}.gz")
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    def urls(self) -> List[str]:
+        return [url for (_, url) in self._entries]
+
+    # ---------- Recording ----------
+    def store(self, method: str, url: str, status: int, headers: httpx.Headers, body: bytes) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        entry = {
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": [[k, v] for k, v in headers.multi_items() if k.lower() not in _DROP_HEADERS],
+            "sha256": digest,
+            "size": len(body),
+        }
+        with self._lock:
+            if not os.path.exists(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                tmp = f"{blob}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(gzip.compress(body, compresslevel=6))
+                os.replace(tmp, blob)
+                self.stats["blobs_written"] += 1
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._entries.setdefault((method, url), []).append(entry)
+            self.stats["recorded"] += 1
+
+    # ---------- Replay ----------
+    def lookup(self, method: str, url: str) -> Optional[Dict]:
+        key = (method, url)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.stats["misses"] += 1
+                return None
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = min(i + 1, len(entries) - 1)
+            self.stats["replayed"] += 1
+            return entries[i]
+
+    def body(self, entry: Dict) -> bytes:
+        with open(self._blob_path(entry["sha256"]), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def rewind(self) -> None:
+        """Serve every URL from its first recorded response again."""
+        with self._lock:
+            self._cursor.clear()
+
+    def response(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        entry = self.lookup(request.method, url)
+        if entry is None:
+            raise httpx.ConnectError(f"Not in fetch archive: {url}", request=request)
+        headers = httpx.Headers(entry["headers"])
+        etag = headers.get("etag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers, request=request)
+        return httpx.Response(entry["status"], headers=headers, content=self.body(entry), request=request)
+
+
+def _record_response(archive: FetchArchive, request: httpx.Request, response: httpx.Response, body: bytes) -> httpx.Response:
+    # 304s carry no body; replay answers conditional requests from the stored 200
+    if response.status_code != 304:
+        archive.store(request.method, str(request.url), response.status_code, response.headers, body)
+    headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROP_HEADERS]
+    return httpx.Response(response.status_code, headers=headers, content=body, extensions=response.extensions, request=request)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(self, archive: FetchArchive, inner: httpx.BaseTransport) -> None:
+        self.archive = archive
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.inner.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        return _record_response(self.archive, request, response, body)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, archive: FetchArchive, inner: httpx.AsyncBaseTransport) -> None:
+        self.archive = archive
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        return _record_response(self.archive, request, response, body)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    def __init__(self, archive: FetchArchive) -> None:
+        self.archive = archive
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.archive.response(request)
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, archive: FetchArchive) -> None:
+        self.archive = archive
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return self.archive.response(request)
+
+
+_archive: Optional[FetchArchive] = None
+_archive_lock = threading.Lock()
+
+
+def archive_mode() -> Optional[str]:
+    mode = (os.getenv("FETCH_ARCHIVE_MODE") or "").strip().lower()
+    return mode if mode in (RECORD, REPLAY) else None
+
+
+def get_fetch_archive() -> Optional[FetchArchive]:
+    """Process-wide archive when FETCH_ARCHIVE_MODE is record or replay, else None."""
+    global _archive
+    if archive_mode() is None:
+        return None
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                path = os.getenv("FETCH_ARCHIVE_DIR", "fetch_archive")
+                os.makedirs(path, exist_ok=True)
+                _archive = FetchArchive(path)
+                print(f"[Archive] {archive_mode()} mode: {path} ({len(_archive)} responses)")
+    return _archive
+
+
+def sync_transport(inner_factory) -> Optional[httpx.BaseTransport]:
+    """Transport for the shared sync client, or None for the live network only."""
+    archive = get_fetch_archive()
+    if archive is None:
+        return None
+    if archive_mode() == REPLAY:
+        return ReplayTransport(archive)
+    return RecordingTransport(archive, inner_factory())
+
+
+def async_transport(inner_factory) -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for crawl-engine async clients, or None for the live network only."""
+    archive = get_fetch_archive()
+    if archive is None:
+        return None
+    if archive_mode() == REPLAY:
+        return AsyncReplayTransport(archive)
+    return AsyncRecordingTransport(archive, inner_factory())
@@ -1,9 +1,23 @@
+import asyncio
+import hashlib
 import os
+import threading
+import time
+from typing import Dict, Optional
+
 import httpx
-try:
-    from playwright.sync_api import sync_playwright
-except Exception:
-    sync_playwright = None
+
+from app.core.fetch_archive import REPLAY, archive_mode, async_transport, get_fetch_archive, sync_transport
+from app.core.politeness import (
+    RETRY_STATUSES,
+    HostDeferred,
+    get_host_limiter,
+    host_of,
+    max_retries,
+    parse_retry_after,
+    retry_after_max,
+    retry_delay,
+)
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -20,51 +34,289 @@ DEFAULT_HEADERS = {
 }
 
 
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = os.getenv("FETCH_HTTP2", "1") == "1"
+except Exception:
+    HTTP2_ENABLED = False
+
+# Connection-specific headers are invalid on HTTP/2; the pool keeps connections alive anyway
+_CLIENT_HEADERS = {k: v for k, v in DEFAULT_HEADERS.items() if k != "Connection"}
+
+_POOL_SIZE = int(os.getenv("FETCH_POOL_SIZE", "20"))
+_KEEPALIVE_EXPIRY = float(os.getenv("FETCH_KEEPALIVE_SECONDS", "60"))
+# A dead host fails fast on connect instead of holding the fetch for the full timeout
+_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", "5"))
+
+# Transport errors worth another attempt (read timeouts are not: the host is up but too slow)
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "connections": 0,
+    "bytes_downloaded": 0,
+    "not_modified": 0,
+    "unchanged": 0,
+    "retries": 0,
+}
+
+# Per list URL validators for conditional GET: {url: {"etag", "last_modified", "body_hash"}}
+_feed_validators: Dict[str, Dict[str, Optional[str]]] = {}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def _trace(event_name: str, info: dict) -> None:
+    if event_name == "connection.connect_tcp.complete":
+        _count("connections")
+
+
+async def _atrace(event_name: str, info: dict) -> None:
+    _trace(event_name, info)
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_client() -> httpx.Client:
+    """Long-lived pooled client shared by all sync fetches (keep-alive per host, HTTP/2 if available)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Record/replay (app/core/fetch_archive.py) wraps or replaces the network transport
+                transport = sync_transport(lambda: httpx.HTTPTransport(http2=HTTP2_ENABLED, limits=_limits(_POOL_SIZE)))
+                _client = httpx.Client(
+                    headers=_CLIENT_HEADERS,
+                    http2=HTTP2_ENABLED,
+                    follow_redirects=True,
+                    limits=_limits(_POOL_SIZE),
+                    transport=transport,
+                )
+    return _client
+
+
+def close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def fetch_stats() -> Dict[str, int]:
+    """Snapshot of fetch counters (requests, connections opened, bytes downloaded, ...)."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def stats_delta(before: Dict[str, int]) -> Dict[str, int]:
+    now = fetch_stats()
+    return {k: now[k] - before.get(k, 0) for k in now}
+
+
+def _timeout(timeout: float) -> httpx.Timeout:
+    return httpx.Timeout(timeout, connect=min(timeout, _CONNECT_TIMEOUT))
+
+
+def _politeness_enabled() -> bool:
+    # Replayed responses come from disk: no host to be polite to, and misses should fail at once
+    return archive_mode() != REPLAY
+
+
+def _slot_delay(host: str) -> float:
+    """Wait for the host's rate-limit slot; fail fast when it asked for a long pause."""
+    delay = get_host_limiter().reserve(host)
+    if delay > retry_after_max():
+        raise HostDeferred(f"{host} asked to retry in {delay:.0f}s")
+    return delay
+
+
+def _next_delay(host: str, attempt: int, resp: Optional[httpx.Response] = None) -> Optional[float]:
+    """Delay before retrying after `resp` (or a transport error), or None to stop retrying."""
+    if attempt >= max_retries():
+        return None
+    retry_after = None
+    if resp is not None:
+        if resp.status_code not in RETRY_STATUSES:
+            return None
+        retry_after = parse_retry_after(resp.headers.get("retry-after"))
+        if retry_after is not None:
+            get_host_limiter().defer(host, retry_after)
+            if retry_after > retry_after_max():
+                return None
+    _count("retries")
+    return retry_delay(attempt, retry_after)
+
+
+def _send(url: str, timeout: float, headers: Optional[Dict[str, str]]) -> httpx.Response:
+    resp = get_client().get(url, timeout=_timeout(timeout), headers=headers, extensions={"trace": _trace})
+    _count("requests")
+    _count("bytes_downloaded", resp.num_bytes_downloaded)
+    return resp
+
+
+def _get(url: str, timeout: float, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """GET through the per-host rate limiter, retrying connection errors and 429/5xx with backoff."""
+    if not _politeness_enabled():
+        return _send(url, timeout, headers)
+    host = host_of(url)
+    attempt = 0
+    while True:
+        time.sleep(_slot_delay(host))
+        try:
+            resp = _send(url, timeout, headers)
+        except _RETRY_ERRORS:
+            delay = _next_delay(host, attempt)
+            if delay is None:
+                raise
+        else:
+            delay = _next_delay(host, attempt, resp)
+            if delay is None:
+                return resp
+        attempt += 1
+        time.sleep(delay)
+
+
 def fetch_html(url: str, timeout: float = 20.0) -> str:
-    resp = httpx.get(url, headers=DEFAULT_HEADERS, timeout=timeout, follow_redirects=True)
+    resp = _get(url, timeout)
     resp.raise_for_status()
     return resp.text
 
 
-def fetch_html_rendered(url: str, timeout: float = 30.0) -> str:
+def fetch_bytes(url: str, timeout: float = 20.0) -> bytes:
+    """Raw response body (sitemaps may be served gzipped as .xml.gz)."""
+    resp = _get(url, timeout)
+    resp.raise_for_status()
+    return resp.content
+
+
+def fetch_feed(url: str, timeout: float = 20.0) -> Optional[str]:
+    """Fetch a feed/list URL with conditional GET.
+
+    Returns None when the feed has not changed since the last fetch: either the
+    server answered 304 to If-None-Match/If-Modified-Since, or (for servers
+    without validators) the body hash equals the previous one.
+    """
+    known = _feed_validators.get(url) or {}
+    headers: Dict[str, str] = {}
+    if known.get("etag"):
+        headers["If-None-Match"] = known["etag"]  # type: ignore[assignment]
+    if known.get("last_modified"):
+        headers["If-Modified-Since"] = known["last_modified"]  # type: ignore[assignment]
+    resp = _get(url, timeout, headers=headers or None)
+    if resp.status_code == 304:
+        _count("not_modified")
+        return None
+    resp.raise_for_status()
+    body_hash = hashlib.sha1(resp.content).hexdigest()
+    _feed_validators[url] = {
+        "etag": resp.headers.get("etag"),
+        "last_modified": resp.headers.get("last-modified"),
+        "body_hash": body_hash,
+    }
+    if known.get("body_hash") == body_hash:
+        _count("unchanged")
+        return None
+    return resp.text
+
+
+def feed_validators(url: str) -> Dict[str, Optional[str]]:
+    """Conditional-GET validators remembered for `url` (etag, last_modified, body_hash)."""
+    return dict(_feed_validators.get(url) or {})
+
+
+def restore_feed_validators(url: str, validators: Dict[str, Optional[str]]) -> None:
+    """Seed validators (e.g. from a stored checkpoint) unless this process already has newer ones."""
+    if url not in _feed_validators and any(validators.values()):
+        _feed_validators[url] = dict(validators)
+
+
+def forget_feed_validators(url: str) -> None:
+    """Make the next fetch_feed(url) download and return the body again."""
+    _feed_validators.pop(url, None)
+
+
+def new_async_client(max_connections: int = 20, timeout: float = 20.0) -> httpx.AsyncClient:
+    """Create a shared async client for concurrent crawling (connection pooling + keep-alive)."""
+    transport = async_transport(
+        lambda: httpx.AsyncHTTPTransport(http2=HTTP2_ENABLED, limits=_limits(max_connections))
+    )
+    return httpx.AsyncClient(
+        headers=_CLIENT_HEADERS,
+        http2=HTTP2_ENABLED,
+        timeout=timeout,
+        follow_redirects=True,
+        limits=_limits(max_connections),
+        transport=transport,
+    )
+
+
+async def _asend(client: httpx.AsyncClient, url: str, timeout: float) -> httpx.Response:
+    resp = await client.get(url, timeout=_timeout(timeout), extensions={"trace": _atrace})
+    _count("requests")
+    _count("bytes_downloaded", resp.num_bytes_downloaded)
+    return resp
+
+
+async def fetch_html_async(client: httpx.AsyncClient, url: str, timeout: float = 20.0) -> str:
+    """Async counterpart of fetch_html (same rate limiting and retries)."""
+    if not _politeness_enabled():
+        resp = await _asend(client, url, timeout)
+        resp.raise_for_status()
+        return resp.text
+    host = host_of(url)
+    attempt = 0
+    while True:
+        await asyncio.sleep(_slot_delay(host))
+        try:
+            resp = await _asend(client, url, timeout)
+        except _RETRY_ERRORS:
+            delay = _next_delay(host, attempt)
+            if delay is None:
+                raise
+        else:
+            delay = _next_delay(host, attempt, resp)
+            if delay is None:
+                resp.raise_for_status()
+                return resp.text
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def fetch_html_rendered(url: str, timeout: float = 30.0, wait_selector: Optional[str] = None) -> str:
     """
     Fetch fully rendered HTML using Playwright if available, otherwise fallback to requests.
 
-    - Uses Chromium headless and waits for network idle.
-    - Applies DEFAULT_HEADERS via extra HTTP headers.
+    - Reuses one long-lived Chromium and a pool of contexts (see app/core/browser_pool.py).
+    - Images, fonts, media and third-party trackers are blocked.
+    - Waits for DOMContentLoaded, then up to a few seconds for `wait_selector` if given.
     - If Playwright times out or fails, falls back to plain HTTP fetch.
     """
-    # Allow disabling rendered fetch via env flag
-    if os.getenv("ENABLE_RENDERED_FETCH") != "1":
+    # Allow disabling rendered fetch via env flag; archived runs only see plain HTTP
+    if os.getenv("ENABLE_RENDERED_FETCH") != "1" or get_fetch_archive() is not None:
         return fetch_html(url, timeout=timeout)
 
-    if sync_playwright is None:
+    from app.core.browser_pool import async_playwright, get_browser_pool
+
+    if async_playwright is None:
         # Fallback to plain HTTP fetch
         return fetch_html(url, timeout=timeout)
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            try:
-                context = browser.new_context(
-                    user_agent=DEFAULT_HEADERS.get("User-Agent"),
-                    extra_http_headers={
-                        k: v
-                        for k, v in DEFAULT_HEADERS.items()
-                        if k not in {"User-Agent"}
-                    },
-                    bypass_csp=True,
-                )
-                page = context.new_page()
-                page.set_default_timeout(int(timeout * 1000))
-                page.goto(url, wait_until="networkidle")
-                html = page.content()
-                return html
-            finally:
-                try:
-                    browser.close()
-                except Exception:
-                    pass
+        return get_browser_pool().render(url, timeout=timeout, wait_selector=wait_selector)
     except Exception as e:
         # Timeout or other Playwright error - fallback to plain fetch
         print(f"[Fetcher] Playwright failed ({type(e).__name__}), falling back to plain fetch: {url}")
@@ -0,0 +1,355 @@
+"""
+app/core/near_duplicates.py
+
+Cross-source near-duplicate detection with 64-bit SimHash fingerprints.
+
+The same wire story is often published by several sources within minutes.
+Every article gets a SimHash of its title + body (word 2-shingles) at crawl
+time. Before the expensive enrichment runs, the fingerprint is looked up among
+the articles of the last NEAR_DUP_WINDOW_HOURS; an article within
+NEAR_DUP_MAX_DISTANCE bits of an earlier one from another source is a
+near-duplicate (a source's own recurring templated stories, e.g. daily market
+wraps, never match each other):
+- sentiment is copied from the canonical article instead of running the model;
+- ExtraJson gets "duplicateOf" (canonical article URL) and "simDistance", so
+  window features can count the story once.
+
+Lookup is in memory: fingerprints are split into NEAR_DUP_MAX_DISTANCE + 1
+bands, and two fingerprints within the distance share at least one band
+exactly (pigeonhole), so only articles in the same band buckets are compared.
+A checked article is only indexed once it is stored (`commit`, or `discard`
+when its write fails), so later copies never point at an article missing from
+the database.
+With the Mongo backend fingerprints are stored on News (SimHash). The index is
+warmed from the window on first use and then picks up articles stored by other
+processes with an incremental `_id > last seen` query every
+NEAR_DUP_REFRESH_SECONDS, so lookups never wait on the database: one thread
+runs the query outside the index lock while the others keep using the index.
+
+Env vars:
+- NEAR_DUP (default 1)                    # 0 disables fingerprinting
+- NEAR_DUP_MAX_DISTANCE (default 8)       # max differing bits of 64
+- NEAR_DUP_WINDOW_HOURS (default 24)
+- NEAR_DUP_MIN_TOKENS (default 40)        # shorter texts are not fingerprinted
+- NEAR_DUP_REFRESH_SECONDS (default 30)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_BITS = 64
+
+
+def _signed(h: int) -> int:
+    """uint64 -> int64 (MongoDB integers are signed)."""
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+def _unsigned(h: int) -> int:
+    return h + (1 << 64) if h < 0 else h
+
+
+def fingerprint(title: Optional[str], content: Optional[str], min_tokens: Optional[int] = None) -> Optional[int]:
+    """64-bit SimHash of the word 2-shingles of title + content (None for short texts)."""
+    if min_tokens is None:
+        min_tokens = int(os.getenv("NEAR_DUP_MIN_TOKENS", "40"))
+    words = _WORD_RE.findall(f"{title or ''} {content or ''}".lower())
+    if len(words) < max(2, min_tokens):
+        return None
+    shingles = [f"{a} {b}" for a, b in zip(words, words[1:])]
+    bits = [
+        format(int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"), "064b")
+        for s in shingles
+    ]
+    # Column-wise vote: bit i is set when most shingle hashes have it set
+    half = len(bits) / 2
+    out = "".join("1" if column.count("1") > half else "0" for column in zip(*bits))
+    return int(out, 2)
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(h: int, n: int) -> List[Tuple[int, int]]:
+    """Split the 64 bits into n contiguous bands (widths differ by at most one bit)."""
+    out = []
+    shift = 0
+    for i in range(n):
+        width = _BITS // n + (1 if i < _BITS % n else 0)
+        out.append((i, (h >> shift) & ((1 << width) - 1)))
+        shift += width
+    return out
+
+
+@dataclass
+class Entry:
+    fingerprint: int
+    url: str
+    source: Optional[str]
+    added_at: float
+    canonical_url: str
+    sentiment: Optional[Dict] = None
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        max_distance: Optional[int] = None,
+        window_hours: Optional[float] = None,
+        refresh_seconds: Optional[float] = None,
+    ) -> None:
+        self.max_distance = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "8")) if max_distance is None else max_distance
+        hours = float(os.getenv("NEAR_DUP_WINDOW_HOURS", "24")) if window_hours is None else window_hours
+        self.window = hours * 3600.0
+        self.refresh_seconds = float(os.getenv("NEAR_DUP_REFRESH_SECONDS", "30")) if refresh_seconds is None else refresh_seconds
+        self.n_bands = self.max_distance + 1
+        self._buckets: Dict[Tuple[int, int], List[Entry]] = {}
+        self._by_url: Dict[str, Entry] = {}
+        # Checked articles not stored yet, by URL
+        self._pending: Dict[str, Entry] = {}
+        self._lock = threading.Lock()
+        # Held by the thread querying the database; never while waiting on _lock's holders
+        self._refresh_lock = threading.Lock()
+        self._last_id = None
+        # SourceId -> NewsSources.Code, for entries loaded from the database (refresh thread only)
+        self._source_codes: Dict[str, Optional[str]] = {}
+        self._last_refresh = 0.0
+        self._use_mongo = True
+        self.stats = {"checked": 0, "duplicates": 0, "loaded": 0}
+
+    # ---------- Storage ----------
+    def _collection(self):
+        if not self._use_mongo:
+            return None
+        try:
+            from app.core.storage import BACKEND, db_session
+
+            if BACKEND != "mongo":
+                self._use_mongo = False
+                return None
+            with db_session() as db:
+                return db.News
+        except Exception as e:
+            print(f"[NearDup] Mongo unavailable, memory only: {e}")
+            self._use_mongo = False
+            return None
+
+    def document_fields(self, fp: int) -> Dict:
+        """Fields stored on the News document (Mongo backend only)."""
+        return {"SimHash": _signed(fp)} if self._collection() is not None else {}
+
+    def _refresh(self) -> None:
+        """Prune expired entries and load fingerprints stored since the last refresh.
+
+        Called without `_lock`: the query and the Entry construction run
+        unlocked, and only one thread refreshes at a time (the others skip it).
+        """
+        now = time.time()
+        if now - self._last_refresh < self.refresh_seconds or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if now - self._last_refresh < self.refresh_seconds:
+                return
+            self._last_refresh = now
+            with self._lock:
+                self._prune(now)
+                last_id = self._last_id
+            coll = self._collection()
+            if coll is None:
+                return
+            entries, new_last = self._load(coll, last_id)
+            with self._lock:
+                if self._last_id != last_id:
+                    return  # clear() ran meanwhile
+                for entry in entries:
+                    if entry.url not in self._by_url:
+                        self._add(entry)
+                        self.stats["loaded"] += 1
+                self._last_id = new_last
+        finally:
+            self._refresh_lock.release()
+
+    def _load(self, coll, last_id) -> Tuple[List[Entry], object]:
+        """Entries stored after `last_id` (the whole window when None), and the last _id read."""
+        from bson import ObjectId
+
+        if last_id is None:
+            since = datetime.utcnow() - timedelta(seconds=self.window)
+            query = {"_id": {"$gte": ObjectId.from_datetime(since)}}
+        else:
+            query = {"_id": {"$gt": last_id}}
+        query["SimHash"] = {"$exists": True}
+        projection = {
+            "Url": 1, "SourceId": 1, "SimHash": 1, "SentimentScore": 1, "SentimentLabel": 1, "SentimentModel": 1,
+            "ExtraJson": 1,
+        }
+        entries: List[Entry] = []
+        try:
+            for doc in coll.find(query, projection).sort("_id", 1):
+                last_id = doc["_id"]
+                url = doc.get("Url")
+                if not url:
+                    continue
+                canonical = url
+                try:
+                    extra = json.loads(doc.get("ExtraJson") or "{}")
+                    canonical = extra.get("duplicateOf") or url
+                except Exception:
+                    pass
+                sentiment = None
+                if doc.get("SentimentLabel") is not None:
+                    sentiment = {k: doc.get(k) for k in ("SentimentScore", "SentimentLabel", "SentimentModel")}
+                entries.append(Entry(
+                    fingerprint=_unsigned(int(doc["SimHash"])),
+                    url=url,
+                    source=self._source_code(coll, doc.get("SourceId")),
+                    added_at=doc["_id"].generation_time.timestamp(),
+                    canonical_url=canonical,
+                    sentiment=sentiment,
+                ))
+        except Exception as e:
+            # Keep what was read; the next refresh resumes after it
+            print(f"[NearDup] Refresh failed: {e}")
+        return entries, last_id
+
+    def _source_code(self, coll, source_id) -> Optional[str]:
+        """NewsSources.Code for a stored article's SourceId (crawlers register entries by code)."""
+        if source_id is None:
+            return None
+        key = str(source_id)
+        if key not in self._source_codes:
+            for doc in coll.database.NewsSources.find({}, {"Code": 1}):
+                self._source_codes[str(doc["_id"])] = doc.get("Code")
+            # Unknown source: remember it so the next documents do not reload NewsSources
+            self._source_codes.setdefault(key, None)
+        return self._source_codes[key]
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window
+        # Checked articles that never reached the writer (dropped before storing)
+        self._pending = {u: e for u, e in self._pending.items() if e.added_at >= cutoff}
+        if not any(e.added_at < cutoff for e in self._by_url.values()):
+            return
+        self._by_url = {u: e for u, e in self._by_url.items() if e.added_at >= cutoff}
+        for key in list(self._buckets):
+            kept = [e for e in self._buckets[key] if e.added_at >= cutoff]
+            if kept:
+                self._buckets[key] = kept
+            else:
+                del self._buckets[key]
+
+    def _add(self, entry: Entry) -> None:
+        self._by_url[entry.url] = entry
+        for band in _bands(entry.fingerprint, self.n_bands):
+            self._buckets.setdefault(band, []).append(entry)
+
+    def clear(self) -> None:
+        """Forget every fingerprint (the next lookup warms from the database again)."""
+        with self._lock:
+            self._buckets.clear()
+            self._by_url.clear()
+            self._pending.clear()
+            self._last_id = None
+            self._last_refresh = 0.0
+
+    # ---------- Lookup ----------
+    def check(self, fp: int, url: str, source: Optional[str] = None) -> Tuple[Optional[Entry], int]:
+        """Closest earlier article within max_distance (and its distance), or (None, -1).
+
+        The article is kept pending until `commit` (stored) or `discard` (write failed).
+        """
+        self._refresh()
+        with self._lock:
+            self.stats["checked"] += 1
+            cutoff = time.time() - self.window
+            best: Optional[Entry] = None
+            best_d = self.max_distance + 1
+            seen = set()
+            for band in _bands(fp, self.n_bands):
+                for entry in self._buckets.get(band, ()):
+                    if id(entry) in seen or entry.url == url or entry.added_at < cutoff:
+                        continue
+                    seen.add(id(entry))
+                    if source is not None and self._same_source(entry, source):
+                        continue
+                    d = distance(fp, entry.fingerprint)
+                    if d < best_d:
+                        best, best_d = entry, d
+            if url not in self._by_url:
+                canonical_url = best.canonical_url if best is not None else url
+                self._pending[url] = Entry(fp, url, source, time.time(), canonical_url)
+            if best is None:
+                return None, -1
+            self.stats["duplicates"] += 1
+            return best, best_d
+
+    def commit(self, url: str) -> None:
+        """Index a checked article once it is in the database."""
+        with self._lock:
+            entry = self._pending.pop(url, None)
+            if entry is not None and url not in self._by_url:
+                self._add(entry)
+
+    def discard(self, url: str) -> None:
+        """Forget a checked article whose write failed (it is checked again on retry)."""
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def _same_source(self, entry: Entry, source: str) -> bool:
+        """`entry`, or the canonical article it copies, comes from `source`."""
+        if entry.source == source:
+            return True
+        root = self._by_url.get(entry.canonical_url)
+        return root is not None and root.source == source
+
+    def canonical_sentiment(self, entry: Entry) -> Optional[Dict]:
+        """Sentiment of the canonical article of `entry`, if it is known yet."""
+        with self._lock:
+            root = self._by_url.get(entry.canonical_url)
+            return (root.sentiment if root is not None else None) or entry.sentiment
+
+    def set_sentiment(self, url: str, sentiment: Dict) -> None:
+        with self._lock:
+            entry = self._by_url.get(url) or self._pending.get(url)
+            if entry is not None:
+                entry.sentiment = dict(sentiment)
+
+
+def mark_duplicate(extra_json: Optional[str], canonical_url: str, dist: int) -> str:
+    """ExtraJson with the near-duplicate link merged in."""
+    try:
+        data = json.loads(extra_json) if extra_json else {}
+        if not isinstance(data, dict):
+            data = {}
+    except Exception:
+        data = {}
+    data["duplicateOf"] = canonical_url
+    data["simDistance"] = dist
+    return json.dumps(data, ensure_ascii=False)
+
+
+def near_duplicates_enabled() -> bool:
+    return os.getenv("NEAR_DUP", "1") == "1"
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Process-wide NearDuplicateIndex."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NearDuplicateIndex()
+    return _index
@@ -1,7 +1,7 @@
 from datetime import timezone
 from typing import Any, Dict, Optional
 
-import dateparser
+from app.core.dates import parse_date
 
 
 def _to_utc(dt):
@@ -41,7 +41,7 @@ def normalize_article(raw: Dict[str, Any], source_code: str, url: str) -> Dict[s
     """
     published_at = raw.get("published_at")
     if isinstance(published_at, str):
-        published_at = dateparser.parse(published_at)
+        published_at = parse_date(published_at)
 
     normalized = {
         "Url": url,
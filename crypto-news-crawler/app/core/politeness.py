@@ -0,0 +1,243 @@
+"""
+app/core/politeness.py
+
+Per-host rate limiting, retry backoff and per-source circuit breakers.
+
+- HostRateLimiter: one token bucket per host (HOST_RATE_LIMIT requests/s,
+  bursts of HOST_BURST). A fetch reserves a token and sleeps until it is due.
+  A Retry-After from the host (429/503) blocks the whole host until then; when
+  the wait is longer than FETCH_RETRY_AFTER_MAX the fetch fails at once with
+  HostDeferred instead of sleeping.
+- retry_delay: full-jitter exponential backoff between retries of connection
+  errors and 429/502/503/504 responses (Retry-After wins when present).
+- CircuitBreaker: per source. After BREAKER_FAILURES consecutive failed article
+  fetches the breaker opens and the remaining fetches of the cycle are skipped
+  (returned as failed URLs, so checkpoints and the work queue retry them later).
+  After BREAKER_COOLDOWN_SECONDS one probe fetch is let through (half-open);
+  success closes the breaker, failure opens it again. Each skipped fetch adds
+  the average duration of the failed fetches to `saved_seconds`.
+
+Breaker states are printed after each cycle and exported in the Prometheus
+metrics (see app/core/crawl_metrics.py).
+
+Env vars:
+- HOST_RATE_LIMIT (default 4)           # requests/s per host, 0 = unlimited
+- HOST_BURST (default 8)
+- FETCH_RETRIES (default 2)             # extra attempts after the first
+- FETCH_BACKOFF_BASE (default 0.5)      # seconds, doubled per attempt
+- FETCH_BACKOFF_MAX (default 10)
+- FETCH_RETRY_AFTER_MAX (default 60)    # longer Retry-After = give up for now
+- BREAKER_FAILURES (default 5)
+- BREAKER_COOLDOWN_SECONDS (default 300)
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# Statuses worth another attempt; everything else is returned to the caller as is
+RETRY_STATUSES = {429, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class HostDeferred(Exception):
+    """The host asked us (Retry-After) to come back later than we are willing to wait."""
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def max_retries() -> int:
+    return max(0, int(os.getenv("FETCH_RETRIES", "2")))
+
+
+def retry_after_max() -> float:
+    return float(os.getenv("FETCH_RETRY_AFTER_MAX", "60"))
+
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Delay before retry number `attempt + 1`: Retry-After if given, else full-jitter backoff."""
+    if retry_after is not None:
+        return retry_after
+    base = float(os.getenv("FETCH_BACKOFF_BASE", "0.5"))
+    cap = float(os.getenv("FETCH_BACKOFF_MAX", "10"))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HostRateLimiter:
+    """Token bucket per host; `reserve` returns how long the caller must wait for its slot."""
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        self.rate = float(os.getenv("HOST_RATE_LIMIT", "4")) if rate is None else rate
+        self.burst = max(1.0, float(os.getenv("HOST_BURST", "8")) if burst is None else burst)
+        self._lock = threading.Lock()
+        # host -> [tokens, last refill (monotonic)]; tokens go negative for queued reservations
+        self._buckets: Dict[str, list] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self.stats = {"delayed": 0, "delay_seconds": 0.0, "deferred": 0}
+
+    def reserve(self, host: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            delay = max(0.0, self._blocked_until.get(host, 0.0) - now)
+            if self.rate > 0:
+                bucket = self._buckets.setdefault(host, [self.burst, now])
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                bucket[0] -= 1
+                if bucket[0] < 0:
+                    delay = max(delay, -bucket[0] / self.rate)
+            if delay > 0:
+                self.stats["delayed"] += 1
+                self.stats["delay_seconds"] += delay
+            return delay
+
+    def defer(self, host: str, seconds: float) -> None:
+        """Hold every request to `host` for `seconds` (Retry-After)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._blocked_until.get(host, 0.0):
+                self._blocked_until[host] = until
+                self.stats["deferred"] += 1
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one source (thread-safe)."""
+
+    def __init__(self, source: str, threshold: Optional[int] = None, cooldown: Optional[float] = None) -> None:
+        self.source = source
+        self.threshold = max(1, int(os.getenv("BREAKER_FAILURES", "5")) if threshold is None else threshold)
+        self.cooldown = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "300")) if cooldown is None else cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self.short_circuited = 0
+        self.saved_seconds = 0.0
+        self._failure_seconds = 0.0
+        self._failures = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _cooled_down(self) -> bool:
+        return self.opened_at is not None and time.time() - self.opened_at >= self.cooldown
+
+    def is_open(self) -> bool:
+        """True while open and still cooling down (a cycle would be skipped entirely)."""
+        with self._lock:
+            return self.state == OPEN and not self._cooled_down()
+
+    def allow(self) -> bool:
+        """Whether a fetch may go out now; a refused fetch is counted as short-circuited."""
+        with self._lock:
+            if self.state == OPEN and self._cooled_down():
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            if self._failures:
+                self.saved_seconds += self._failure_seconds / self._failures
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"[Breaker] {self.source}: probe succeeded, closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, seconds: float) -> None:
+        with self._lock:
+            self._failures += 1
+            self._failure_seconds += seconds
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.threshold):
+                self.state = OPEN
+                self.opened_at = time.time()
+                self.trips += 1
+                self._probe_in_flight = False
+                print(
+                    f"[Breaker] {self.source}: open after {self.consecutive_failures} consecutive failures, "
+                    f"skipping fetches for {self.cooldown:.0f}s"
+                )
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+                "saved_seconds": round(self.saved_seconds, 1),
+                "open_for_s": round(max(0.0, self.cooldown - (time.time() - self.opened_at)), 1)
+                if self.state == OPEN and self.opened_at is not None
+                else 0.0,
+            }
+
+
+_limiter: Optional[HostRateLimiter] = None
+_breakers: Dict[str, CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostRateLimiter:
+    """Process-wide HostRateLimiter."""
+    global _limiter
+    if _limiter is None:
+        with _lock:
+            if _limiter is None:
+                _limiter = HostRateLimiter()
+    return _limiter
+
+
+def get_circuit_breaker(source: str) -> CircuitBreaker:
+    with _lock:
+        breaker = _breakers.get(source)
+        if breaker is None:
+            breaker = _breakers[source] = CircuitBreaker(source)
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict]:
+    """Snapshot of every source's breaker: state, trips, short-circuited fetches, time saved."""
+    with _lock:
+        breakers = list(_breakers.values())
+    return {b.source: b.snapshot() for b in breakers}
+
+
+def breaker_state_value(state: str) -> int:
+    """Numeric state for metrics: 0 closed, 1 half-open, 2 open."""
+    return _STATE_VALUES.get(state, 0)
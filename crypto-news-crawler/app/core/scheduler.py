@@ -1,16 +1,322 @@
+"""
+app/core/scheduler.py
+
+Frequency-aware scheduler that runs news sources concurrently.
+
+- Every source runs in its own worker thread; a slow or failing source never
+  delays the others (isolated failure domain, no overlapping runs per source).
+- The base poll interval comes from `NewsSources.Config.frequency`
+  (realtime/hourly/daily/weekly or a number of seconds), clamped to
+  [min_interval, max_interval].
+- After each run the interval adapts to the observed new-item rate (EWMA):
+  busy feeds are polled more often, quiet feeds back off towards max_interval.
+- Failures back off exponentially; every interval gets random jitter so sources
+  do not hit the network in lock-step.
+- `status()` exposes per-source next run, lag and last outcome.
+
+Env vars:
+- SCHED_MIN_INTERVAL (default 60)      # seconds, fastest allowed poll
+- SCHED_MAX_INTERVAL (default 3600)    # seconds, slowest allowed poll
+- SCHED_TARGET_NEW_ITEMS (default 5)   # new items a poll should typically find
+- SCHED_JITTER (default 0.1)           # +/- fraction of the interval
+- SCHED_MAX_PARALLEL (default: number of sources)
+- SCHED_STATUS_FILE (optional)         # JSON file rewritten with status() after every run
+"""
+
+import json
+import os
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Nominal poll interval per NewsSources.Config.frequency value (seconds); the
+# scheduler clamps it to SCHED_MAX_INTERVAL, so by default daily/weekly sources
+# are still polled hourly
+FREQUENCY_SECONDS = {
+    "realtime": 60,
+    "minutely": 60,
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 604800,
+}
+
+# Weight of the latest observation in the new-item rate EWMA
+_RATE_ALPHA = 0.3
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def frequency_seconds(frequency) -> Optional[float]:
+    """Map a Config.frequency value (name or seconds) to seconds; None if unknown."""
+    if frequency is None:
+        return None
+    if isinstance(frequency, (int, float)):
+        return float(frequency) if frequency > 0 else None
+    freq = str(frequency).strip().lower()
+    if freq.isdigit():
+        return float(freq) or None
+    return FREQUENCY_SECONDS.get(freq)
+
+
+def clamp_interval(seconds: float) -> float:
+    """Clamp a poll interval to [SCHED_MIN_INTERVAL, SCHED_MAX_INTERVAL]."""
+    low = max(1.0, _env_float("SCHED_MIN_INTERVAL", 60))
+    return min(max(low, _env_float("SCHED_MAX_INTERVAL", 3600)), max(low, seconds))
+
+
+def load_source_frequencies(codes: List[str]) -> Dict[str, Optional[str]]:
+    """Read Config.frequency for each source code from NewsSources (missing -> None)."""
+    out: Dict[str, Optional[str]] = {c: None for c in codes}
+    try:
+        from app.core.storage import db_session, get_source_by_code
+
+        with db_session() as db:
+            for code in codes:
+                src = get_source_by_code(db, code)
+                cfg = getattr(src, "Config", None) if src is not None else None
+                if isinstance(cfg, dict):
+                    out[code] = cfg.get("frequency")
+    except Exception as e:
+        print(f"[Scheduler] Could not load source frequencies: {e}")
+    return out
+
+
+@dataclass
+class SourceState:
+    code: str
+    frequency: Optional[str]
+    base_interval: float
+    interval: float
+    next_run: float
+    rate_per_sec: Optional[float] = None
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    running: bool = False
+    last_started: Optional[float] = None
+    last_finished: Optional[float] = None
+    last_duration: float = 0.0
+    last_new_items: int = 0
+    last_lag: float = 0.0
+    last_error: Optional[str] = None
+    history: List[float] = field(default_factory=list)
+
+
+class SourceScheduler:
+    """Run `runners[code]()` per source on an adaptive schedule.
+
+    A runner returns the number of new items stored (int), an object with a
+    `processed` attribute (e.g. CrawlStats), or None.
+    """
+
+    def __init__(
+        self,
+        runners: Dict[str, Callable[[], object]],
+        frequencies: Optional[Dict[str, Optional[str]]] = None,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        target_new_items: Optional[float] = None,
+        jitter: Optional[float] = None,
+        max_parallel: Optional[int] = None,
+        status_file: Optional[str] = None,
+    ) -> None:
+        self.runners = runners
+        self.status_file = status_file or os.getenv("SCHED_STATUS_FILE") or None
+        self.min_interval = max(1.0, min_interval or _env_float("SCHED_MIN_INTERVAL", 60))
+        self.max_interval = max(self.min_interval, max_interval or _env_float("SCHED_MAX_INTERVAL", 3600))
+        self.target_new_items = target_new_items or _env_float("SCHED_TARGET_NEW_ITEMS", 5)
+        self.jitter = _env_float("SCHED_JITTER", 0.1) if jitter is None else jitter
+        self.max_parallel = max_parallel or int(os.getenv("SCHED_MAX_PARALLEL", "0") or 0) or len(runners) or 1
+        frequencies = frequencies or {}
+        now = time.time()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.states: Dict[str, SourceState] = {}
+        for code in runners:
+            freq = frequencies.get(code)
+            base = self._clamp(frequency_seconds(freq) or self.min_interval)
+            # First run of every source is due immediately
+            self.states[code] = SourceState(code=code, frequency=freq, base_interval=base, interval=base, next_run=now)
+
+    # ---------- interval policy ----------
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_interval, max(self.min_interval, seconds))
+
+    def _jittered(self, seconds: float) -> float:
+        if self.jitter <= 0:
+            return seconds
+        return max(1.0, seconds * (1.0 + random.uniform(-self.jitter, self.jitter)))
+
+    def _adapt(self, st: SourceState, new_items: int, now: float) -> None:
+        """Update the EWMA new-item rate and derive the next interval from it."""
+        if st.history:
+            window = max(1.0, now - st.history[-1])
+            observed = new_items / window
+            st.rate_per_sec = observed if st.rate_per_sec is None else (
+                _RATE_ALPHA * observed + (1 - _RATE_ALPHA) * st.rate_per_sec
+            )
+        if st.rate_per_sec is None:
+            st.interval = st.base_interval
+        elif st.rate_per_sec <= 0:
+            st.interval = self._clamp(st.interval * 1.5)
+        else:
+            st.interval = self._clamp(self.target_new_items / st.rate_per_sec)
+
+    # ---------- execution ----------
+    @staticmethod
+    def _new_items(result) -> int:
+        if isinstance(result, bool):
+            return 0
+        if isinstance(result, int):
+            return result
+        return int(getattr(result, "processed", 0) or 0)
+
+    def _run_source(self, code: str) -> None:
+        st = self.states[code]
+        start = time.time()
+        with self._lock:
+            st.last_lag = max(0.0, start - st.next_run)
+            st.last_started = start
+        print(f"\n=== Running crawler: {code} (lag {st.last_lag:.1f}s) ===")
+        error = None
+        new_items = 0
+        try:
+            new_items = self._new_items(self.runners[code]())
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"[Scheduler] Crawler '{code}' failed: {error}")
+        end = time.time()
+        with self._lock:
+            st.running = False
+            st.last_finished = end
+            st.last_duration = end - start
+            st.last_error = error
+            if error:
+                st.failures += 1
+                st.consecutive_failures += 1
+                delay = self._clamp(st.interval * (2 ** st.consecutive_failures))
+            else:
+                st.consecutive_failures = 0
+                st.last_new_items = new_items
+                self._adapt(st, new_items, start)
+                st.history = (st.history + [start])[-20:]
+                delay = st.interval
+            st.runs += 1
+            st.next_run = end + self._jittered(delay)
+        print(
+            f"[Scheduler] {code}: {new_items} new in {st.last_duration:.1f}s, "
+            f"next run in {st.next_run - end:.0f}s (interval {st.interval:.0f}s)"
+        )
+        self._write_status()
+        self._wake.set()
+
+    def _due(self, now: float, max_runs: int) -> List[str]:
+        with self._lock:
+            return [
+                st.code for st in sorted(self.states.values(), key=lambda s: s.next_run)
+                if not st.running and st.next_run <= now and not (max_runs and st.runs >= max_runs)
+            ]
+
+    def _finished(self, max_runs: int) -> bool:
+        if not max_runs:
+            return False
+        with self._lock:
+            return all(st.runs >= max_runs and not st.running for st in self.states.values())
+
+    def run(self, max_runs: int = 0) -> None:
+        """Block and run sources until stop() (or every source ran `max_runs` times)."""
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="source") as pool:
+            inflight: Dict[str, Future] = {}
+            while not self._stop.is_set() and not self._finished(max_runs):
+                self._wake.clear()
+                now = time.time()
+                for code in self._due(now, max_runs):
+                    if len(inflight) >= self.max_parallel:
+                        break
+                    with self._lock:
+                        self.states[code].running = True
+                    inflight[code] = pool.submit(self._run_source, code)
+                for code in [c for c, f in inflight.items() if f.done()]:
+                    inflight.pop(code)
+                self._wake.wait(timeout=max(0.2, min(5.0, self._seconds_to_next(max_runs))))
+
+    def run_once(self) -> None:
+        """Run every source once, concurrently."""
+        self.run(max_runs=1)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _seconds_to_next(self, max_runs: int) -> float:
+        with self._lock:
+            pending = [
+                st.next_run for st in self.states.values()
+                if not st.running and not (max_runs and st.runs >= max_runs)
+            ]
+        return (min(pending) - time.time()) if pending else 5.0
+
+    # ---------- observability ----------
+    def status(self) -> List[dict]:
+        """Per-source schedule snapshot: next run, lag, interval and last outcome."""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for st in self.states.values():
+                rows.append({
+                    "source": st.code,
+                    "frequency": st.frequency,
+                    "interval_seconds": round(st.interval, 1),
+                    "next_run": st.next_run,
+                    "next_run_in": round(st.next_run - now, 1),
+                    # Overdue time right now while waiting, otherwise the start lag of the last run
+                    "lag_seconds": round(max(0.0, now - st.next_run) if not st.running else st.last_lag, 1),
+                    "running": st.running,
+                    "runs": st.runs,
+                    "failures": st.failures,
+                    "last_new_items": st.last_new_items,
+                    "new_items_per_hour": round((st.rate_per_sec or 0.0) * 3600, 2),
+                    "last_duration_seconds": round(st.last_duration, 1),
+                    "last_error": st.last_error,
+                })
+        return rows
 
-import schedule
+    def _write_status(self) -> None:
+        if not self.status_file:
+            return
+        try:
+            tmp = f"{self.status_file}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"updated_at": time.time(), "sources": self.status()}, f, indent=2)
+            os.replace(tmp, self.status_file)
+        except Exception as e:
+            print(f"[Scheduler] Could not write status file: {e}")
 
-from ..crawler_runner import run_all_sources
+    def print_status(self) -> None:
+        print(f"{'source':<16}{'interval':>9}{'next in':>9}{'lag':>7}{'runs':>6}{'fail':>6}{'new/h':>8}")
+        for r in self.status():
+            print(
+                f"{r['source']:<16}{r['interval_seconds']:>9.0f}{r['next_run_in']:>9.0f}"
+                f"{r['lag_seconds']:>7.1f}{r['runs']:>6}{r['failures']:>6}{r['new_items_per_hour']:>8.1f}"
+            )
 
 
-def start_scheduler():
-    schedule.every(1).minutes.do(run_all_sources)
+def start_scheduler(sources: Optional[List[str]] = None, max_runs: int = 0) -> SourceScheduler:
+    """Build a scheduler over the registered crawlers and run it (blocking)."""
+    from app.scripts.run_all_crawlers import AVAILABLE, build_scheduler
 
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    scheduler = build_scheduler(sources or list(AVAILABLE.keys()))
+    scheduler.run(max_runs=max_runs)
+    return scheduler
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+app/core/seen_urls.py
+
+In-memory set of already-stored article URLs per source, used to skip fetching
+articles that are still in the feed but were saved in an earlier cycle.
+
+- Warmed once from the DB with the most recent URLs of the source.
+- URLs not in memory are checked with a single batched $in query per cycle.
+- Saved (or duplicate) URLs are added as the crawl progresses.
+
+Env vars:
+- SEEN_URL_WARM_LIMIT (default 5000)  # recent URLs loaded per source on warm-up
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.storage import db_session, existing_urls, get_source_by_code, recent_urls
+
+
+class SeenUrlSet:
+    def __init__(self, source_code: str, warm_limit: Optional[int] = None) -> None:
+        self.source_code = source_code
+        self.warm_limit = warm_limit or int(os.getenv("SEEN_URL_WARM_LIMIT", "5000"))
+        self._urls: Set[str] = set()
+        self._warmed = False
+        self._lock = threading.Lock()
+
+    def _warm(self) -> None:
+        try:
+            with db_session() as db:
+                src = get_source_by_code(db, self.source_code)
+                if src:
+                    self._urls.update(recent_urls(db, src.Id, self.warm_limit))
+        except Exception as e:
+            print(f"[Dedup] Warm-up failed for {self.source_code}: {e}")
+        self._warmed = True
+
+    def filter_unseen(self, urls: Iterable[str]) -> Tuple[List[str], int]:
+        """Return (unseen urls in original order, number skipped)."""
+        urls = list(dict.fromkeys(u for u in urls if u))
+        with self._lock:
+            if not self._warmed:
+                self._warm()
+            candidates = [u for u in urls if u not in self._urls]
+            if candidates:
+                try:
+                    with db_session() as db:
+                        self._urls.update(existing_urls(db, candidates))
+                except Exception as e:
+                    print(f"[Dedup] Existence query failed for {self.source_code}: {e}")
+            unseen = [u for u in candidates if u not in self._urls]
+        return unseen, len(urls) - len(unseen)
+
+    def add(self, url: str) -> None:
+        if url:
+            with self._lock:
+                self._urls.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._urls
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._urls)
+
+
+_seen_sets: Dict[str, SeenUrlSet] = {}
+_seen_sets_lock = threading.Lock()
+
+
+def get_seen_urls(source_code: str) -> SeenUrlSet:
+    """Process-wide SeenUrlSet per source (survives across --watch cycles)."""
+    seen = _seen_sets.get(source_code)
+    if seen is None:
+        with _seen_sets_lock:
+            seen = _seen_sets.get(source_code)
+            if seen is None:
+                seen = _seen_sets[source_code] = SeenUrlSet(source_code)
+    return seen
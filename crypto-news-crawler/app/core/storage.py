@@ -2,22 +2,45 @@ import os
 from dotenv import load_dotenv
 # Ensure .env values override any existing process envs to avoid stale vars
 load_dotenv(override=True)
+import threading
 from contextlib import contextmanager
 from types import SimpleNamespace
-from typing import Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 BACKEND = os.getenv("DB_BACKEND", "mongo").lower()
 
+# insert_articles result for an article whose write failed (None = duplicate or no Url)
+INSERT_FAILED = object()
+
 if BACKEND == "mongo":
     # -----------------------
     # MongoDB backend
     # -----------------------
-    from pymongo import MongoClient
-    from pymongo.errors import DuplicateKeyError
+    from pymongo import MongoClient, monitoring
+    from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+    class _CommandCounter(monitoring.CommandListener):
+        """Counts commands sent to the server (one per network round-trip)."""
+
+        def __init__(self) -> None:
+            self.counts: Dict[str, int] = {}
+            self._lock = threading.Lock()
+
+        def started(self, event) -> None:
+            with self._lock:
+                self.counts[event.command_name] = self.counts.get(event.command_name, 0) + 1
+
+        def succeeded(self, event) -> None:
+            pass
+
+        def failed(self, event) -> None:
+            pass
+
+    _command_counter = _CommandCounter()
 
     _MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     _MONGO_DB = os.getenv("MONGO_DB_NAME", "cryptonews")
-    _mongo_client = MongoClient(_MONGO_URI)
+    _mongo_client = MongoClient(_MONGO_URI, event_listeners=[_command_counter])
     _mongo_db = _mongo_client[_MONGO_DB]
 
     # Ensure indexes (idempotent)
@@ -46,17 +69,77 @@ if BACKEND == "mongo":
     def article_exists(db, url: str) -> bool:
         return db.News.find_one({"Url": url}) is not None
 
+    def existing_urls(db, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of `urls` already stored, using one batched $in query."""
+        urls = list({u for u in urls if u})
+        if not urls:
+            return set()
+        cursor = db.News.find({"Url": {"$in": urls}}, {"Url": 1, "_id": 0})
+        return {d["Url"] for d in cursor if d.get("Url")}
+
+    def recent_urls(db, source_id: str, limit: int) -> Set[str]:
+        """Return URLs of the `limit` most recently inserted articles for a source."""
+        cursor = (
+            db.News.find({"SourceId": source_id}, {"Url": 1, "_id": 0})
+            .sort("_id", -1)
+            .limit(limit)
+        )
+        return {d["Url"] for d in cursor if d.get("Url")}
+
     def save_article(db, source_id: str, article_data: dict) -> Optional[SimpleNamespace]:
         if not article_data.get("Url"):
             return None
         article_data["SourceId"] = source_id
         try:
             res = db.News.insert_one(article_data)
-            inserted = db.News.find_one({"_id": res.inserted_id})
-            return SimpleNamespace(Id=str(res.inserted_id), **inserted)
+            # insert_one stores the generated _id in article_data; no read-back needed
+            return SimpleNamespace(Id=str(res.inserted_id), **article_data)
         except DuplicateKeyError:
             return None
 
+    def insert_articles(db, source_id: str, articles: List[dict]) -> List[Optional[str]]:
+        """Insert many articles in one unordered insert_many round-trip.
+
+        Returns the inserted id per input article (same order), None for
+        articles without Url and for duplicates (E11000), INSERT_FAILED for any
+        other write error; other documents are still inserted.
+        """
+        ids: List[Optional[str]] = [None] * len(articles)
+        positions = []
+        docs = []
+        for i, article in enumerate(articles):
+            if not article.get("Url"):
+                continue
+            article["SourceId"] = source_id
+            positions.append(i)
+            docs.append(article)
+        if not docs:
+            return ids
+        duplicates: Set[int] = set()
+        errors: Set[int] = set()
+        try:
+            db.News.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                idx = err.get("index")
+                if err.get("code") == 11000:
+                    duplicates.add(idx)
+                else:
+                    errors.add(idx)
+                    print(f"[Storage] Insert failed for {docs[idx].get('Url')}: {err.get('errmsg')}")
+        for j, (i, doc) in enumerate(zip(positions, docs)):
+            if j in errors:
+                ids[i] = INSERT_FAILED
+            # insert_many assigns _id to each document client-side
+            elif j not in duplicates and doc.get("_id") is not None:
+                ids[i] = str(doc["_id"])
+        return ids
+
+    def db_round_trips() -> Dict[str, int]:
+        """Commands sent to MongoDB so far in this process, by command name."""
+        with _command_counter._lock:
+            return dict(_command_counter.counts)
+
 else:
     # -----------------------
     # SQLAlchemy backend (default)
@@ -90,6 +173,19 @@ else:
         stmt = select(News.Id).where(News.Url == url)
         return session.execute(stmt).first() is not None
 
+    def existing_urls(session, urls: Iterable[str]) -> Set[str]:
+        """Trả về các URL đã có trong DB (1 query IN)."""
+        urls = list({u for u in urls if u})
+        if not urls:
+            return set()
+        stmt = select(News.Url).where(News.Url.in_(urls))
+        return set(session.scalars(stmt).all())
+
+    def recent_urls(session, source_id: int, limit: int) -> Set[str]:
+        """Trả về URL của `limit` bài mới nhất của source."""
+        stmt = select(News.Url).where(News.SourceId == source_id).order_by(News.Id.desc()).limit(limit)
+        return set(session.scalars(stmt).all())
+
     def save_article(session, source_id: int, article_data: dict) -> Optional[News]:
         """Lưu bài viết vào DB."""
         if not article_data.get("Url"):
@@ -104,3 +200,28 @@ else:
         session.commit()
         session.refresh(news)
         return news
+
+    def insert_articles(session, source_id: int, articles: List[dict]) -> List[Optional[int]]:
+        """Lưu nhiều bài viết trong 1 commit; trả về Id theo thứ tự (None nếu trùng/thiếu Url)."""
+        ids: List[Optional[int]] = [None] * len(articles)
+        existing = existing_urls(session, [a.get("Url") for a in articles])
+        pending = []
+        for i, article in enumerate(articles):
+            url = article.get("Url")
+            if not url or url in existing:
+                continue
+            existing.add(url)
+            article["SourceId"] = source_id
+            news = News(**article)
+            session.add(news)
+            pending.append((i, news))
+        if not pending:
+            return ids
+        session.commit()
+        for i, news in pending:
+            ids[i] = news.Id
+        return ids
+
+    def db_round_trips() -> Dict[str, int]:
+        """Không đếm với SQL backend."""
+        return {}
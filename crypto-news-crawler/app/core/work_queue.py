@@ -0,0 +1,418 @@
+"""
+app/core/work_queue.py
+
+Crawl work queue shared by several crawler workers (see app/scripts/crawl_worker.py).
+
+Jobs are stored in the Mongo `CrawlJobs` collection:
+- one "article" job per URL (_id = URL, so enqueueing a known URL is a no-op);
+- one "discover" job per source (_id = "discover:<code>") so only one worker
+  at a time reads a source's feed; it is re-armed for the next poll on completion.
+
+Workers lease jobs with an atomic find-and-update. A lease expires after
+QUEUE_LEASE_SECONDS; an expired job goes back to other workers (e.g. when its
+worker died). Every lease carries a random token and complete/fail only apply
+when the token still matches, so a worker whose lease was taken over cannot
+overwrite the new owner's result. Failed jobs are retried with exponential,
+jittered backoff; after QUEUE_MAX_ATTEMPTS attempts they are dead-lettered
+(State "dead", last error kept) for inspection. Done jobs expire after
+QUEUE_DONE_TTL_DAYS (TTL index).
+
+While a batch is being worked on, LeaseKeeper renews its leases from a
+heartbeat thread, so a batch slower than QUEUE_LEASE_SECONDS is not handed to
+another worker; a job whose renewal fails (lease lost) is logged and reported.
+
+MemoryWorkQueue has the same API for the SQL backend and single-process runs.
+
+Env vars:
+- QUEUE_BACKEND (default mongo)         # mongo | memory
+- QUEUE_LEASE_SECONDS (default 120)
+- QUEUE_MAX_ATTEMPTS (default 5)
+- QUEUE_BACKOFF_SECONDS (default 30)    # first retry delay, doubled per attempt
+- QUEUE_BACKOFF_MAX (default 3600)
+- QUEUE_DONE_TTL_DAYS (default 7)
+- QUEUE_HEARTBEAT_SECONDS (default lease / 3)   # lease renewal interval
+"""
+
+import os
+import random
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+ARTICLE = "article"
+DISCOVER = "discover"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    source: str
+    token: str
+    attempts: int
+    meta: Dict = field(default_factory=dict)
+
+    @property
+    def url(self) -> str:
+        return self.id
+
+
+def discover_job_id(source_code: str) -> str:
+    return f"discover:{source_code}"
+
+
+class _QueueBase:
+    def __init__(
+        self,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+    ) -> None:
+        self.lease_seconds = lease_seconds or float(os.getenv("QUEUE_LEASE_SECONDS", "120"))
+        self.max_attempts = max_attempts or int(os.getenv("QUEUE_MAX_ATTEMPTS", "5"))
+        self.backoff_seconds = backoff_seconds or float(os.getenv("QUEUE_BACKOFF_SECONDS", "30"))
+        self.backoff_max = backoff_max or float(os.getenv("QUEUE_BACKOFF_MAX", "3600"))
+        self.done_ttl = timedelta(days=float(os.getenv("QUEUE_DONE_TTL_DAYS", "7")))
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry number `attempts` (full jitter over an exponential cap)."""
+        cap = min(self.backoff_max, self.backoff_seconds * (2 ** max(0, attempts - 1)))
+        return random.uniform(cap / 2, cap)
+
+
+class MongoWorkQueue(_QueueBase):
+    def __init__(self, collection=None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        if collection is None:
+            from app.core.storage import db_session
+
+            with db_session() as db:
+                collection = db.CrawlJobs
+        self.coll = collection
+        try:
+            self.coll.create_index([("Kind", 1), ("State", 1), ("AvailableAt", 1)])
+            self.coll.create_index([("Kind", 1), ("State", 1), ("LeaseExpiresAt", 1)])
+            self.coll.create_index("ExpireAt", expireAfterSeconds=0)
+        except Exception as e:
+            print(f"[Queue] Index creation failed: {e}")
+
+    # ---------- Producers ----------
+    def enqueue(self, source: str, urls: Sequence[str], metas: Optional[Dict[str, Dict]] = None) -> int:
+        """Add article jobs in one bulk upsert. Returns how many URLs were new to the queue."""
+        from pymongo import UpdateOne
+
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return 0
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                {"_id": u},
+                {"$setOnInsert": {
+                    "Kind": ARTICLE, "Source": source, "State": PENDING, "Attempts": 0,
+                    "AvailableAt": now, "Meta": (metas or {}).get(u) or {}, "CreatedAt": now,
+                }},
+                upsert=True,
+            )
+            for u in urls
+        ]
+        res = self.coll.bulk_write(ops, ordered=False)
+        return res.upserted_count
+
+    def ensure_discovery(self, sources: Iterable[str]) -> None:
+        now = datetime.utcnow()
+        for code in sources:
+            self.coll.update_one(
+                {"_id": discover_job_id(code)},
+                {"$setOnInsert": {"Kind": DISCOVER, "Source": code, "State": PENDING, "Attempts": 0,
+                                  "AvailableAt": now, "CreatedAt": now}},
+                upsert=True,
+            )
+
+    # ---------- Consumers ----------
+    def lease(self, worker: str, kind: str = ARTICLE, sources: Optional[Sequence[str]] = None, limit: int = 1) -> List[Job]:
+        """Atomically lease up to `limit` due jobs (pending, or leased with an expired lease)."""
+        from pymongo import ReturnDocument
+
+        now = datetime.utcnow()
+        query: Dict = {
+            "Kind": kind,
+            "Attempts": {"$lt": self.max_attempts},
+            "$or": [
+                {"State": PENDING, "AvailableAt": {"$lte": now}},
+                {"State": LEASED, "LeaseExpiresAt": {"$lte": now}},
+            ],
+        }
+        if sources:
+            query["Source"] = {"$in": list(sources)}
+        jobs: List[Job] = []
+        for _ in range(limit):
+            token = uuid.uuid4().hex
+            doc = self.coll.find_one_and_update(
+                query,
+                {
+                    "$set": {"State": LEASED, "LeaseOwner": worker, "LeaseToken": token,
+                             "LeaseExpiresAt": now + timedelta(seconds=self.lease_seconds), "UpdatedAt": now},
+                    "$inc": {"Attempts": 1},
+                },
+                sort=[("AvailableAt", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                break
+            jobs.append(Job(doc["_id"], doc["Kind"], doc["Source"], token, doc["Attempts"], doc.get("Meta") or {}))
+        return jobs
+
+    def complete(self, job: Job, rearm_after: Optional[float] = None) -> bool:
+        """Mark done; discovery jobs are re-armed `rearm_after` seconds later instead."""
+        now = datetime.utcnow()
+        if rearm_after is not None:
+            update = {"State": PENDING, "Attempts": 0, "AvailableAt": now + timedelta(seconds=rearm_after),
+                      "UpdatedAt": now, "LastError": None}
+        else:
+            update = {"State": DONE, "UpdatedAt": now, "ExpireAt": now + self.done_ttl}
+        res = self.coll.update_one(
+            {"_id": job.id, "State": LEASED, "LeaseToken": job.token},
+            {"$set": update, "$unset": {"LeaseOwner": "", "LeaseToken": "", "LeaseExpiresAt": ""}},
+        )
+        return res.modified_count == 1
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Schedule a retry with backoff, or dead-letter after max attempts."""
+        now = datetime.utcnow()
+        if job.attempts >= self.max_attempts:
+            update = {"State": DEAD, "UpdatedAt": now, "LastError": error[:500]}
+        else:
+            update = {"State": PENDING, "UpdatedAt": now, "LastError": error[:500],
+                      "AvailableAt": now + timedelta(seconds=self.backoff(job.attempts))}
+        res = self.coll.update_one(
+            {"_id": job.id, "State": LEASED, "LeaseToken": job.token},
+            {"$set": update, "$unset": {"LeaseOwner": "", "LeaseToken": "", "LeaseExpiresAt": ""}},
+        )
+        return res.modified_count == 1
+
+    def extend(self, job: Job) -> bool:
+        """Renew a lease for long-running work."""
+        until = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+        res = self.coll.update_one(
+            {"_id": job.id, "State": LEASED, "LeaseToken": job.token}, {"$set": {"LeaseExpiresAt": until}}
+        )
+        return res.modified_count == 1
+
+    def reap(self) -> int:
+        """Dead-letter jobs whose lease expired on their last allowed attempt (e.g. crash loops)."""
+        res = self.coll.update_many(
+            {"State": LEASED, "LeaseExpiresAt": {"$lte": datetime.utcnow()}, "Attempts": {"$gte": self.max_attempts}},
+            {"$set": {"State": DEAD, "LastError": "lease expired on final attempt"}},
+        )
+        return res.modified_count
+
+    def idle(self, sources: Optional[Sequence[str]] = None) -> bool:
+        """No article job left to do and no discovery running (used by --drain)."""
+        query: Dict = {"$or": [
+            {"Kind": ARTICLE, "State": {"$in": [PENDING, LEASED]}, "Attempts": {"$lt": self.max_attempts}},
+            {"Kind": DISCOVER, "State": LEASED},
+        ]}
+        if sources:
+            query["Source"] = {"$in": list(sources)}
+        return self.coll.find_one(query, {"_id": 1}) is None
+
+    def counts(self) -> Dict[str, int]:
+        out = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        for row in self.coll.aggregate([{"$match": {"Kind": ARTICLE}}, {"$group": {"_id": "$State", "n": {"$sum": 1}}}]):
+            out[row["_id"]] = row["n"]
+        return out
+
+
+class MemoryWorkQueue(_QueueBase):
+    """In-process stand-in with the same semantics (single node only)."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, source: str, urls: Sequence[str], metas: Optional[Dict[str, Dict]] = None) -> int:
+        now = datetime.utcnow()
+        added = 0
+        with self._lock:
+            for u in dict.fromkeys(u for u in urls if u):
+                if u not in self._jobs:
+                    self._jobs[u] = {"Kind": ARTICLE, "Source": source, "State": PENDING, "Attempts": 0,
+                                     "AvailableAt": now, "Meta": (metas or {}).get(u) or {}}
+                    added += 1
+        return added
+
+    def ensure_discovery(self, sources: Iterable[str]) -> None:
+        now = datetime.utcnow()
+        with self._lock:
+            for code in sources:
+                self._jobs.setdefault(discover_job_id(code), {"Kind": DISCOVER, "Source": code, "State": PENDING,
+                                                              "Attempts": 0, "AvailableAt": now, "Meta": {}})
+
+    def _due(self, doc: Dict, now: datetime) -> bool:
+        if doc["Attempts"] >= self.max_attempts:
+            return False
+        if doc["State"] == PENDING:
+            return doc["AvailableAt"] <= now
+        return doc["State"] == LEASED and doc["LeaseExpiresAt"] <= now
+
+    def lease(self, worker: str, kind: str = ARTICLE, sources: Optional[Sequence[str]] = None, limit: int = 1) -> List[Job]:
+        now = datetime.utcnow()
+        jobs: List[Job] = []
+        with self._lock:
+            due = sorted(
+                (d["AvailableAt"], jid) for jid, d in self._jobs.items()
+                if d["Kind"] == kind and (not sources or d["Source"] in sources) and self._due(d, now)
+            )
+            for _, jid in due[:limit]:
+                doc = self._jobs[jid]
+                token = uuid.uuid4().hex
+                doc.update(State=LEASED, LeaseOwner=worker, LeaseToken=token,
+                           LeaseExpiresAt=now + timedelta(seconds=self.lease_seconds))
+                doc["Attempts"] += 1
+                jobs.append(Job(jid, doc["Kind"], doc["Source"], token, doc["Attempts"], dict(doc["Meta"])))
+        return jobs
+
+    def _owned(self, job: Job) -> Optional[Dict]:
+        doc = self._jobs.get(job.id)
+        if doc and doc["State"] == LEASED and doc.get("LeaseToken") == job.token:
+            return doc
+        return None
+
+    def complete(self, job: Job, rearm_after: Optional[float] = None) -> bool:
+        with self._lock:
+            doc = self._owned(job)
+            if doc is None:
+                return False
+            doc.pop("LeaseToken", None)
+            if rearm_after is not None:
+                doc.update(State=PENDING, Attempts=0, AvailableAt=datetime.utcnow() + timedelta(seconds=rearm_after))
+            else:
+                doc["State"] = DONE
+            return True
+
+    def fail(self, job: Job, error: str) -> bool:
+        with self._lock:
+            doc = self._owned(job)
+            if doc is None:
+                return False
+            doc.pop("LeaseToken", None)
+            doc["LastError"] = error[:500]
+            if job.attempts >= self.max_attempts:
+                doc["State"] = DEAD
+            else:
+                doc.update(State=PENDING, AvailableAt=datetime.utcnow() + timedelta(seconds=self.backoff(job.attempts)))
+            return True
+
+    def extend(self, job: Job) -> bool:
+        with self._lock:
+            doc = self._owned(job)
+            if doc is None:
+                return False
+            doc["LeaseExpiresAt"] = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+            return True
+
+    def reap(self) -> int:
+        now = datetime.utcnow()
+        n = 0
+        with self._lock:
+            for doc in self._jobs.values():
+                if doc["State"] == LEASED and doc["LeaseExpiresAt"] <= now and doc["Attempts"] >= self.max_attempts:
+                    doc["State"] = DEAD
+                    doc["LastError"] = "lease expired on final attempt"
+                    n += 1
+        return n
+
+    def idle(self, sources: Optional[Sequence[str]] = None) -> bool:
+        with self._lock:
+            for doc in self._jobs.values():
+                if sources and doc["Source"] not in sources:
+                    continue
+                if doc["Kind"] == ARTICLE and doc["State"] in (PENDING, LEASED) and doc["Attempts"] < self.max_attempts:
+                    return False
+                if doc["Kind"] == DISCOVER and doc["State"] == LEASED:
+                    return False
+        return True
+
+    def counts(self) -> Dict[str, int]:
+        out = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        with self._lock:
+            for doc in self._jobs.values():
+                if doc["Kind"] == ARTICLE:
+                    out[doc["State"]] += 1
+        return out
+
+
+class LeaseKeeper:
+    """Renew the leases of `jobs` every `interval` seconds while the `with` block runs.
+
+    Jobs whose renewal fails were taken over by another worker (or finished
+    elsewhere): they are logged once and listed in `lost`.
+    """
+
+    def __init__(self, queue, jobs: Sequence[Job], interval: Optional[float] = None) -> None:
+        self.queue = queue
+        self.jobs = list(jobs)
+        if interval is None:
+            interval = float(os.getenv("QUEUE_HEARTBEAT_SECONDS", "0")) or queue.lease_seconds / 3
+        self.interval = max(0.05, interval)
+        self.lost: set = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def renew(self) -> None:
+        for job in self.jobs:
+            if job.id in self.lost:
+                continue
+            try:
+                ok = self.queue.extend(job)
+            except Exception as e:
+                # Transient DB error: the lease is still valid until it expires, retry next beat
+                print(f"[Queue] Lease renewal failed for {job.id}: {e}")
+                continue
+            if not ok:
+                self.lost.add(job.id)
+                print(f"[Queue] Lease lost for {job.id} (expired and taken over)")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.renew()
+
+    def __enter__(self) -> "LeaseKeeper":
+        if self.jobs:
+            self._thread = threading.Thread(target=self._run, name="lease-keeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_work_queue():
+    """Process-wide work queue (Mongo unless QUEUE_BACKEND=memory or DB_BACKEND is SQL)."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                from app.core.storage import BACKEND
+
+                if os.getenv("QUEUE_BACKEND", "mongo").lower() == "memory" or BACKEND != "mongo":
+                    _queue = MemoryWorkQueue()
+                else:
+                    _queue = MongoWorkQueue()
+    return _queue
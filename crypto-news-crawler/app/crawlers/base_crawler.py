@@ -9,29 +9,98 @@ normalization, sentiment analysis, and DB storage.
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+import functools
 import json
 import os
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
-from datetime import datetime
-from urllib.parse import urljoin
-import re
+from typing import Any, Iterable, List, Optional, Dict, Set, Tuple
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import trafilatura
-import dateparser
 from bs4 import BeautifulSoup
 try:
     import feedparser  # RSS/Atom parser
 except Exception:
     feedparser = None
 
-from app.core.fetcher import fetch_html
+from app.core.backfill import (
+    SitemapDiscovery,
+    archive_pages,
+    assign_urls,
+    backfill_parallel,
+    date_chunks,
+    get_backfill_progress,
+)
+from app.core.checkpoints import checkpoints_enabled, get_checkpoint_store
+from app.core.crawl_engine import CrawlEngine, CrawlStats
+from app.core.crawl_metrics import CycleMetrics
+from app.core.crawl_pipeline import CrawlPipeline, pipeline_enabled
+from app.core.dates import parse_date
+from app.core.fetcher import (
+    feed_validators,
+    fetch_bytes,
+    fetch_html,
+    fetch_stats,
+    forget_feed_validators,
+    restore_feed_validators,
+    stats_delta,
+)
+from app.core.article_document import ArticleDocument, element_text
+from app.core.fast_extract import FAST, FULL, extract_fast, fast_extract_enabled, get_tier_stats, metadata_date
+from app.core.feed_snapshot import FeedEntry, FeedSnapshot
+from app.core.near_duplicates import fingerprint, get_near_duplicate_index, mark_duplicate, near_duplicates_enabled
 from app.core.normalizer import normalize_article
-from app.core.storage import db_session, get_source_by_code, save_article as db_save_article
+from app.core.politeness import CLOSED, get_circuit_breaker
+from app.core.seen_urls import get_seen_urls
+from app.core.work_queue import LeaseKeeper
+from app.core.article_writer import get_article_writer
+from app.core.storage import INSERT_FAILED, db_round_trips, db_session, get_source_by_code
 from app.services.ai_service import get_ai_service
-from app.services.sentiment_analyzer import analyze_news_sentiment, sentiment_model_name
+from app.services.breaking_news import get_breaking_scorer, merge_extra_json
+from app.services.sentiment_analyzer import (
+    analyze_news_sentiment,
+    analyze_news_sentiment_batch,
+    sentiment_model_name,
+    warm_up as warm_up_sentiment,
+)
+from app.services.sentiment_cache import get_sentiment_cache
 from app.services.symbol_extractor import extract_symbols_from_article
 
+# Crawler instances of the pipeline's extract workers, one per class and thread/process
+_extract_local = threading.local()
+
+
+def _extract_in_worker(crawler_cls, cfg: Dict, list_url: str, url: str, html: str, meta: Optional[Dict]):
+    """Extract stage of the crawl pipeline; runs in a pool process (or a worker thread).
+
+    Returns (raw article, {"stages": {stage: (seconds, calls, cpu)}, "counters": {...}})
+    so the parent can merge the extraction timings into its cycle metrics.
+    """
+    crawlers = getattr(_extract_local, "crawlers", None)
+    if crawlers is None:
+        crawlers = _extract_local.crawlers = {}
+    crawler = crawlers.get(crawler_cls)
+    if crawler is None:
+        crawler = crawlers[crawler_cls] = crawler_cls()
+    metrics = crawler._metrics = CycleMetrics(crawler.source_code)
+    # RSS metadata travels with the job, so the worker never downloads the feed
+    crawler._feed = FeedSnapshot(list_url, entries=[FeedEntry(link=url, **meta)] if meta else [])
+    raw = crawler.extract_article(url, cfg, html=html)
+    report = {
+        "stages": {
+            stage: (metrics.stage_seconds[stage], metrics.stage_calls[stage], metrics.stage_cpu.get(stage))
+            for stage in ("parse", "extract")
+            if metrics.stage_calls.get(stage)
+        },
+        "counters": {k: v for k, v in metrics.counters.items() if v},
+        "pid": os.getpid(),
+    }
+    return raw, report
+
 
 class BaseNewsCrawler:
     """Template Method base class for news crawlers.
@@ -54,6 +123,26 @@ class BaseNewsCrawler:
         self.base_url = base_url.rstrip("/")
         self.default_config = default_config or {}
         self._cache_path = (Path(__file__).resolve().parent / cache_filename)
+        # Resolved config, reused until the cache file's mtime changes (see get_config)
+        self._config: Optional[Dict] = None
+        self._config_mtime: Optional[int] = None
+        self._config_checked_at = 0.0
+        self._config_lock = threading.Lock()
+        self._feed: Optional[FeedSnapshot] = None
+        self._feed_downloads = 0
+        self._feed_lock = threading.Lock()
+        self._conditional_feed = False
+        self._source_id_cache = None
+        self._checkpoint_store = None
+        self._checkpoint = None
+        # URLs whose buffered write failed, until the run that fetched them takes them back
+        self._write_failures: Set[str] = set()
+        self._write_failures_lock = threading.Lock()
+        # (start, end) while crawl_by_date_range runs: articles published outside are dropped
+        self._date_range: Optional[Tuple[datetime, datetime]] = None
+        # Stage timers / counters of the current cycle (replaced by _start_cycle)
+        self._metrics = CycleMetrics(source_code)
+        self._write_time_before: Tuple[float, int] = (0.0, 0)
 
     def _is_valid_config(self, cfg: Optional[Dict]) -> bool:
         if not isinstance(cfg, dict):
@@ -103,7 +192,39 @@ class BaseNewsCrawler:
         except Exception:
             pass
 
-    def get_config(self) -> Dict:
+    def _cache_file_mtime(self) -> Optional[int]:
+        try:
+            return self._cache_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def get_config(self, refresh: bool = False) -> Dict:
+        """Resolved config (cache file → AI → default), kept on the instance.
+
+        The cache file is stat'ed at most every CRAWLER_CONFIG_RECHECK_SECONDS
+        (default 5, 0 = on every call) and the config is only resolved again
+        when the file's mtime changed or on `refresh`. Callers share the
+        returned dict and must not modify it.
+        """
+        recheck = float(os.getenv("CRAWLER_CONFIG_RECHECK_SECONDS", "5"))
+        with self._config_lock:
+            now = time.monotonic()
+            if self._config is not None and not refresh:
+                if now - self._config_checked_at < recheck:
+                    return self._config
+                self._config_checked_at = now
+                if self._cache_file_mtime() == self._config_mtime:
+                    return self._config
+            cfg = self._resolve_config()
+            # Taken after resolving, so our own write-back does not invalidate the config
+            self._config, self._config_mtime, self._config_checked_at = cfg, self._cache_file_mtime(), now
+            return cfg
+
+    def refresh_config(self) -> Dict:
+        """Resolve the config again (e.g. after regenerating the cache file)."""
+        return self.get_config(refresh=True)
+
+    def _resolve_config(self) -> Dict:
         # 1) Load cached
         cfg = self._load_cached_config()
         if self._is_valid_config(cfg):
@@ -185,75 +306,89 @@ class BaseNewsCrawler:
         self._save_cached_config(clean_default)
         return clean_default
 
+    # ---------- Feed snapshot helpers ----------
+    def _load_feed(self, list_url: str, conditional: bool = False) -> FeedSnapshot:
+        """Download and parse `list_url` once; the snapshot is reused for the whole cycle."""
+        self._feed = FeedSnapshot.load(list_url, conditional=conditional)
+        self._feed_downloads = getattr(self, "_feed_downloads", 0) + 1
+        return self._feed
+
+    def _feed_for(self, cfg: dict) -> Optional[FeedSnapshot]:
+        """Feed snapshot for the configured list_url (loaded at most once per cycle)."""
+        list_url = (cfg.get("list_url") or "")
+        if not list_url:
+            return None
+        with self._feed_lock:
+            feed = getattr(self, "_feed", None)
+            if feed is None or feed.list_url != list_url:
+                feed = self._load_feed(list_url)
+            return feed
+
+    def _list_html(self, list_url: str) -> str:
+        """List page HTML, reusing the body already downloaded for the feed snapshot."""
+        feed = getattr(self, "_feed", None)
+        if feed is not None and feed.list_url == list_url and feed.raw:
+            return feed.raw
+        return fetch_html(list_url)
+
+    @staticmethod
+    def _page_date(doc: ArticleDocument, art_cfg: dict) -> Optional[datetime]:
+        """Publish time from the configured date meta tag, else the first <time> element."""
+        meta_name = art_cfg.get("date_selector_meta")
+        if meta_name:
+            # Support both meta property and meta name attributes
+            meta_time = doc.meta("property", meta_name)
+            if meta_time is None:
+                meta_time = doc.meta("name", meta_name)
+            if meta_time is not None and meta_time.get("content"):
+                try:
+                    dt = parse_date(meta_time.get("content"))
+                    if dt:
+                        return dt
+                except Exception:
+                    pass
+        time_tag = doc.time_tag
+        if time_tag is not None and (time_tag.get("datetime") or element_text(time_tag)):
+            try:
+                return parse_date(time_tag.get("datetime") or element_text(time_tag))
+            except Exception:
+                return None
+        return None
+
+    @staticmethod
+    def _jsonld_date(doc: ArticleDocument) -> Optional[datetime]:
+        """datePublished (or dateCreated/dateModified) of the first JSON-LD item that has one."""
+        for it_ld in doc.jsonld_items():
+            if isinstance(it_ld, dict):
+                for fld in ("datePublished", "dateCreated", "dateModified"):
+                    val = it_ld.get(fld)
+                    if val:
+                        try:
+                            dt = parse_date(str(val))
+                        except Exception:
+                            dt = None
+                        if dt:
+                            return dt
+                        break
+        return None
+
     # ---------- URL discovery (override if needed) ----------
     def discover_urls_via_feed(self, list_url: str) -> Optional[List[str]]:
-        """Discover article URLs using feedparser and populate RSS metadata maps.
+        """Discover article URLs from the RSS/Atom feed at `list_url`.
 
+        The parsed feed is kept as `self._feed` (a FeedSnapshot) so extraction
+        can reuse RSS title/summary/date/author without downloading it again.
         Returns a de-duplicated list of URLs when feed entries are present,
         otherwise returns None to indicate no feed-based discovery.
         """
-        if feedparser is None or not list_url:
+        if not list_url:
             return None
         try:
-            feed = feedparser.parse(list_url)
-            if not hasattr(feed, "entries") or not feed.entries:
+            with self._feed_lock:
+                feed = self._load_feed(list_url, conditional=self._conditional_feed)
+            if not feed.entries:
                 return None
-
-            urls: List[str] = []
-            # Initialize RSS metadata maps
-            self._rss_author_map = {}
-            self._rss_date_map = {}
-            self._rss_title_map = {}
-            self._rss_summary_map = {}
-
-            def _norm(u: Optional[str]) -> Optional[str]:
-                if not u:
-                    return None
-                try:
-                    u = u.strip()
-                    if u.endswith("/"):
-                        u = u[:-1]
-                    u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                    return u
-                except Exception:
-                    return u
-
-            for entry in feed.entries:
-                link = getattr(entry, "link", None) or getattr(entry, "id", None)
-                if not link:
-                    continue
-                nlink = _norm(link) or link
-                urls.append(nlink)
-                # Title
-                title = getattr(entry, "title", None)
-                if title:
-                    self._rss_title_map[nlink] = str(title).strip()
-                # Summary/Description
-                summary = getattr(entry, "summary", None)
-                if summary:
-                    self._rss_summary_map[nlink] = str(summary).strip()
-                # Published date
-                pub = getattr(entry, "published", None) or getattr(entry, "updated", None)
-                if pub:
-                    self._rss_date_map[nlink] = str(pub).strip()
-                # Author(s)
-                author = None
-                if hasattr(entry, "author") and entry.author:
-                    author = str(entry.author).strip()
-                elif hasattr(entry, "authors") and entry.authors:
-                    names = []
-                    for a in entry.authors:
-                        name = (a.get("name") if isinstance(a, dict) else None) or None
-                        if name:
-                            names.append(str(name).strip())
-                    if names:
-                        author = ", ".join(list(dict.fromkeys(names)))
-                elif "dc_creator" in entry and entry["dc_creator"]:
-                    author = str(entry["dc_creator"]).strip()
-                if author:
-                    self._rss_author_map[nlink] = author
-
-            return list(dict.fromkeys(urls))
+            return feed.urls()
         except Exception:
             return None
 
@@ -286,11 +421,15 @@ class BaseNewsCrawler:
             if exclude_patterns:
                 filtered = [u for u in filtered if not _matches_any(u, exclude_patterns)]
             return filtered
+        if self._feed is not None and self._feed.unchanged and self._feed.list_url == list_url:
+            # 304 / identical body: nothing new since the previous cycle
+            print(f"[Feed] {self.source_code}: feed unchanged, skipping discovery")
+            return []
 
         # Fallback: fetch HTML and use selector/heuristic or XML sitemap/RSS parsing
         html = ""
         try:
-            html = fetch_html(list_url)
+            html = self._list_html(list_url)
         except Exception as e:
             print(f"[List] Fetch failed for {list_url}: {e}. Falling back to default list.")
             fallback_list = (self.default_config or {}).get("list_url") or self.base_url
@@ -319,7 +458,7 @@ class BaseNewsCrawler:
                     return filtered
 
                 # If feed discovery via fallback fails, fetch HTML for heuristic discovery
-                html = fetch_html(fallback_list)
+                html = self._list_html(fallback_list)
             except Exception as e2:
                 print(f"[List] Fallback fetch failed for {fallback_list}: {e2}")
                 return []
@@ -404,135 +543,61 @@ class BaseNewsCrawler:
         return list(set(_apply_patterns(urls)))
 
     # ---------- Article extraction (can be overridden) ----------
-    def extract_article(self, url: str, cfg: dict) -> dict:
+    def extract_article(self, url: str, cfg: dict, html: Optional[str] = None) -> dict:
+        """Extract article fields from `url`.
+
+        When `html` is given (e.g. prefetched by the crawl engine) no network
+        fetch of the article page is performed.
+        """
+        metrics = self._metrics
+        # Fetch once and parse once; every extraction step reads from `doc`
+        if html is None:
+            with metrics.stage("fetch"):
+                html = ArticleDocument.download(url)
+        with metrics.stage("parse"):
+            doc = ArticleDocument(url, html)
+        t_extract, c_extract = time.perf_counter(), time.thread_time()
+        html = doc.html
+        art_cfg = (cfg.get("article") or {})
+
+        # RSS entry for this URL, matched by normalized URL, canonical/og:url or numeric id
+        feed = self._feed_for(cfg)
+        rss_entry = None
+        if feed is not None and feed.entries:
+            try:
+                rss_entry = feed.lookup(url, doc.canonical_urls)
+            except Exception:
+                rss_entry = None
+
         # Optionally prefer RSS pubDate first for precise time
         preferred_rss_dt = None
-        try:
-            art_cfg = (cfg.get("article") or {})
-            if art_cfg.get("prefer_rss_date") and feedparser is not None:
-                list_url = (cfg.get("list_url") or "")
-                if list_url:
-                    feed = feedparser.parse(list_url)
-                    # Try to discover a canonical URL from HTML to improve matching
-                    canonical_targets: List[str] = []
-                    try:
-                        html_for_canonical = fetch_html(url)
-                        soup_canon = BeautifulSoup(html_for_canonical, "lxml")
-                        # <link rel="canonical"> and og:url
-                        lcanon = soup_canon.find("link", {"rel": "canonical"})
-                        if lcanon and lcanon.get("href"):
-                            canonical_targets.append(str(lcanon.get("href")).strip())
-                        mog = soup_canon.find("meta", {"property": "og:url"})
-                        if mog and mog.get("content"):
-                            canonical_targets.append(str(mog.get("content")).strip())
-                    except Exception:
-                        pass
-                    def _norm(u: Optional[str]) -> Optional[str]:
-                        if not u:
-                            return None
-                        try:
-                            u = u.strip()
-                            if u.endswith("/"):
-                                u = u[:-1]
-                            u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                            return u
-                        except Exception:
-                            return u
-                    def _norm_path_only(u: Optional[str]) -> Optional[str]:
-                        # Normalize and drop query params for robust matching
-                        if not u:
-                            return None
-                        try:
-                            u = u.strip()
-                            u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                            # remove query and fragment
-                            u = re.sub(r"[?#].*$", "", u)
-                            if u.endswith("/"):
-                                u = u[:-1]
-                            return u
-                        except Exception:
-                            return u
-                    def _id_from(u: Optional[str]) -> Optional[str]:
-                        if not u:
-                            return None
-                        try:
-                            m = re.search(r"/(\d{4,})/", u)
-                            if m:
-                                return m.group(1)
-                            m = re.search(r"[?&]p=(\d+)", u)
-                            if m:
-                                return m.group(1)
-                        except Exception:
-                            pass
-                        return None
-                    norm_target = _norm(url)
-                    norm_target_path = _norm_path_only(url)
-                    target_id = _id_from(url)
-                    # include canonical targets
-                    canon_norms = list({x for x in [
-                        _norm(canonical_targets[0]) if len(canonical_targets) > 0 else None,
-                        _norm(canonical_targets[1]) if len(canonical_targets) > 1 else None,
-                        _norm_path_only(canonical_targets[0]) if len(canonical_targets) > 0 else None,
-                        _norm_path_only(canonical_targets[1]) if len(canonical_targets) > 1 else None,
-                    ] if x})
-                    for entry in getattr(feed, "entries", []) or []:
-                        link = getattr(entry, "link", None)
-                        eid = getattr(entry, "id", None)
-                        guid = getattr(entry, "guid", None) if hasattr(entry, "guid") else None
-                        candidates = [link, eid, guid]
-                        matched = False
-                        for cand in candidates:
-                            nc = _norm(cand)
-                            if nc and norm_target and nc == norm_target:
-                                matched = True
-                                break
-                            # also compare path-only
-                            npc = _norm_path_only(cand)
-                            if npc and norm_target_path and npc == norm_target_path:
-                                matched = True
-                                break
-                            # compare against discovered canonical URLs
-                            if nc and canon_norms and nc in canon_norms:
-                                matched = True
-                                break
-                            if npc and canon_norms and npc in canon_norms:
-                                matched = True
-                                break
-                            cid = _id_from(cand)
-                            if cid and target_id and cid == target_id:
-                                matched = True
-                                break
-                        if matched:
-                            pub = getattr(entry, "published", None) or getattr(entry, "updated", None)
-                            if pub:
-                                try:
-                                    preferred_rss_dt = dateparser.parse(str(pub))
-                                except Exception:
-                                    preferred_rss_dt = None
-                            break
-        except Exception:
-            preferred_rss_dt = None
-
-        # Fetch HTML with resilience: handle 4xx/5xx and continue gracefully
-        try:
-            html = fetch_html(url)
-        except Exception as e:
-            print(f"[Article] Fetch failed for {url}: {e}")
-            html = ""
-
-        downloaded = trafilatura.extract(
-            html,
-            include_comments=False,
-            include_tables=False,
-            output_format="json",
-            with_metadata=True,
-        )
+        if art_cfg.get("prefer_rss_date") and rss_entry and rss_entry.published:
+            try:
+                preferred_rss_dt = parse_date(rss_entry.published)
+            except Exception:
+                preferred_rss_dt = None
 
         title = None
         content = None
         published_at = None
         author = None
 
+        # Tier 1: configured selectors on the lxml tree; trafilatura (a second parse) only when that fails
+        fast = extract_fast(doc, art_cfg.get("title_selector"), art_cfg.get("content_selector")) if fast_extract_enabled() else None
+        if fast is not None:
+            tier = FAST
+            title, content = fast
+            downloaded = None
+        else:
+            tier = FULL
+            downloaded = trafilatura.extract(
+                html,
+                include_comments=False,
+                include_tables=False,
+                output_format="json",
+                with_metadata=True,
+            )
+
         if downloaded:
             try:
                 data = json.loads(downloaded)
@@ -545,25 +610,11 @@ class BaseNewsCrawler:
                 try:
                     # Trafilatura often provides date-only (YYYY-MM-DD); parse it,
                     # but we may later upgrade precision using meta/time/RSS if available.
-                    published_at = dateparser.parse(date_str)
+                    published_at = parse_date(date_str)
                 except Exception:
                     published_at = None
 
-        soup = BeautifulSoup(html, "lxml")
-
         # If we have a date-only time (midnight) and RSS has precise time for this URL, prefer RSS
-        def _norm(u: Optional[str]) -> Optional[str]:
-            if not u:
-                return None
-            try:
-                u = u.strip()
-                if u.endswith("/"):
-                    u = u[:-1]
-                u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                return u
-            except Exception:
-                return u
-
         def _is_midnight_dt(dt: Optional[datetime]) -> bool:
             try:
                 return (
@@ -573,67 +624,55 @@ class BaseNewsCrawler:
             except Exception:
                 return False
 
-        nurl = _norm(url) or url
         # Prefer already-resolved RSS datetime first if configured
         if preferred_rss_dt and not _is_midnight_dt(preferred_rss_dt):
             published_at = preferred_rss_dt
-        elif (published_at is None or _is_midnight_dt(published_at)) and hasattr(self, "_rss_date_map") and isinstance(self._rss_date_map, dict):
-            rss_date = self._rss_date_map.get(nurl) or self._rss_date_map.get(url)
-            if rss_date:
-                try:
-                    ra = dateparser.parse(rss_date)
-                    if ra and not _is_midnight_dt(ra):
-                        published_at = ra
-                except Exception:
-                    pass
+        elif (published_at is None or _is_midnight_dt(published_at)) and rss_entry and rss_entry.published:
+            try:
+                ra = parse_date(rss_entry.published)
+                if ra and not _is_midnight_dt(ra):
+                    published_at = ra
+            except Exception:
+                pass
 
         # Fallback title
         if not title:
-            tsel = (cfg.get("article") or {}).get("title_selector")
-            tnode = soup.select_one(tsel) if tsel else soup.find("h1")
-            if tnode:
-                title = tnode.get_text(strip=True)
+            tsel = art_cfg.get("title_selector")
+            tnode = doc.select_one(tsel) if tsel else doc.select_one("h1")
+            if tnode is not None:
+                title = element_text(tnode)
         if not title:
             # Try common meta tags
-            article_cfg = (cfg.get("article") or {})
-            meta_keys = article_cfg.get("title_meta_keys") or [
+            meta_keys = art_cfg.get("title_meta_keys") or [
                 ("property", "og:title"),
                 ("property", "twitter:title"),
                 ("name", "parsely-title"),
                 ("name", "title"),
             ]
             for attr, val in meta_keys:
-                m = soup.find("meta", {attr: val})
-                if m and m.get("content"):
-                    title = m.get("content")
+                m = doc.meta_content(attr, val)
+                if m:
+                    title = m
                     break
         if not title:
             # Try JSON-LD
-            for script in soup.find_all("script", {"type": "application/ld+json"}):
-                try:
-                    data = json.loads(script.string or "{}")
-                except Exception:
-                    continue
-                items = data if isinstance(data, list) else [data]
-                for it in items:
-                    t = (it.get("headline") or it.get("name")) if isinstance(it, dict) else None
-                    if t:
-                        title = str(t).strip()
-                        break
-                if title:
+            for it in doc.jsonld_items():
+                t = (it.get("headline") or it.get("name")) if isinstance(it, dict) else None
+                if t:
+                    title = str(t).strip()
                     break
 
         # Fallback content
         if not content:
-            csel = (cfg.get("article") or {}).get("content_selector")
+            csel = art_cfg.get("content_selector")
             if csel:
-                nodes = soup.select(csel)
-                text_parts = [n.get_text("\n", strip=True) for n in nodes if n]
+                nodes = doc.select(csel)
+                text_parts = [element_text(n, "\n") for n in nodes]
                 content = "\n\n".join([t for t in text_parts if t]) or None
             if not content:
-                article = soup.find("article")
-                if article:
-                    content = article.get_text("\n", strip=True)
+                article = doc.select_one("article")
+                if article is not None:
+                    content = element_text(article, "\n")
 
         # If content equals title or is too short, try better fallbacks
         def _clean_same_as_title(text: Optional[str], title_val: Optional[str]) -> Optional[str]:
@@ -647,12 +686,7 @@ class BaseNewsCrawler:
 
         if not content or (isinstance(content, str) and len(content.strip()) < 120):
             # Try JSON-LD articleBody
-            for script in soup.find_all("script", {"type": "application/ld+json"}):
-                try:
-                    data = json.loads(script.string or "{}")
-                except Exception:
-                    continue
-                items = data if isinstance(data, list) else [data]
+            for items in doc.jsonld:
                 body = None
                 for it in items:
                     if isinstance(it, dict):
@@ -669,7 +703,7 @@ class BaseNewsCrawler:
 
         if not content or (isinstance(content, str) and len(content.strip()) < 120):
             # Try paragraphs under common containers
-            para_selectors = (cfg.get("article") or {}).get("content_paragraph_selectors") or [
+            para_selectors = art_cfg.get("content_paragraph_selectors") or [
                 "article p",
                 "div.article-paragraphs p",
                 "div.at-text p",
@@ -677,8 +711,8 @@ class BaseNewsCrawler:
             paras = []
             for sel in para_selectors:
                 paras.extend([
-                    p.get_text(" ", strip=True)
-                    for p in soup.select(sel)
+                    element_text(p, " ")
+                    for p in doc.select(sel)
                 ])
             merged = "\n\n".join([t for t in paras if t])
             merged = _clean_same_as_title(merged, title)
@@ -687,15 +721,15 @@ class BaseNewsCrawler:
 
         if not content or (isinstance(content, str) and len(content.strip()) < 80):
             # Last resort: meta description (not ideal, but better than title)
-            desc_keys = (cfg.get("article") or {}).get("description_meta_keys") or [
+            desc_keys = art_cfg.get("description_meta_keys") or [
                 ("name", "description"),
                 ("property", "og:description"),
                 ("name", "twitter:description"),
             ]
             for attr, val in desc_keys:
-                m = soup.find("meta", {attr: val})
-                if m and m.get("content"):
-                    desc = m.get("content").strip()
+                m = doc.meta_content(attr, val)
+                if m:
+                    desc = m.strip()
                     if title and desc == title.strip():
                         continue
                     if desc:
@@ -706,136 +740,16 @@ class BaseNewsCrawler:
 
         # Fallback published time or precision upgrade
         if not published_at:
-            meta_name = (cfg.get("article") or {}).get("date_selector_meta")
-            if meta_name:
-                # Support both meta property and meta name attributes
-                meta_time = soup.find("meta", {"property": meta_name}) or soup.find("meta", {"name": meta_name})
-                if meta_time and meta_time.get("content"):
-                    try:
-                        published_at = dateparser.parse(meta_time["content"])  # type: ignore[index]
-                    except Exception:
-                        published_at = None
-            if not published_at:
-                time_tag = soup.find("time")
-                if time_tag and (time_tag.get("datetime") or time_tag.get_text(strip=True)):
-                    try:
-                        dtval = time_tag.get("datetime") or time_tag.get_text(strip=True)
-                        published_at = dateparser.parse(dtval)
-                    except Exception:
-                        published_at = None
-            # Final fallback: use RSS pubDate/updated captured during feed discovery
-            if not published_at and hasattr(self, "_rss_date_map") and isinstance(self._rss_date_map, dict):
-                # Try normalized variants
-                rss_date = self._rss_date_map.get(url) or self._rss_date_map.get(_norm(url))
-                if rss_date:
-                    try:
-                        published_at = dateparser.parse(rss_date)
-                    except Exception:
-                        published_at = None
-            # If still missing, try a live lookup in the feed to find this URL's pubDate
-            if not published_at and feedparser is not None:
-                list_url = (cfg.get("list_url") or "")
-                if list_url:
-                    try:
-                        feed = feedparser.parse(list_url)
-                        # Normalize helpers
-                        def _norm(u: Optional[str]) -> Optional[str]:
-                            if not u:
-                                return None
-                            try:
-                                u = u.strip()
-                                # drop trailing slash
-                                if u.endswith("/"):
-                                    u = u[:-1]
-                                # unify scheme
-                                u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                                return u
-                            except Exception:
-                                return u
-
-                        def _norm_path_only(u: Optional[str]) -> Optional[str]:
-                            if not u:
-                                return None
-                            try:
-                                u = u.strip()
-                                u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                                u = re.sub(r"[?#].*$", "", u)
-                                if u.endswith("/"):
-                                    u = u[:-1]
-                                return u
-                            except Exception:
-                                return u
-
-                        def _id_from(u: Optional[str]) -> Optional[str]:
-                            if not u:
-                                return None
-                            try:
-                                m = re.search(r"/(\d{4,})/", u)
-                                if m:
-                                    return m.group(1)
-                                m = re.search(r"[?&]p=(\d+)", u)
-                                if m:
-                                    return m.group(1)
-                            except Exception:
-                                pass
-                            return None
-
-                        norm_target = _norm(url)
-                        norm_target_path = _norm_path_only(url)
-                        # include canonical from the already fetched page soup
-                        canonical_targets: List[str] = []
-                        try:
-                            lcanon = soup.find("link", {"rel": "canonical"})
-                            if lcanon and lcanon.get("href"):
-                                canonical_targets.append(str(lcanon.get("href")).strip())
-                            mog = soup.find("meta", {"property": "og:url"})
-                            if mog and mog.get("content"):
-                                canonical_targets.append(str(mog.get("content")).strip())
-                        except Exception:
-                            pass
-                        canon_norms = list({x for x in [
-                            _norm(canonical_targets[0]) if len(canonical_targets) > 0 else None,
-                            _norm(canonical_targets[1]) if len(canonical_targets) > 1 else None,
-                            _norm_path_only(canonical_targets[0]) if len(canonical_targets) > 0 else None,
-                            _norm_path_only(canonical_targets[1]) if len(canonical_targets) > 1 else None,
-                        ] if x})
-                        target_id = _id_from(url)
-                        for entry in getattr(feed, "entries", []) or []:
-                            link = getattr(entry, "link", None)
-                            eid = getattr(entry, "id", None)
-                            guid = getattr(entry, "guid", None) if hasattr(entry, "guid") else None
-                            candidates = [link, eid, guid]
-                            matched = False
-                            for cand in candidates:
-                                nc = _norm(cand)
-                                if nc and norm_target and nc == norm_target:
-                                    matched = True
-                                    break
-                                npc = _norm_path_only(cand)
-                                if npc and norm_target_path and npc == norm_target_path:
-                                    matched = True
-                                    break
-                                if nc and canon_norms and nc in canon_norms:
-                                    matched = True
-                                    break
-                                if npc and canon_norms and npc in canon_norms:
-                                    matched = True
-                                    break
-                                # match by numeric id
-                                cid = _id_from(cand)
-                                if cid and target_id and cid == target_id:
-                                    matched = True
-                                    break
-                            if matched:
-                                pub = getattr(entry, "published", None) or getattr(entry, "updated", None)
-                                if pub:
-                                    try:
-                                        published_at = dateparser.parse(str(pub))
-                                    except Exception:
-                                        published_at = None
-                                break
-                    except Exception:
-                        pass
+            published_at = self._page_date(doc, art_cfg) or self._jsonld_date(doc)
+            # Final fallback: use RSS pubDate/updated from the cycle's feed snapshot
+            if not published_at and rss_entry and rss_entry.published:
+                try:
+                    published_at = parse_date(rss_entry.published)
+                except Exception:
+                    published_at = None
+            # Fast tier skipped trafilatura: still give its date heuristics a chance
+            if not published_at and tier == FAST:
+                published_at = metadata_date(html)
         else:
             # We have a published_at (likely from Trafilatura). If it looks date-only
             # (00:00:00 time), try to upgrade precision using page meta/time or RSS.
@@ -851,204 +765,56 @@ class BaseNewsCrawler:
                 is_midnight = False
 
             if is_midnight:
-                upgraded = None
                 # Prefer precise meta/time from page
-                meta_name = (cfg.get("article") or {}).get("date_selector_meta")
-                if meta_name:
-                    meta_time = soup.find("meta", {"property": meta_name}) or soup.find("meta", {"name": meta_name})
-                    if meta_time and meta_time.get("content"):
-                        try:
-                            upgraded = dateparser.parse(meta_time["content"])  # type: ignore[index]
-                        except Exception:
-                            upgraded = None
-                if not upgraded:
-                    time_tag = soup.find("time")
-                    if time_tag and (time_tag.get("datetime") or time_tag.get_text(strip=True)):
-                        try:
-                            dtval = time_tag.get("datetime") or time_tag.get_text(strip=True)
-                            upgraded = dateparser.parse(dtval)
-                        except Exception:
-                            upgraded = None
-                if not upgraded:
-                    # Try JSON-LD date fields
-                    for script in soup.find_all("script", {"type": "application/ld+json"}):
-                        try:
-                            data_ld = json.loads(script.string or "{}")
-                        except Exception:
-                            continue
-                        items_ld = data_ld if isinstance(data_ld, list) else [data_ld]
-                        for it_ld in items_ld:
-                            if isinstance(it_ld, dict):
-                                for fld in ("datePublished", "dateCreated", "dateModified"):
-                                    val = it_ld.get(fld)
-                                    if val:
-                                        try:
-                                            upgraded = dateparser.parse(str(val))
-                                        except Exception:
-                                            upgraded = None
-                                        break
-                            if upgraded:
-                                break
-                        if upgraded:
-                            break
+                upgraded = self._page_date(doc, art_cfg) or self._jsonld_date(doc)
                 # Fallback to RSS if still not upgraded
-                if not upgraded and hasattr(self, "_rss_date_map") and isinstance(self._rss_date_map, dict):
-                    rss_date = self._rss_date_map.get(url)
-                    if rss_date:
-                        try:
-                            upgraded = dateparser.parse(rss_date)
-                        except Exception:
-                            upgraded = None
+                if not upgraded and rss_entry and rss_entry.published:
+                    try:
+                        upgraded = parse_date(rss_entry.published)
+                    except Exception:
+                        upgraded = None
                 if upgraded and isinstance(upgraded, datetime):
                     published_at = upgraded
-                elif upgraded is None and feedparser is not None:
-                    # As a last resort for precision upgrade, try live feed lookup for this URL
-                    list_url = (cfg.get("list_url") or "")
-                    if list_url:
-                        try:
-                            feed = feedparser.parse(list_url)
-                            # Reuse normalization and id-matching
-                            def _norm(u: Optional[str]) -> Optional[str]:
-                                if not u:
-                                    return None
-                                try:
-                                    u = u.strip()
-                                    if u.endswith("/"):
-                                        u = u[:-1]
-                                    u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                                    return u
-                                except Exception:
-                                    return u
-
-                            def _norm_path_only(u: Optional[str]) -> Optional[str]:
-                                if not u:
-                                    return None
-                                try:
-                                    u = u.strip()
-                                    u = re.sub(r"^http://", "https://", u, flags=re.IGNORECASE)
-                                    u = re.sub(r"[?#].*$", "", u)
-                                    if u.endswith("/"):
-                                        u = u[:-1]
-                                    return u
-                                except Exception:
-                                    return u
-
-                            def _id_from(u: Optional[str]) -> Optional[str]:
-                                if not u:
-                                    return None
-                                try:
-                                    m = re.search(r"/(\d{4,})/", u)
-                                    if m:
-                                        return m.group(1)
-                                    m = re.search(r"[?&]p=(\d+)", u)
-                                    if m:
-                                        return m.group(1)
-                                except Exception:
-                                    pass
-                                return None
-
-                            norm_target = _norm(url)
-                            norm_target_path = _norm_path_only(url)
-                            canonical_targets: List[str] = []
-                            try:
-                                lcanon = soup.find("link", {"rel": "canonical"})
-                                if lcanon and lcanon.get("href"):
-                                    canonical_targets.append(str(lcanon.get("href")).strip())
-                                mog = soup.find("meta", {"property": "og:url"})
-                                if mog and mog.get("content"):
-                                    canonical_targets.append(str(mog.get("content")).strip())
-                            except Exception:
-                                pass
-                            canon_norms = list({x for x in [
-                                _norm(canonical_targets[0]) if len(canonical_targets) > 0 else None,
-                                _norm(canonical_targets[1]) if len(canonical_targets) > 1 else None,
-                                _norm_path_only(canonical_targets[0]) if len(canonical_targets) > 0 else None,
-                                _norm_path_only(canonical_targets[1]) if len(canonical_targets) > 1 else None,
-                            ] if x})
-                            target_id = _id_from(url)
-                            for entry in getattr(feed, "entries", []) or []:
-                                link = getattr(entry, "link", None)
-                                eid = getattr(entry, "id", None)
-                                guid = getattr(entry, "guid", None) if hasattr(entry, "guid") else None
-                                candidates = [link, eid, guid]
-                                matched = False
-                                for cand in candidates:
-                                    nc = _norm(cand)
-                                    if nc and norm_target and nc == norm_target:
-                                        matched = True
-                                        break
-                                    npc = _norm_path_only(cand)
-                                    if npc and norm_target_path and npc == norm_target_path:
-                                        matched = True
-                                        break
-                                    if nc and canon_norms and nc in canon_norms:
-                                        matched = True
-                                        break
-                                    if npc and canon_norms and npc in canon_norms:
-                                        matched = True
-                                        break
-                                    cid = _id_from(cand)
-                                    if cid and target_id and cid == target_id:
-                                        matched = True
-                                        break
-                                if matched:
-                                    pub = getattr(entry, "published", None) or getattr(entry, "updated", None)
-                                    if pub:
-                                        try:
-                                            upgraded = dateparser.parse(str(pub))
-                                        except Exception:
-                                            upgraded = None
-                                    break
-                        except Exception:
-                            pass
-                    if upgraded and isinstance(upgraded, datetime) and not _is_midnight_dt(upgraded):
-                        published_at = upgraded
 
         # Author (optional)
-        asel = (cfg.get("article") or {}).get("author_selector")
+        asel = art_cfg.get("author_selector")
         if asel:
-            anode = soup.select_one(asel)
-            if anode:
+            anode = doc.select_one(asel)
+            if anode is not None:
                 # If selector targets a meta tag, use its content attribute
-                if anode.name == "meta":
-                    author = anode.get("content") or anode.get_text(strip=True)
+                if anode.tag == "meta":
+                    author = anode.get("content") or element_text(anode)
                 else:
-                    author = anode.get_text(strip=True)
+                    author = element_text(anode)
         if not author:
             # Try common meta names/properties: author, authors, article:author, parsely-author
-            art = (cfg.get("article") or {})
-            name_keys = art.get("author_meta_name_keys") or ["author", "authors", "parsely-author", "sailthru.author"]
-            prop_keys = art.get("author_meta_property_keys") or ["article:author"]
+            name_keys = art_cfg.get("author_meta_name_keys") or ["author", "authors", "parsely-author", "sailthru.author"]
+            prop_keys = art_cfg.get("author_meta_property_keys") or ["article:author"]
             ma = None
             for nk in name_keys:
-                ma = soup.find("meta", {"name": nk})
-                if ma:
+                ma = doc.meta("name", nk)
+                if ma is not None:
                     break
-            if not ma:
+            if ma is None:
                 for pk in prop_keys:
-                    ma = soup.find("meta", {"property": pk})
-                    if ma:
+                    ma = doc.meta("property", pk)
+                    if ma is not None:
                         break
-            if ma and ma.get("content"):
-                author = ma["content"]  # type: ignore[index]
+            if ma is not None and ma.get("content"):
+                author = ma.get("content")
         if not author:
             # Try twitter:creator (may contain @handle)
-            tw_key = (cfg.get("article") or {}).get("author_twitter_key") or "twitter:creator"
-            tw = soup.find("meta", {"name": tw_key})
-            if tw and tw.get("content"):
-                handle = tw.get("content").strip()
+            tw_key = art_cfg.get("author_twitter_key") or "twitter:creator"
+            tw = doc.meta_content("name", tw_key)
+            if tw:
+                handle = tw.strip()
                 if handle.startswith("@"):  # remove @
                     handle = handle[1:]
                 author = handle or None
         if not author:
             # Try JSON-LD author fields
-            jsonld_author_fields = (cfg.get("article") or {}).get("author_jsonld_fields") or ["author", "creator", "contributor"]
-            for script in soup.find_all("script", {"type": "application/ld+json"}):
-                try:
-                    data = json.loads(script.string or "{}")
-                except Exception:
-                    continue
-                items = data if isinstance(data, list) else [data]
+            jsonld_author_fields = art_cfg.get("author_jsonld_fields") or ["author", "creator", "contributor"]
+            for items in doc.jsonld:
                 names = []
                 for it in items:
                     if not isinstance(it, dict):
@@ -1100,16 +866,18 @@ class BaseNewsCrawler:
             except Exception:
                 pass
 
-        # Final fallback: RSS author map if available
-        if not author and hasattr(self, "_rss_author_map") and isinstance(self._rss_author_map, dict):
-            author_hint = self._rss_author_map.get(url)
-            if author_hint:
-                author = author_hint.strip()
+        # Final fallback: RSS author from the feed snapshot
+        if not author and rss_entry and rss_entry.author:
+            author = rss_entry.author.strip()
 
         # Normalize slug-like authors to title case
         if isinstance(author, str) and author and "-" in author and " " not in author:
             author = author.replace("-", " ").title()
 
+        cpu = time.thread_time() - c_extract
+        metrics.record("extract", time.perf_counter() - t_extract, cpu=cpu)
+        metrics.incr(f"tier_{tier}")
+        get_tier_stats().record(self.source_code, tier, cpu)
         return {
             "title": title,
             "content": content,
@@ -1119,15 +887,97 @@ class BaseNewsCrawler:
         }
 
     # ---------- Orchestration ----------
-    def save_article(self, url: str) -> None:
-        raw_data = self.extract_article(url, self.get_config())
+    def enrich_article(self, url: str, cfg: Optional[Dict] = None, html: Optional[str] = None) -> Optional[Dict]:
+        """Extract, normalize and score an article (symbols, breaking, sentiment) without storing it.
+
+        Returns the normalized document, or None when no content could be extracted.
+        """
+        raw_data = self.extract_article(url, cfg or self.get_config(), html=html)
+        prepared = self._prepare_article(url, raw_data)
+        if prepared is None:
+            return None
+        normalized, index, scored = prepared
+        if scored:
+            return normalized
+        with self._metrics.stage("sentiment"):
+            sentiment_result = analyze_news_sentiment(
+                title=normalized.get("Title") or "",
+                content=normalized.get("Content") or "",
+                summary=normalized.get("Summary"),
+            )
+        self._apply_sentiment(url, normalized, sentiment_result, index)
+        return normalized
+
+    def enrich_batch(self, items: List[Tuple[str, Dict]]) -> List[Any]:
+        """Enrich already-extracted articles [(url, raw)] with one batched sentiment pass.
+
+        One result per item: the normalized document, None (no content) or the
+        Exception that failed the article.
+        """
+        results: List[Any] = []
+        pending = []
+        for url, raw_data in items:
+            try:
+                prepared = self._prepare_article(url, raw_data)
+            except Exception as e:
+                results.append(e)
+                continue
+            if prepared is None:
+                results.append(None)
+                continue
+            normalized, index, scored = prepared
+            results.append(normalized)
+            if not scored:
+                pending.append((len(results) - 1, url, normalized, index))
+        if not pending:
+            return results
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            scores = analyze_news_sentiment_batch([
+                {"title": n.get("Title") or "", "content": n.get("Content") or "", "summary": n.get("Summary")}
+                for _, _, n, _ in pending
+            ])
+        except Exception as e:
+            for i, *_ in pending:
+                results[i] = e
+            return results
+        self._metrics.record("sentiment", time.perf_counter() - t0, calls=len(pending), cpu=time.thread_time() - c0)
+        for (_, url, normalized, index), sentiment_result in zip(pending, scores):
+            self._apply_sentiment(url, normalized, sentiment_result, index)
+        return results
+
+    def _prepare_article(self, url: str, raw_data: Optional[Dict]):
+        """Normalize, near-duplicate check, symbols and breaking score.
+
+        Returns (normalized, near-duplicate index or None, whether sentiment is
+        already set), or None when no content could be extracted.
+        """
         if not raw_data or not raw_data.get("content"):
             print("Cannot extract article")
-            return
+            return None
 
         normalized = normalize_article(raw_data, self.source_code, url)
+        metrics = self._metrics
+        if self._date_range is not None:
+            published = normalized.get("PublishedAt")
+            if published is None or not self._date_range[0] <= published <= self._date_range[1]:
+                metrics.incr("out_of_range")
+                return None
+
+        # Near-duplicate of an article from another source in the window: reuse its sentiment
+        index, duplicate_of, sim_distance, copied = None, None, -1, None
+        if near_duplicates_enabled():
+            with metrics.stage("near_dup"):
+                fp = fingerprint(normalized.get("Title"), normalized.get("Content"))
+                if fp is not None:
+                    index = get_near_duplicate_index()
+                    duplicate_of, sim_distance = index.check(fp, url, self.source_code)
+                    normalized.update(index.document_fields(fp))
+                    if duplicate_of is not None:
+                        copied = index.canonical_sentiment(duplicate_of)
 
         # Extract symbols and attach to ExtraJson when available
+        t0, c0 = time.perf_counter(), time.thread_time()
         try:
             symbols = extract_symbols_from_article(
                 title=normalized.get("Title") or "",
@@ -1148,187 +998,480 @@ class BaseNewsCrawler:
                 normalized["ExtraJson"] = _json.dumps(data, ensure_ascii=False)
         except Exception:
             pass
+        metrics.record("symbols", time.perf_counter() - t0, cpu=time.thread_time() - c0)
 
         # Evaluate breaking news and attach to ExtraJson
-        try:
-            import json as _json
-            title = normalized.get("Title") or ""
-            content = normalized.get("Content") or ""
-            pub = normalized.get("PublishedAt")
-            now = datetime.utcnow()
-            window_hours = int(os.getenv("BREAKING_TIME_WINDOW_HOURS", "2"))
-            threshold = float(os.getenv("BREAKING_SCORE_THRESHOLD", "0.6"))
-
-            tl = (title or "").lower()
-            cl = (content or "").lower()
-
-            score = 0.0
-            reasons = []
-            hard_event = False
-
-            # Freshness
-            try:
-                if pub:
-                    delta_sec = (now - pub).total_seconds()
-                    if delta_sec <= window_hours * 3600:
-                        score += 0.4
-                        reasons.append("fresh")
-            except Exception:
-                pass
-
-            # Keywords (title > content)
-            kw_title = [
-                "breaking", "just in", "urgent", "alert",
-                "surge", "plunge", "spike", "tumbles", "soars",
-                "hack", "exploit", "breach", "outage", "ban",
-                "approved", "approval", "denied", "denial", "etf", "sec"
-            ]
-            kw_content = [
-                "breaking", "just in", "urgent", "alert",
-                "surge", "plunge", "spike", "tumbles", "soars",
-                "price", "rally", "sell-off", "dump",
-                "hack", "exploit", "breach", "outage", "ban",
-                "approved", "approval", "denied", "denial", "etf", "sec"
-            ]
-            if any(k in tl for k in kw_title):
-                score += 0.4
-                reasons.append("keyword_title")
-            elif any(k in cl for k in kw_content):
-                score += 0.2
-                reasons.append("keyword_content")
-
-            # Percent move
+        with metrics.stage("breaking"):
             try:
-                import re as _re
-                perc = _re.search(r"(\d{1,3})\s?%", content or "")
-                if perc and any(w in cl for w in ["price", "rise", "drop", "surge", "plunge", "soar", "tumble"]):
-                    val = int(perc.group(1))
-                    if val >= 10:
-                        score += 0.4
-                    elif val >= 7:
-                        score += 0.3
-                    reasons.append("percent_move")
+                breaking = get_breaking_scorer().score(
+                    normalized.get("Title"), normalized.get("Content"), normalized.get("PublishedAt")
+                )
+                normalized["ExtraJson"] = merge_extra_json(normalized.get("ExtraJson"), breaking)
             except Exception:
                 pass
 
-            # Hard events (immediate breaking)
-            if any(x in cl for x in [
-                "halting withdrawals", "withdrawals halted", "withdrawals paused",
-                "exchange outage", "downtime", "service disruption",
-                "hack", "exploit", "security breach",
-                "sec approves", "sec approved", "etf approved", "etf approval",
-                "sec denies", "sec denied", "etf denied"
-            ]):
-                hard_event = True
-                reasons.append("hard_event")
-
-            is_breaking = (score >= threshold) or hard_event
-
-            # Merge to ExtraJson
-            try:
-                existing = normalized.get("ExtraJson")
-                data = _json.loads(existing) if existing else {}
-                if not isinstance(data, dict):
-                    data = {}
-            except Exception:
-                data = {}
-            data["isBreaking"] = bool(is_breaking)
-            data["breakingScore"] = float(round(score, 3))
-            if reasons:
-                data["breakingReasons"] = reasons
-            normalized["ExtraJson"] = _json.dumps(data, ensure_ascii=False)
-        except Exception:
-            pass
+        if duplicate_of is not None:
+            metrics.incr("near_duplicates")
+            normalized["ExtraJson"] = mark_duplicate(normalized.get("ExtraJson"), duplicate_of.canonical_url, sim_distance)
+        if copied is not None:
+            normalized.update(copied)
+        return normalized, index, copied is not None
 
-        sentiment_result = analyze_news_sentiment(
-            title=normalized.get("Title") or "",
-            content=normalized.get("Content") or "",
-            summary=normalized.get("Summary"),
-        )
+    def _apply_sentiment(self, url: str, normalized: Dict, sentiment_result: Dict, index) -> None:
         normalized["SentimentScore"] = sentiment_result["score"]
         normalized["SentimentLabel"] = sentiment_result["label"]
         normalized["SentimentModel"] = sentiment_model_name()
+        if index is not None:
+            index.set_sentiment(url, {k: normalized[k] for k in ("SentimentScore", "SentimentLabel", "SentimentModel")})
+
+    def save_article(self, url: str, cfg: Optional[Dict] = None, html: Optional[str] = None) -> None:
+        normalized = self.enrich_article(url, cfg, html=html)
+        if normalized is None:
+            return
+        self._store_article(url, normalized)
 
-        with db_session() as db:
-            src = get_source_by_code(db, self.source_code)
-            if not src:
-                print(f"Source '{self.source_code}' not found in NewsSources")
+    def _store_article(self, url: str, normalized: Dict) -> None:
+        metrics = self._metrics
+        source_id = self._source_id()
+        if source_id is None:
+            print(f"Source '{self.source_code}' not found in NewsSources")
+            return
+        label = normalized["SentimentLabel"].upper()
+        score = normalized["SentimentScore"]
+        index = get_near_duplicate_index() if near_duplicates_enabled() else None
+
+        def _on_saved(news_id) -> None:
+            if index is not None:
+                # Later copies may only point at articles that made it into the DB
+                if news_id is INSERT_FAILED:
+                    index.discard(url)
+                else:
+                    index.commit(url)
+            if news_id is INSERT_FAILED:
+                metrics.incr("write_failed")
+                with self._write_failures_lock:
+                    self._write_failures.add(url)
+                print(f"[Writer] Not saved, will retry: {url}")
                 return
-            news = db_save_article(db, src.Id, normalized)
-            if news:
-                print(
-                    f"Saved article: {news.Id} | Sentiment: "
-                    f"{sentiment_result['label'].upper()} ({sentiment_result['score']:.2f})"
-                )
+            if news_id is not None:
+                metrics.incr("saved")
+                print(f"Saved article: {news_id} | Sentiment: {label} ({score:.2f})")
             else:
-                print("Article already exists")
+                metrics.incr("duplicates")
+                print(f"Article already exists: {url}")
+            # Only once the URL is known to be in the DB
+            get_seen_urls(self.source_code).add(url)
+
+        # Buffered: written with the next bulk insert (size/time threshold or end of cycle)
+        get_article_writer().add(source_id, normalized, _on_saved)
+
+    def _take_write_failures(self, stats: CrawlStats, urls: Iterable[str]) -> None:
+        """Count the URLs of `urls` whose write failed as failed in `stats` (call after flushing the writer)."""
+        with self._write_failures_lock:
+            failed = [u for u in dict.fromkeys(urls) if u in self._write_failures]
+            self._write_failures.difference_update(failed)
+        if failed:
+            stats.failed += len(failed)
+            stats.processed -= len(failed)
+            stats.failed_urls.extend(failed)
+
+    def _run_articles(self, urls: List[str], cfg: Dict) -> CrawlStats:
+        """Fetch and save `urls`: staged pipeline when CRAWL_PIPELINE=1, else the crawl engine."""
+        if pipeline_enabled():
+            return self._run_pipeline(urls, cfg)
+
+        def _process(url: str, html: str) -> None:
+            print("Processing:", url)
+            self.save_article(url, cfg=cfg, html=html)
+
+        return CrawlEngine(metrics=self._metrics, source=self.source_code).run(urls, _process)
+
+    def _run_pipeline(self, urls: List[str], cfg: Dict) -> CrawlStats:
+        metas: Dict[str, Dict] = {}
+        if self._feed is not None:
+            for url in urls:
+                entry = self._feed.lookup(url)
+                if entry is not None:
+                    metas[url] = {k: v for k, v in vars(entry).items() if k != "link" and v}
+        # Each task carries its own URL's feed metadata (CrawlPipeline metas), not the whole batch's
+        extract = functools.partial(_extract_in_worker, type(self), cfg, cfg.get("list_url") or "")
+
+        def _enrich(batch: List[Tuple[str, Any]]) -> List[Any]:
+            items = []
+            for url, (raw, report) in batch:
+                self._merge_extract_report(report)
+                items.append((url, raw))
+            return self.enrich_batch(items)
+
+        def _store(docs: List[Tuple[str, Dict]]) -> None:
+            for url, normalized in docs:
+                self._store_article(url, normalized)
+
+        pipeline = CrawlPipeline(metrics=self._metrics, source=self.source_code)
+        stats = pipeline.run_stages(urls, extract, _enrich, _store, metas)
+        if pipeline.stats is not None:
+            print(pipeline.stats.log_line(self.source_code))
+        return stats
+
+    def _merge_extract_report(self, report: Dict) -> None:
+        """Add an extract worker's stage times, tier counter and tier CPU to this cycle."""
+        metrics = self._metrics
+        for stage, (seconds, calls, cpu) in report["stages"].items():
+            metrics.record(stage, seconds, calls=calls, cpu=cpu)
+        for name, n in report["counters"].items():
+            metrics.incr(name, n)
+        if report["pid"] != os.getpid():
+            # Tier stats are process-wide; a worker thread has already recorded into ours
+            tier = FAST if report["counters"].get(f"tier_{FAST}") else FULL
+            extract_cpu = (report["stages"].get("extract") or (0.0, 0, None))[2]
+            get_tier_stats().record(self.source_code, tier, extract_cpu or 0.0)
+
+    def _source_id(self):
+        """NewsSources id for this crawler, looked up once per instance."""
+        if self._source_id_cache is None:
+            with db_session() as db:
+                src = get_source_by_code(db, self.source_code)
+            if src is not None:
+                self._source_id_cache = src.Id
+        return self._source_id_cache
+
+    def _start_cycle(self, conditional_feed: bool = False) -> None:
+        """Drop the previous cycle's feed snapshot so the feed is downloaded exactly once.
+
+        `conditional_feed` enables ETag/Last-Modified/body-hash checks on the feed
+        so an unchanged feed short-circuits the cycle.
+        """
+        self._feed = None
+        self._feed_downloads = 0
+        self._conditional_feed = conditional_feed
+        self._metrics = CycleMetrics(self.source_code)
+        # Baseline for this source's share of the (process-wide) writer's insert time
+        try:
+            source_id = self._source_id()
+        except Exception:
+            source_id = None
+        if source_id is not None:
+            self._write_time_before = get_article_writer().write_time(source_id)
+
+    def _finish_cycle(self, stats: Optional[CrawlStats] = None) -> Dict:
+        """Close the cycle's metrics: counters from `stats`, store time from the writer, JSON report."""
+        metrics = self._metrics
+        if stats is not None:
+            metrics.incr("fetched", stats.fetched)
+            metrics.incr("skipped", stats.skipped)
+            metrics.incr("failed", stats.failed)
+            metrics.incr("short_circuited", stats.short_circuited)
+        source_id = self._source_id_cache
+        if source_id is not None:
+            seconds, writes = get_article_writer().write_time(source_id)
+            before = self._write_time_before
+            if writes > before[1]:
+                metrics.record("store", seconds - before[0], calls=writes - before[1])
+        tiers = get_tier_stats().log_line(self.source_code)
+        if tiers:
+            print(tiers)
+        breaker = get_circuit_breaker(self.source_code).snapshot()
+        if breaker["state"] != CLOSED or (stats is not None and stats.short_circuited):
+            print(
+                f"[Breaker] {self.source_code}: {breaker['state']}, {breaker['short_circuited']} fetches skipped, "
+                f"~{breaker['saved_seconds']:.0f}s saved (process-wide)"
+            )
+        return metrics.finish()
+
+    def _discover_new_urls(self) -> Optional[Tuple[dict, List[str], int]]:
+        """Discover URLs not yet processed: feed/list discovery, checkpoint, stored-URL dedup.
 
-    def crawl_latest_articles(self) -> None:
+        Returns (cfg, urls, skipped) or None when the feed is unchanged. The loaded
+        checkpoint is kept on the instance for `_advance_checkpoint`.
+        """
+        store = get_checkpoint_store() if checkpoints_enabled() else None
+        checkpoint = store.load(self.source_code) if store else None
+        self._checkpoint_store, self._checkpoint = store, checkpoint
+        if checkpoint is not None and checkpoint.list_url and self._conditional_feed:
+            # Validators survive restarts and are shared between workers
+            restore_feed_validators(checkpoint.list_url, checkpoint.validators())
         cfg = self.get_config()
         urls = self.get_urls(cfg)
         print(f"Found {len(urls)} article urls")
-        for url in urls:
-            print("Processing:", url)
-            try:
-                self.save_article(url)
-            except Exception as e:
-                print(f"[Article] Failed {url}: {e}")
+        feed = self._feed
+        if feed is not None and feed.unchanged:
+            since = f" since {checkpoint.updated_at:%Y-%m-%d %H:%M:%S}" if checkpoint and checkpoint.updated_at else ""
+            print(f"[Checkpoint] {self.source_code}: feed unchanged{since}, cycle skipped")
+            return None
+        if checkpoint is not None:
+            urls, below = store.filter_new(checkpoint, feed, urls)
+            self._metrics.incr("below_checkpoint", below)
+            if below:
+                print(
+                    f"[Checkpoint] {self.source_code}: {below} entries at or below high-water mark "
+                    f"{checkpoint.last_published_at}"
+                )
+        # Skip URLs stored in earlier cycles before doing any network/CPU work
+        urls, skipped = get_seen_urls(self.source_code).filter_unseen(urls)
+        print(f"[Dedup] {self.source_code}: {len(urls)} to fetch, {skipped} skipped (already stored)")
+        return cfg, urls, skipped
+
+    def _advance_checkpoint(self, failed_urls: List[str]) -> None:
+        feed = self._feed
+        if feed is not None and failed_urls:
+            # Re-download the feed next cycle so failed entries are retried
+            forget_feed_validators(feed.list_url)
+        if self._checkpoint_store is not None and self._checkpoint is not None:
+            validators = feed_validators(feed.list_url) if feed is not None else None
+            store = self._checkpoint_store
+            store.save(store.advance(self._checkpoint, feed, failed_urls, validators))
+
+    def crawl_latest_articles(self) -> CrawlStats:
+        self._start_cycle(conditional_feed=os.getenv("FEED_CONDITIONAL_GET", "1") == "1")
+        if get_circuit_breaker(self.source_code).is_open():
+            print(f"[Breaker] {self.source_code}: open, cycle skipped")
+            self._finish_cycle()
+            return CrawlStats()
+        # Model loads while the feed and the first articles are being fetched
+        warm_up_sentiment(background=True)
+        fetch_before = fetch_stats()
+        db_before = db_round_trips()
+        with self._metrics.stage("discover"):
+            discovered = self._discover_new_urls()
+        if discovered is None:
+            self._finish_cycle()
+            return CrawlStats()
+        cfg, urls, skipped = discovered
+        stats = self._run_articles(urls, cfg)
+        get_article_writer().flush()
+        self._take_write_failures(stats, urls)
+        stats.skipped = skipped
+        self._advance_checkpoint(stats.failed_urls)
+        print(
+            f"[Crawl] {self.source_code}: {stats.fetched} fetched, {stats.skipped} skipped, "
+            f"{stats.processed}/{stats.total} processed, {stats.failed} failed in {stats.elapsed:.1f}s "
+            f"({stats.articles_per_second:.2f} articles/s), feed downloads: {self._feed_downloads}"
+        )
+        net = stats_delta(fetch_before)
+        print(
+            f"[Fetch] {self.source_code}: {net['requests']} requests, {net['connections']} connections opened, "
+            f"{net['bytes_downloaded'] / 1024:.1f} KB downloaded, {net['not_modified']} not modified, "
+            f"{net['unchanged']} unchanged, {net['retries']} retries"
+        )
+        cache = get_sentiment_cache().snapshot()
+        print(
+            f"[Sentiment] cache: {cache['hit_rate']:.1%} hit rate "
+            f"({cache['memory_hits']} memory, {cache['db_hits']} db, {cache['misses']} misses, process-wide)"
+        )
+        db_after = db_round_trips()
+        if db_after:
+            trips = sum(db_after.values()) - sum(db_before.values())
+            print(
+                f"[DB] {self.source_code}: {trips} round-trips (process-wide) for {stats.processed} articles"
+                + (f" ({trips / stats.processed:.2f}/article)" if stats.processed else "")
+            )
+        self._finish_cycle(stats)
+        return stats
+
+    # ---------- Work-queue mode (app/scripts/crawl_worker.py) ----------
+    def enqueue_latest_articles(self, queue) -> int:
+        """Discover new URLs and add them to `queue` as article jobs.
+
+        RSS metadata travels with each job so the worker that processes it does
+        not download the feed again. Jobs are durable once enqueued, so the
+        checkpoint advances past every discovered entry.
+        """
+        self._start_cycle(conditional_feed=os.getenv("FEED_CONDITIONAL_GET", "1") == "1")
+        with self._metrics.stage("discover"):
+            discovered = self._discover_new_urls()
+        if discovered is None:
+            self._finish_cycle()
+            return 0
+        _, urls, _ = discovered
+        metas: Dict[str, Dict] = {}
+        if self._feed is not None:
+            for url in urls:
+                entry = self._feed.lookup(url)
+                if entry is not None:
+                    metas[url] = {k: v for k, v in vars(entry).items() if k != "link" and v}
+        added = queue.enqueue(self.source_code, urls, metas)
+        self._advance_checkpoint([])
+        print(f"[Queue] {self.source_code}: {added} new jobs ({len(urls) - added} already queued)")
+        self._finish_cycle()
+        return added
+
+    def process_jobs(self, queue, jobs) -> CrawlStats:
+        """Fetch and save leased article jobs, then complete or fail each one."""
+        self._start_cycle()
+        cfg = self.get_config()
+        list_url = cfg.get("list_url") or ""
+        # Rebuild the feed lookups from the metadata carried by the jobs
+        self._feed = FeedSnapshot(list_url, entries=[FeedEntry(link=job.url, **job.meta) for job in jobs])
+        # Keep the leases alive until every job is completed or failed
+        with LeaseKeeper(queue, jobs) as keeper:
+            stats = self._run_articles([job.url for job in jobs], cfg)
+            get_article_writer().flush()
+            self._take_write_failures(stats, [job.url for job in jobs])
+        failed = set(stats.failed_urls)
+        for job in jobs:
+            if job.id in keeper.lost:
+                continue
+            ok = queue.fail(job, "fetch or processing failed") if job.url in failed else queue.complete(job)
+            if not ok:
+                print(f"[Queue] Lease lost for {job.url} (expired and taken over)")
+        self._finish_cycle(stats)
+        return stats
+
+    # ---------- Historical backfill (app/core/backfill.py) ----------
+    def _filter_article_urls(self, urls: List[str], cfg: Dict) -> List[str]:
+        """Keep this site's URLs that pass the config's include/exclude patterns."""
+        host = urlparse(self.base_url).netloc.replace("www.", "")
+        include = cfg.get("feed_include_patterns") or []
+        exclude = cfg.get("feed_exclude_patterns") or []
+        kept = []
+        for u in urls:
+            if urlparse(u).netloc.replace("www.", "") != host:
+                continue
+            if include and not any(p and p in u for p in include):
+                continue
+            if exclude and any(p and p in u for p in exclude):
+                continue
+            kept.append(u)
+        return kept
 
-    def crawl_by_date_range(self, start: datetime, end: datetime) -> None:
-        """Crawl articles within a specific [start, end] datetime range.
+    def _archive_links(self, page_url: str, html: str, cfg: Dict) -> List[str]:
+        """Article links of an archive page: "archive_link_selector" / "list_link_selector", else path heuristics."""
+        soup = BeautifulSoup(html, "lxml")
+        selector = cfg.get("archive_link_selector") or cfg.get("list_link_selector")
+        anchors = soup.select(selector) if selector else soup.find_all("a", href=True)
+        urls = []
+        for a in anchors:
+            href = a.get("href")
+            if not href:
+                continue
+            full_url = urljoin(page_url, href)
+            if selector or any(seg in full_url for seg in ["/news/", "/markets/", "/business/", "/policy/", "/tech/"]):
+                urls.append(full_url.split("#")[0])
+        return list(dict.fromkeys(urls))
+
+    def discover_range_urls(self, cfg: Dict, start: datetime, end: datetime) -> Dict[str, datetime]:
+        """Article URLs published in [start, end] with their (approximate) date, from sitemaps and archive pages."""
+        sitemaps = SitemapDiscovery(fetch_bytes)
+        dated = sitemaps.discover(sitemaps.roots(self.base_url, cfg.get("sitemap_urls")), start, end)
+        st = sitemaps.stats
+        print(
+            f"[Backfill] {self.source_code}: {st['sitemaps']} sitemaps read, {st['pruned']} skipped as out of range, "
+            f"{st['in_range']}/{st['entries']} entries in range ({st['undated']} undated)"
+        )
+        template = cfg.get("archive_url")
+        if template:
+            before = len(dated)
+            for page_url, day in archive_pages(template, start, end):
+                try:
+                    links = self._archive_links(page_url, fetch_html(page_url), cfg)
+                except Exception as e:
+                    print(f"[Backfill] Archive page {page_url} failed: {e}")
+                    continue
+                for url in links:
+                    dated.setdefault(url, max(day, start))
+            print(f"[Backfill] {self.source_code}: {len(dated) - before} more URLs from archive pages")
+        keep = set(self._filter_article_urls(list(dated), cfg))
+        return {url: dt for url, dt in dated.items() if url in keep}
+
+    def _backfill_chunk(self, chunk, cfg: Dict, progress) -> Tuple[CrawlStats, int]:
+        """Crawl one chunk's URLs not stored yet, then record the chunk's progress."""
+        urls, skipped = get_seen_urls(self.source_code).filter_unseen(chunk.urls)
+        stats = self._run_articles(urls, cfg)
+        # Progress only counts once the chunk's articles are in the DB
+        get_article_writer().flush()
+        self._take_write_failures(stats, urls)
+        progress.record(
+            self.source_code,
+            chunk,
+            {"urls": len(chunk.urls), "skipped": skipped, "processed": stats.processed, "failed": stats.failed},
+        )
+        print(
+            f"[Backfill] {self.source_code} {chunk.start:%Y-%m-%d %H:%M} -> {chunk.end:%Y-%m-%d %H:%M}: "
+            f"{len(chunk.urls)} urls, {skipped} already stored, {stats.processed} processed, "
+            f"{stats.failed} failed in {stats.elapsed:.1f}s"
+        )
+        return stats, skipped
 
-        Default behavior:
-        - Let `get_urls` discover candidate URLs (subclasses may honor the range).
-        - Extract each article and save only when `published_at` falls in range.
+    def crawl_by_date_range(
+        self,
+        start: datetime,
+        end: datetime,
+        chunk_hours: Optional[float] = None,
+        parallel: Optional[int] = None,
+        resume: bool = True,
+    ) -> Dict:
+        """Backfill the articles published in [start, end] (naive datetimes are UTC).
+
+        URLs come from the site's sitemaps and archive pages (see
+        app/core/backfill.py), not the feed. The range is crawled in chunks,
+        `parallel` chunks at a time; finished chunks are recorded and skipped
+        when the same range is backfilled again (unless `resume` is False).
+        Returns a summary with the backfill rate in articles per hour.
         """
+        if start.tzinfo is not None:
+            start = start.astimezone(timezone.utc).replace(tzinfo=None)
+        if end.tzinfo is not None:
+            end = end.astimezone(timezone.utc).replace(tzinfo=None)
         if start > end:
             raise ValueError("start must be <= end")
 
-        # Let subclasses optionally optimize URL discovery for ranges
-        self._date_range: Tuple[datetime, datetime] = (start, end)  # type: ignore[assignment]
+        self._start_cycle()
+        warm_up_sentiment(background=True)
+        t0 = time.perf_counter()
+        cfg = self.get_config()
+        # Old articles have left the feed: extraction must not download it for metadata
+        self._feed = FeedSnapshot(cfg.get("list_url") or "", entries=[])
+        with self._metrics.stage("discover"):
+            dated = self.discover_range_urls(cfg, start, end)
+        chunks = date_chunks(start, end, chunk_hours)
+        assign_urls(chunks, dated)
+        progress = get_backfill_progress()
+        if not resume:
+            progress.clear(self.source_code)
+        done = progress.done(self.source_code, chunks)
+        todo = [c for c in chunks if c.key not in done]
+        print(
+            f"[Backfill] {self.source_code}: {len(dated)} urls in {len(chunks)} chunks for {start} -> {end}, "
+            f"{len(chunks) - len(todo)} chunks already done"
+        )
+
+        total = CrawlStats()
+        skipped = 0
+        self._date_range = (start, end)
         try:
-            cfg = self.get_config()
-            urls = self.get_urls(cfg)
+            with ThreadPoolExecutor(max_workers=parallel or backfill_parallel(), thread_name_prefix="backfill") as pool:
+                for stats, chunk_skipped in pool.map(lambda c: self._backfill_chunk(c, cfg, progress), todo):
+                    skipped += chunk_skipped
+                    for name in ("total", "fetched", "processed", "failed", "short_circuited"):
+                        setattr(total, name, getattr(total, name) + getattr(stats, name))
+                    total.failed_urls += stats.failed_urls
         finally:
-            # Clean up the hint attribute to avoid side effects on future calls
-            if hasattr(self, "_date_range"):
-                delattr(self, "_date_range")
-
-        print(f"Found {len(urls)} candidate urls for range {start} -> {end}")
-        kept = 0
-        for url in urls:
-            print("Processing:", url)
-            raw = self.extract_article(url, self.get_config())
-            pub = raw.get("published_at")
-            if isinstance(pub, str):
-                try:
-                    pub = dateparser.parse(pub)
-                except Exception:
-                    pub = None
-            if not pub or not isinstance(pub, datetime):
-                continue
-            if start <= pub <= end:
-                # persist via normal pipeline
-                normalized = normalize_article(raw, self.source_code, url)
-                sentiment_result = analyze_news_sentiment(
-                    title=normalized.get("Title") or "",
-                    content=normalized.get("Content") or "",
-                    summary=normalized.get("Summary"),
-                )
-                normalized["SentimentScore"] = sentiment_result["score"]
-                normalized["SentimentLabel"] = sentiment_result["label"]
-                normalized["SentimentModel"] = sentiment_model_name()
-
-                with db_session() as db:
-                    src = get_source_by_code(db, self.source_code)
-                    if not src:
-                        print(f"Source '{self.source_code}' not found in NewsSources")
-                        continue
-                    news = db_save_article(db, src.Id, normalized)
-                    if news:
-                        kept += 1
-                        print(
-                            f"Saved article: {news.Id} | Sentiment: "
-                            f"{sentiment_result['label'].upper()} ({sentiment_result['score']:.2f})"
-                        )
-        print(f"Done. Saved {kept} articles in range.")
+            self._date_range = None
+        total.skipped = skipped
+        total.elapsed = time.perf_counter() - t0
+        counters = self._metrics.counters
+        saved = counters.get("saved", 0)
+        hours = total.elapsed / 3600
+        summary = {
+            "source": self.source_code,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "chunks": len(chunks),
+            "chunks_resumed": len(chunks) - len(todo),
+            "urls": len(dated),
+            "already_stored": skipped,
+            "fetched": total.fetched,
+            "saved": saved,
+            "duplicates": counters.get("duplicates", 0),
+            "out_of_range": counters.get("out_of_range", 0),
+            "failed": total.failed,
+            "elapsed_s": round(total.elapsed, 1),
+            "articles_per_hour": round(saved / hours, 1) if hours > 0 else 0.0,
+        }
+        print(
+            f"[Backfill] {self.source_code}: {summary['saved']} saved, {skipped} already stored, "
+            f"{summary['out_of_range']} out of range, {total.failed} failed in {total.elapsed / 60:.1f} min "
+            f"({summary['articles_per_hour']:.0f} articles/hour)"
+        )
+        self._finish_cycle(total)
+        return summary
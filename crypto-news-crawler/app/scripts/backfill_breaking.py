@@ -0,0 +1,200 @@
+"""
+Rescore breaking news for articles already stored in MongoDB.
+
+Use after changing BREAKING_SCORE_THRESHOLD / BREAKING_TIME_WINDOW_HOURS or the
+rules in app/services/breaking_news.py. News is read in _id order in chunks
+(Title, Content, PublishedAt, ExtraJson only), chunks are scored in parallel
+worker processes, and changed ExtraJson values are written back with one
+unordered bulk `$set` per chunk.
+
+Freshness is measured against when the article was stored (the ObjectId
+timestamp of _id, i.e. crawl time), so "fresh" means the same thing it did when
+the crawler scored it. Use --reference now to measure against the current time.
+
+Usage examples:
+    python -m app.scripts.backfill_breaking --dry-run
+    python -m app.scripts.backfill_breaking --threshold 0.7 --workers 4
+    python -m app.scripts.backfill_breaking --source coindesk --limit 5000
+
+Env vars:
+- MONGO_URI, MONGO_DB_NAME      # see app/core/storage.py
+- BREAKING_TIME_WINDOW_HOURS    # default for --window-hours
+- BREAKING_SCORE_THRESHOLD      # default for --threshold
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.services.breaking_news import BreakingNewsScorer, merge_extra_json
+
+_worker_scorer: Optional[BreakingNewsScorer] = None
+
+
+def _init_worker(window_hours: float, threshold: float) -> None:
+    global _worker_scorer
+    _worker_scorer = BreakingNewsScorer(window_hours=window_hours, threshold=threshold)
+
+
+def _reference_time(doc: Dict, reference: str, now: datetime) -> datetime:
+    if reference == "inserted":
+        gen = getattr(doc.get("_id"), "generation_time", None)
+        if gen is not None:
+            return gen.astimezone(timezone.utc).replace(tzinfo=None)
+    return now
+
+
+def _was_breaking(extra_json: Optional[str]) -> bool:
+    try:
+        data = json.loads(extra_json) if extra_json else {}
+        return isinstance(data, dict) and bool(data.get("isBreaking"))
+    except Exception:
+        return False
+
+
+def score_chunk(docs: List[Dict], reference: str, now: datetime) -> Tuple[List[Tuple[object, str]], int, int]:
+    """Score one chunk (runs in a worker process, no DB access).
+
+    Returns ([(_id, new ExtraJson) for changed docs], newly breaking, no longer breaking).
+    """
+    scorer = _worker_scorer or BreakingNewsScorer()
+    changed = []
+    promoted = demoted = 0
+    for doc in docs:
+        result = scorer.score(
+            doc.get("Title"), doc.get("Content"), doc.get("PublishedAt"),
+            now=_reference_time(doc, reference, now),
+        )
+        old = doc.get("ExtraJson")
+        new = merge_extra_json(old, result)
+        if new == old:
+            continue
+        changed.append((doc["_id"], new))
+        before = _was_breaking(old)
+        if result.is_breaking and not before:
+            promoted += 1
+        elif before and not result.is_breaking:
+            demoted += 1
+    return changed, promoted, demoted
+
+
+def _chunks(cursor, size: int):
+    chunk = []
+    for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def backfill(
+    threshold: float,
+    window_hours: float,
+    chunk_size: int = 1000,
+    workers: int = 4,
+    reference: str = "inserted",
+    source: Optional[str] = None,
+    limit: int = 0,
+    dry_run: bool = False,
+) -> Dict[str, float]:
+    from pymongo import UpdateOne
+
+    from app.core.storage import BACKEND, db_session, get_source_by_code
+
+    if BACKEND != "mongo":
+        raise SystemExit("backfill_breaking supports DB_BACKEND=mongo only")
+
+    stats = {"scanned": 0, "changed": 0, "promoted": 0, "demoted": 0, "written": 0}
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    with db_session() as db:
+        query: Dict = {}
+        if source:
+            src = get_source_by_code(db, source)
+            if not src:
+                raise SystemExit(f"Source '{source}' not found in NewsSources")
+            query["SourceId"] = src.Id
+        projection = {"Title": 1, "Content": 1, "PublishedAt": 1, "ExtraJson": 1}
+        cursor = db.News.find(query, projection).sort("_id", 1).batch_size(chunk_size)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        def apply(result) -> None:
+            changed, promoted, demoted = result
+            stats["changed"] += len(changed)
+            stats["promoted"] += promoted
+            stats["demoted"] += demoted
+            if changed and not dry_run:
+                ops = [UpdateOne({"_id": _id}, {"$set": {"ExtraJson": extra}}) for _id, extra in changed]
+                res = db.News.bulk_write(ops, ordered=False)
+                stats["written"] += res.modified_count
+
+        if workers <= 1:
+            _init_worker(window_hours, threshold)
+            for chunk in _chunks(cursor, chunk_size):
+                stats["scanned"] += len(chunk)
+                apply(score_chunk(chunk, reference, now))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(window_hours, threshold)
+            ) as pool:
+                pending = []
+                for chunk in _chunks(cursor, chunk_size):
+                    stats["scanned"] += len(chunk)
+                    pending.append(pool.submit(score_chunk, chunk, reference, now))
+                    # Keep a bounded number of chunks in flight; write results in order
+                    while len(pending) >= workers * 2:
+                        apply(pending.pop(0).result())
+                for fut in pending:
+                    apply(fut.result())
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["docs_per_sec"] = round(stats["scanned"] / elapsed, 1) if elapsed > 0 else 0.0
+    return stats
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Rescore breaking news for stored articles")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BREAKING_SCORE_THRESHOLD", "0.6")))
+    parser.add_argument("--window-hours", type=float, default=float(os.getenv("BREAKING_TIME_WINDOW_HOURS", "2")))
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Documents per chunk / bulk write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scoring processes (1 = inline)")
+    parser.add_argument(
+        "--reference", choices=["inserted", "now"], default="inserted",
+        help="Freshness reference: crawl time from _id (default) or the current time",
+    )
+    parser.add_argument("--source", help="Only rescore articles from this source code")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after N articles (0 = all)")
+    parser.add_argument("--dry-run", action="store_true", help="Score and report without writing")
+    args = parser.parse_args()
+
+    stats = backfill(
+        threshold=args.threshold,
+        window_hours=args.window_hours,
+        chunk_size=max(1, args.chunk_size),
+        workers=max(1, args.workers),
+        reference=args.reference,
+        source=args.source,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    )
+    mode = "dry run" if args.dry_run else "written"
+    print(
+        f"[Backfill] scanned={stats['scanned']} changed={stats['changed']} ({mode}: {stats['written']}) "
+        f"+breaking={stats['promoted']} -breaking={stats['demoted']} "
+        f"in {stats['seconds']}s ({stats['docs_per_sec']} docs/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Backfill historical articles of a date range (see app/core/backfill.py).
+
+URLs are discovered from each source's sitemaps (and archive pages when the
+config has an "archive_url"), the range is crawled in chunks, several chunks
+at a time, and finished chunks are recorded in the `BackfillProgress`
+collection: running the same command again after an interruption resumes with
+the unfinished chunks. Articles already stored are never fetched again.
+
+Each source ends with a "[Backfill] ..." line and a summary with the backfill
+rate in articles per hour.
+
+Usage examples:
+    python -m app.scripts.backfill_range --start 2025-09-01 --end 2025-09-30
+    python -m app.scripts.backfill_range --sources coindesk decrypt --start 2025-09-01 --end 2025-09-30 --parallel 4
+    python -m app.scripts.backfill_range --sources cnbc --start 2025-09-01 --end 2025-09-07 --chunk-hours 6 --restart
+
+Dates are UTC; an --end without a time covers the whole day.
+
+Env vars:
+- BACKFILL_CHUNK_HOURS, BACKFILL_PARALLEL   # defaults for --chunk-hours / --parallel
+- HOST_RATE_LIMIT, CRAWL_CONCURRENCY        # fetch limits, as for regular crawls
+"""
+
+import argparse
+import json
+import re
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+from app.core.dates import parse_date
+from app.scripts.run_all_crawlers import AVAILABLE
+
+
+_DATE_ONLY_RE = re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$")
+
+
+def _parse_day(value: str, end: bool = False) -> datetime:
+    dt = parse_date(value)
+    if dt is None:
+        raise argparse.ArgumentTypeError(f"invalid date: {value}")
+    # A bare day as --end means the whole day; anything with a time is taken as given
+    if end and _DATE_ONLY_RE.match(value.strip()):
+        dt = dt + timedelta(days=1) - timedelta(seconds=1)
+    return dt
+
+
+def main():
+    try:
+        load_dotenv()
+    except Exception:
+        pass
+    parser = argparse.ArgumentParser(description="Backfill articles of a date range")
+    parser.add_argument("--sources", nargs="*", default=list(AVAILABLE.keys()), help="Sources to backfill (default: all)")
+    parser.add_argument("--start", required=True, type=_parse_day, help="First day (UTC), e.g. 2025-09-01")
+    parser.add_argument("--end", required=True, type=lambda v: _parse_day(v, end=True), help="Last day (UTC), inclusive")
+    parser.add_argument("--chunk-hours", type=float, default=None, help="Chunk size in hours (BACKFILL_CHUNK_HOURS)")
+    parser.add_argument("--parallel", type=int, default=None, help="Chunks crawled at once (BACKFILL_PARALLEL)")
+    parser.add_argument("--restart", action="store_true", help="Forget recorded progress and crawl every chunk")
+    args = parser.parse_args()
+
+    summaries = []
+    for code in args.sources:
+        cls = AVAILABLE.get(code)
+        if not cls:
+            print(f"Unknown source: {code}")
+            continue
+        print(f"\n=== Backfilling {code}: {args.start} -> {args.end} ===")
+        try:
+            summaries.append(
+                cls().crawl_by_date_range(
+                    args.start,
+                    args.end,
+                    chunk_hours=args.chunk_hours,
+                    parallel=args.parallel,
+                    resume=not args.restart,
+                )
+            )
+        except Exception as e:
+            print(f"[Backfill] {code} failed: {e}")
+    for summary in summaries:
+        print(json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Crawler worker for the shared work queue (app/core/work_queue.py).
+
+Start any number of workers, on one or several machines, against the same
+MongoDB. They split the work without duplicates:
+- discovery: one worker at a time leases a source's discovery job, reads the
+  feed and enqueues new article URLs (one job per URL), then re-arms the job
+  for the source's next poll (NewsSources.Config.frequency, clamped to
+  SCHED_MIN_INTERVAL..SCHED_MAX_INTERVAL, or --interval);
+- articles: workers lease batches of URL jobs, fetch/extract/score/store them
+  and mark each done; failures are retried with backoff and dead-lettered
+  after QUEUE_MAX_ATTEMPTS.
+Leases are renewed every QUEUE_HEARTBEAT_SECONDS while a job is being
+worked on, so slow batches keep their jobs.
+
+Usage examples:
+    python -m app.scripts.crawl_worker
+    python -m app.scripts.crawl_worker --sources coindesk decrypt --batch 16
+    python -m app.scripts.crawl_worker --drain        # stop when no work is left
+
+Env vars:
+- QUEUE_LEASE_BATCH (default 8)   # article jobs leased at a time (--batch)
+- QUEUE_* in app/core/work_queue.py and the crawler settings listed in
+  app/scripts/run_all_crawlers.py
+"""
+
+import argparse
+import os
+import socket
+import time
+import uuid
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+from app.core.scheduler import clamp_interval, frequency_seconds, load_source_frequencies
+from app.core.work_queue import ARTICLE, DISCOVER, LeaseKeeper, get_work_queue
+from app.scripts.run_all_crawlers import AVAILABLE
+
+
+class CrawlWorker:
+    def __init__(self, sources: List[str], batch: int = 8, interval: float = 0, idle_sleep: float = 2.0) -> None:
+        self.sources = [c for c in sources if c in AVAILABLE]
+        for code in sources:
+            if code not in AVAILABLE:
+                print(f"Unknown source: {code}")
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.batch = max(1, batch)
+        self.idle_sleep = idle_sleep
+        self.queue = get_work_queue()
+        self.crawlers = {code: AVAILABLE[code]() for code in self.sources}
+        freqs = load_source_frequencies(self.sources)
+        self.poll_seconds: Dict[str, float] = {
+            code: interval or clamp_interval(frequency_seconds(freqs.get(code)) or 300.0) for code in self.sources
+        }
+        self.stats = {"discoveries": 0, "enqueued": 0, "processed": 0, "failed": 0}
+        self.queue.ensure_discovery(self.sources)
+
+    def discover_once(self) -> bool:
+        jobs = self.queue.lease(self.worker_id, kind=DISCOVER, sources=self.sources, limit=1)
+        for job in jobs:
+            print(f"\n=== [{self.worker_id}] Discovering: {job.source} ===")
+            try:
+                with LeaseKeeper(self.queue, [job]) as keeper:
+                    self.stats["enqueued"] += self.crawlers[job.source].enqueue_latest_articles(self.queue)
+                self.stats["discoveries"] += 1
+                if job.id not in keeper.lost:
+                    self.queue.complete(job, rearm_after=self.poll_seconds[job.source])
+            except Exception as e:
+                print(f"[Worker] Discovery failed for {job.source}: {e}")
+                # Discovery is periodic: retry later instead of dead-lettering the source
+                self.queue.complete(job, rearm_after=self.queue.backoff(job.attempts))
+        return bool(jobs)
+
+    def process_once(self) -> bool:
+        jobs = self.queue.lease(self.worker_id, kind=ARTICLE, sources=self.sources, limit=self.batch)
+        by_source: Dict[str, list] = {}
+        for job in jobs:
+            by_source.setdefault(job.source, []).append(job)
+        for code, group in by_source.items():
+            try:
+                stats = self.crawlers[code].process_jobs(self.queue, group)
+                self.stats["processed"] += stats.processed
+                self.stats["failed"] += stats.failed
+            except Exception as e:
+                print(f"[Worker] Batch failed for {code}: {e}")
+                for job in group:
+                    self.queue.fail(job, str(e))
+        return bool(jobs)
+
+    def run(self, drain: bool = False, max_seconds: float = 0) -> Dict[str, int]:
+        started = time.time()
+        last_report = started
+        try:
+            while True:
+                busy = self.discover_once()
+                busy = self.process_once() or busy
+                now = time.time()
+                if now - last_report >= 60:
+                    self.queue.reap()
+                    print(f"[Worker] {self.worker_id}: {self.stats} queue={self.queue.counts()}")
+                    last_report = now
+                if max_seconds and now - started >= max_seconds:
+                    break
+                if not busy:
+                    if drain and self.queue.idle(self.sources):
+                        break
+                    time.sleep(self.idle_sleep)
+        except KeyboardInterrupt:
+            print("\nStopping worker (Ctrl+C)")
+        elapsed = time.time() - started
+        rate = self.stats["processed"] / elapsed if elapsed > 0 else 0.0
+        print(f"[Worker] {self.worker_id}: {self.stats} in {elapsed:.1f}s ({rate:.2f} articles/s)")
+        return self.stats
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Crawler worker for the shared work queue")
+    parser.add_argument("--sources", nargs="*", default=list(AVAILABLE.keys()), help="Sources this worker serves")
+    parser.add_argument("--batch", type=int, default=int(os.getenv("QUEUE_LEASE_BATCH", "8")), help="Article jobs per lease")
+    parser.add_argument("--interval", type=float, default=0, help="Discovery interval per source (default: source frequency)")
+    parser.add_argument("--drain", action="store_true", help="Exit when there is no due work")
+    parser.add_argument("--max-seconds", type=float, default=0, help="Stop after N seconds (0 = run forever)")
+    args = parser.parse_args()
+    CrawlWorker(args.sources, batch=args.batch, interval=args.interval).run(drain=args.drain, max_seconds=args.max_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,53 @@
 Run all news crawlers in one go.
 
 Usage examples:
-- Default (run all enabled sources sequentially):
+- Default (run all sources once, concurrently):
     python -m app.scripts.run_all_crawlers
 
+- Old behaviour (one source after another):
+    python -m app.scripts.run_all_crawlers --sequential
+
 - Specify sources explicitly (coindesk, cointelegraph, decrypt):
     python -m app.scripts.run_all_crawlers --sources coindesk cointelegraph decrypt
 
-- Run continuously every minute (graceful Ctrl+C to stop):
+- Run continuously (graceful Ctrl+C to stop). Each source is polled on its own
+  schedule derived from NewsSources.Config.frequency and its observed new-item
+  rate (see app/core/scheduler.py); --interval is the fastest allowed poll:
     python -m app.scripts.run_all_crawlers --watch --interval 60
 
-- Limit to N cycles while watching (useful for testing):
+- Limit to N runs per source while watching (useful for testing):
     python -m app.scripts.run_all_crawlers --watch --interval 60 --max-runs 2
 
+Only one run_all_crawlers process should run at a time. To split the work
+across several processes or machines use the queue-based worker instead:
+    python -m app.scripts.crawl_worker
+
 Environment flags:
 - SKIP_AI_CONFIG=1       # skip AI config generation, use defaults/cache
+- CRAWLER_CONFIG_RECHECK_SECONDS=5 # how often the cached config checks its *_config_cache.json mtime
 - ENABLE_RENDERED_FETCH=1 # enable Playwright-rendered HTML (slower)
+- RENDER_POOL_SIZE=4       # reusable browser contexts for rendered fetches
+- RENDER_RECYCLE_PAGES=200 # relaunch Chromium after N rendered pages
 - OLLAMA_URL, OLLAMA_MODEL # configure local Ollama if using AI config
+- CRAWL_CONCURRENCY=8     # max in-flight article fetches per crawler
+- CRAWL_PER_HOST_LIMIT=4  # max in-flight article fetches per host
+- CRAWL_WORKERS=4         # worker threads for extraction/sentiment/storage
+- CRAWL_PIPELINE=1        # staged fetch/extract/enrich/store pipeline with bounded queues (app/core/crawl_pipeline.py)
+- CRAWL_EXTRACT_PROCESSES=4, CRAWL_QUEUE_SIZE=32, CRAWL_ENRICH_BATCH=8 # pipeline extract processes, queue capacity, sentiment batch
+- HOST_RATE_LIMIT=4, HOST_BURST=8 # per-host token bucket for all fetches (0 = unlimited)
+- FETCH_RETRIES=2, FETCH_CONNECT_TIMEOUT=5 # jittered backoff on connect errors/429/5xx, Retry-After honoured
+- BREAKER_FAILURES=5, BREAKER_COOLDOWN_SECONDS=300 # per-source circuit breaker for article fetches
+- CRAWL_CHECKPOINTS=1     # per-source high-water marks in Mongo (CrawlCheckpoints)
+- CRAWL_REPORT_FILE=path  # append a JSON stage/counter report per crawl cycle
+- CRAWL_METRICS_FILE=path # Prometheus textfile with per-source totals (served at /metrics)
+- FAST_EXTRACT=1          # selector fast path before trafilatura (0 = trafilatura only)
+- NEAR_DUP=1              # SimHash near-duplicates across sources reuse the canonical's sentiment
+- FETCH_ARCHIVE_MODE=record|replay, FETCH_ARCHIVE_DIR=path # record responses / crawl offline from them
 Env-based scheduling:
 - CRAWL_WATCH=1            # enable continuous watch mode
-- CRAWL_INTERVAL_SECONDS=60 # interval between runs when watching
+- CRAWL_INTERVAL_SECONDS=60 # fastest poll interval per source when watching
+- SCHED_MAX_INTERVAL=3600   # slowest poll interval for quiet sources
+- SCHED_STATUS_FILE=path    # JSON with per-source next run / lag, rewritten after every run
 """
 
 import argparse
@@ -28,6 +56,8 @@ import os
 import time
 from dotenv import load_dotenv
 
+from app.core.scheduler import SourceScheduler, load_source_frequencies
+
 from app.crawlers.coindesk_crawler import CoindeskCrawler
 from app.crawlers.cointelegraph_crawler import CointelegraphCrawler
 from app.crawlers.decrypt import DecryptCrawler
@@ -54,6 +84,22 @@ def run_source(code: str) -> None:
         print(f"[Runner] Crawler '{code}' failed: {e}")
 
 
+def build_scheduler(sources, min_interval=None) -> SourceScheduler:
+    codes = []
+    for code in sources:
+        if code in AVAILABLE:
+            codes.append(code)
+        else:
+            print(f"Unknown source: {code}")
+    # One crawler instance per source, reused across runs (keeps config + feed validators)
+    crawlers = {code: AVAILABLE[code]() for code in codes}
+    return SourceScheduler(
+        runners={code: crawlers[code].crawl_latest_articles for code in codes},
+        frequencies=load_source_frequencies(codes),
+        min_interval=min_interval,
+    )
+
+
 def main():
     # Load .env so env vars like CRAWL_INTERVAL_SECONDS are available
     try:
@@ -76,13 +122,18 @@ def main():
         "--interval",
         type=int,
         default=None,
-        help="Interval in seconds between runs when using --watch (CLI > env)",
+        help="Fastest poll interval in seconds per source when using --watch (CLI > env)",
     )
     parser.add_argument(
         "--max-runs",
         type=int,
         default=0,
-        help="Maximum number of cycles to run when watching (0 = unlimited)",
+        help="Maximum number of runs per source when watching (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run sources one after another instead of concurrently",
     )
     args = parser.parse_args()
 
@@ -105,25 +156,40 @@ def main():
         )
         interval = max(1, interval)
         max_runs = int(args.max_runs or 0)
-        run_count = 0
-        print(f"\nWatching: running every {interval} seconds; max_runs={max_runs or '∞'}")
+        if args.sequential:
+            run_count = 0
+            print(f"\nWatching: running every {interval} seconds; max_runs={max_runs or '∞'}")
+            try:
+                while True:
+                    start_ts = time.strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"\n=== Cycle start: {start_ts} ===")
+                    for src in args.sources:
+                        run_source(src)
+                    run_count += 1
+                    if max_runs and run_count >= max_runs:
+                        print("Reached max runs; exiting watch loop.")
+                        break
+                    print(f"Sleeping {interval}s until next cycle...")
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                print("\nInterrupted by user (Ctrl+C). Exiting.")
+            return
+        scheduler = build_scheduler(args.sources, min_interval=interval)
+        print(f"\nWatching: adaptive per-source schedule (min interval {interval}s); max_runs={max_runs or '∞'}")
+        scheduler.print_status()
         try:
-            while True:
-                start_ts = time.strftime("%Y-%m-%d %H:%M:%S")
-                print(f"\n=== Cycle start: {start_ts} ===")
-                for src in args.sources:
-                    run_source(src)
-                run_count += 1
-                if max_runs and run_count >= max_runs:
-                    print("Reached max runs; exiting watch loop.")
-                    break
-                print(f"Sleeping {interval}s until next cycle...")
-                time.sleep(interval)
+            scheduler.run(max_runs=max_runs)
         except KeyboardInterrupt:
-            print("\nInterrupted by user (Ctrl+C). Exiting.")
-    else:
+            print("\nInterrupted by user (Ctrl+C). Waiting for running sources, then exiting.")
+            scheduler.stop()
+        scheduler.print_status()
+    elif args.sequential:
         for src in args.sources:
             run_source(src)
+    else:
+        scheduler = build_scheduler(args.sources)
+        scheduler.run_once()
+        scheduler.print_status()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+"""
+app/services/breaking_news.py
+
+Breaking-news scoring.
+
+Rules (unchanged from the crawler's inline heuristic):
+- fresh: published within BREAKING_TIME_WINDOW_HOURS of the reference time    +0.4
+- keyword in title                                                          +0.4
+  else keyword in content                                                   +0.2
+- first "NN%" in content together with a price-move word: >=10% +0.4, >=7% +0.3
+- hard event phrase in content (hack, withdrawals halted, ETF approved, ...) => breaking
+- breaking when score >= BREAKING_SCORE_THRESHOLD or a hard event was found
+
+Keyword tables and the percent pattern are built once per scorer instead of
+per article. Content literals are deduplicated across rules and each carries
+every rule it satisfies, so one scan over the table decides all rules and stops
+as soon as they are all settled. Plain substring checks are kept (rather than a
+regex alternation) because CPython's `in` is several times faster than `re`
+on these lists and they keep the old `k in text` semantics exactly.
+
+Env vars:
+- BREAKING_TIME_WINDOW_HOURS (default 2)
+- BREAKING_SCORE_THRESHOLD (default 0.6)
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+KW_TITLE = [
+    "breaking", "just in", "urgent", "alert",
+    "surge", "plunge", "spike", "tumbles", "soars",
+    "hack", "exploit", "breach", "outage", "ban",
+    "approved", "approval", "denied", "denial", "etf", "sec"
+]
+KW_CONTENT = [
+    "breaking", "just in", "urgent", "alert",
+    "surge", "plunge", "spike", "tumbles", "soars",
+    "price", "rally", "sell-off", "dump",
+    "hack", "exploit", "breach", "outage", "ban",
+    "approved", "approval", "denied", "denial", "etf", "sec"
+]
+MOVE_WORDS = ["price", "rise", "drop", "surge", "plunge", "soar", "tumble"]
+HARD_EVENTS = [
+    "halting withdrawals", "withdrawals halted", "withdrawals paused",
+    "exchange outage", "downtime", "service disruption",
+    "hack", "exploit", "security breach",
+    "sec approves", "sec approved", "etf approved", "etf approval",
+    "sec denies", "sec denied", "etf denied"
+]
+
+# Rule flags
+_KW = 1
+_MOVE = 2
+_HARD = 4
+_ALL = _KW | _MOVE | _HARD
+
+_PERCENT_RE = re.compile(r"(\d{1,3})\s?%")
+
+
+def _literal_table(rules: Dict[int, List[str]]) -> List[Tuple[str, int]]:
+    """Distinct literals with the OR of every rule they satisfy.
+
+    A literal also carries the flags of every shorter literal it contains, since
+    an occurrence of e.g. "sec approves" is also an occurrence of "sec". Literals
+    settling more rules are tried first so the scan can stop early.
+    """
+    literals: Dict[str, int] = {}
+    for flag, words in rules.items():
+        for w in words:
+            literals[w] = literals.get(w, 0) | flag
+    table = []
+    for lit in literals:
+        flags = 0
+        for other, f in literals.items():
+            if other in lit:
+                flags |= f
+        table.append((lit, flags))
+    table.sort(key=lambda item: bin(item[1]).count("1"), reverse=True)
+    return table
+
+
+@dataclass
+class BreakingScore:
+    is_breaking: bool
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+    def as_extra(self) -> Dict:
+        data = {"isBreaking": bool(self.is_breaking), "breakingScore": float(round(self.score, 3))}
+        if self.reasons:
+            data["breakingReasons"] = list(self.reasons)
+        return data
+
+
+class BreakingNewsScorer:
+    def __init__(self, window_hours: Optional[float] = None, threshold: Optional[float] = None) -> None:
+        self.window_hours = window_hours if window_hours is not None else int(os.getenv("BREAKING_TIME_WINDOW_HOURS", "2"))
+        self.threshold = threshold if threshold is not None else float(os.getenv("BREAKING_SCORE_THRESHOLD", "0.6"))
+        self._title_literals = tuple(dict.fromkeys(KW_TITLE))
+        self._content_literals = _literal_table({_KW: KW_CONTENT, _MOVE: MOVE_WORDS, _HARD: HARD_EVENTS})
+
+    def _scan_title(self, tl: str) -> bool:
+        return any(k in tl for k in self._title_literals)
+
+    def _scan_content(self, cl: str) -> int:
+        """Rule flags present in `cl`; each literal is searched at most once and
+        only while one of its rules is still undecided."""
+        found = 0
+        for lit, flags in self._content_literals:
+            if flags & ~found and lit in cl:
+                found |= flags
+                if found == _ALL:
+                    break
+        return found
+
+    def score(
+        self,
+        title: Optional[str],
+        content: Optional[str],
+        published_at: Optional[datetime] = None,
+        now: Optional[datetime] = None,
+    ) -> BreakingScore:
+        now = now or datetime.utcnow()
+        tl = (title or "").lower()
+        cl = (content or "").lower()
+        score = 0.0
+        reasons: List[str] = []
+
+        # Freshness
+        try:
+            if published_at and (now - published_at).total_seconds() <= self.window_hours * 3600:
+                score += 0.4
+                reasons.append("fresh")
+        except Exception:
+            pass
+
+        found = self._scan_content(cl)
+        # Keywords (title > content)
+        if self._scan_title(tl):
+            score += 0.4
+            reasons.append("keyword_title")
+        elif found & _KW:
+            score += 0.2
+            reasons.append("keyword_content")
+
+        # Percent move (first "NN%" in the text)
+        perc = _PERCENT_RE.search(cl) if found & _MOVE else None
+        if perc:
+            pct = int(perc.group(1))
+            if pct >= 10:
+                score += 0.4
+            elif pct >= 7:
+                score += 0.3
+            reasons.append("percent_move")
+
+        # Hard events (immediate breaking)
+        hard_event = bool(found & _HARD)
+        if hard_event:
+            reasons.append("hard_event")
+
+        return BreakingScore(is_breaking=(score >= self.threshold) or hard_event, score=score, reasons=reasons)
+
+    def score_documents(self, docs: Iterable[Dict], now: Optional[datetime] = None) -> List[BreakingScore]:
+        """Batch API over News documents (dicts or a Mongo cursor): Title, Content, PublishedAt."""
+        return [
+            self.score(d.get("Title"), d.get("Content"), d.get("PublishedAt"), now=now)
+            for d in docs
+        ]
+
+    def score_frame(self, df, now: Optional[datetime] = None):
+        """Batch API over a pandas DataFrame with Title/Content/PublishedAt columns.
+
+        Returns a copy with isBreaking, breakingScore and breakingReasons columns.
+        """
+        out = df.copy()
+        results = self.score_documents(df.to_dict("records"), now=now)
+        out["isBreaking"] = [r.is_breaking for r in results]
+        out["breakingScore"] = [round(r.score, 3) for r in results]
+        out["breakingReasons"] = [r.reasons for r in results]
+        return out
+
+
+def merge_extra_json(extra_json: Optional[str], result: BreakingScore) -> str:
+    """Write the breaking fields into an ExtraJson string, keeping other keys."""
+    try:
+        data = json.loads(extra_json) if extra_json else {}
+        if not isinstance(data, dict):
+            data = {}
+    except Exception:
+        data = {}
+    data.pop("breakingReasons", None)
+    data.update(result.as_extra())
+    return json.dumps(data, ensure_ascii=False)
+
+
+_scorer: Optional[BreakingNewsScorer] = None
+
+
+def get_breaking_scorer() -> BreakingNewsScorer:
+    """Shared scorer configured from env (BREAKING_TIME_WINDOW_HOURS, BREAKING_SCORE_THRESHOLD)."""
+    global _scorer
+    if _scorer is None:
+        _scorer = BreakingNewsScorer()
+    return _scorer
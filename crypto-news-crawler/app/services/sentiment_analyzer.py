@@ -6,38 +6,131 @@ FinBERT provides domain-specific sentiment for finance/news; if unavailable, we
 fallback to VADER to avoid breaking functionality.
 """
 
-from typing import Dict
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
 
-# --- Try to use FinBERT (HuggingFace) ---
+from app.services.sentiment_cache import content_key, get_sentiment_cache
+
+# Inference settings (env):
+# - SENTIMENT_BATCH_SIZE (default 16)    # texts per forward pass
+# - SENTIMENT_THREADS (default: torch default) # intra-op CPU threads for FinBERT
+# - SENTIMENT_BATCH_WAIT_MS (default 10) # how long concurrent callers are coalesced
+# - SENTIMENT_BACKEND (default torch)    # torch | torch-int8 | onnx (see sentiment_backends.py)
+SENTIMENT_BATCH_SIZE = max(1, int(os.getenv("SENTIMENT_BATCH_SIZE", "16")))
+_BATCH_WAIT_SECONDS = float(os.getenv("SENTIMENT_BATCH_WAIT_MS", "10")) / 1000.0
+
+# --- FinBERT (HuggingFace), loaded on first use ---
+# Importing this module is cheap: torch/transformers, the model weights and the
+# VADER lexicon are only loaded by _ensure_finbert()/_ensure_vader(), either on
+# the first analysis call or by warm_up() in a background thread.
+_FINBERT_MODEL_NAME = os.getenv("SENTIMENT_MODEL", "yiyanghkust/finbert-tone")
 _FINBERT_AVAILABLE = False
 _finbert_model = None
 _finbert_tokenizer = None
+_finbert_backend = None
+_finbert_id2label: Dict[int, str] = {}
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch").strip().lower()
+
+# not_loaded -> loading -> ready | unavailable (VADER only)
+_finbert_state = "not_loaded"
+_finbert_load_seconds: Optional[float] = None
+_load_lock = threading.Lock()
+_ready = threading.Event()
+_vader = None
+
+
+def _load_finbert() -> None:
+    global _FINBERT_AVAILABLE, _finbert_model, _finbert_tokenizer, _finbert_backend
+    global _finbert_id2label, SENTIMENT_BACKEND
+    try:
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        import torch
 
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    import torch
+        if os.getenv("SENTIMENT_THREADS"):
+            torch.set_num_threads(max(1, int(os.getenv("SENTIMENT_THREADS"))))
+        _finbert_tokenizer = AutoTokenizer.from_pretrained(_FINBERT_MODEL_NAME)
+        _finbert_model = AutoModelForSequenceClassification.from_pretrained(_FINBERT_MODEL_NAME)
+        _finbert_model.eval()
+        _finbert_id2label = {int(i): str(l).lower() for i, l in _finbert_model.config.id2label.items()}
 
-    _FINBERT_MODEL_NAME = "yiyanghkust/finbert-tone"
-    _finbert_tokenizer = AutoTokenizer.from_pretrained(_FINBERT_MODEL_NAME)
-    _finbert_model = AutoModelForSequenceClassification.from_pretrained(_FINBERT_MODEL_NAME)
-    _finbert_model.eval()
-    _FINBERT_AVAILABLE = True
-except Exception as e:
-    # FinBERT unavailable; will fallback to VADER
-    _FINBERT_AVAILABLE = False
-    _finbert_model = None
-    _finbert_tokenizer = None
+        from app.services.sentiment_backends import load_backend
 
-# --- VADER fallback ---
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+        # Validated against fp32; falls back to the fp32 model on low agreement
+        _finbert_backend, _ = load_backend(SENTIMENT_BACKEND, _finbert_model, _finbert_tokenizer, _FINBERT_MODEL_NAME)
+        if _finbert_backend.name != "torch":
+            SENTIMENT_BACKEND = _finbert_backend.name
+            _finbert_model = None  # fp32 weights no longer needed
+        else:
+            SENTIMENT_BACKEND = "torch"
+        _FINBERT_AVAILABLE = True
+    except Exception as e:
+        # FinBERT unavailable; will fallback to VADER
+        _FINBERT_AVAILABLE = False
+        _finbert_model = None
+        _finbert_tokenizer = None
+        _finbert_backend = None
 
-try:
-    nltk.data.find('sentiment/vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon', quiet=True)
 
-_vader = SentimentIntensityAnalyzer()
+def _ensure_vader():
+    global _vader
+    if _vader is None:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        import nltk
+
+        try:
+            nltk.data.find('sentiment/vader_lexicon')
+        except LookupError:
+            nltk.download('vader_lexicon', quiet=True)
+        _vader = SentimentIntensityAnalyzer()
+    return _vader
+
+
+def _ensure_finbert() -> bool:
+    """Load FinBERT once (thread-safe); returns whether it is available."""
+    global _finbert_state, _finbert_load_seconds
+    if _ready.is_set():
+        return _FINBERT_AVAILABLE
+    with _load_lock:
+        if not _ready.is_set():
+            _finbert_state = "loading"
+            start = time.perf_counter()
+            _load_finbert()
+            if not _FINBERT_AVAILABLE:
+                _ensure_vader()
+            _finbert_load_seconds = time.perf_counter() - start
+            _finbert_state = "ready" if _FINBERT_AVAILABLE else "unavailable"
+            _ready.set()
+    return _FINBERT_AVAILABLE
+
+
+def warm_up(background: bool = True) -> None:
+    """Load the model now; with background=True in a daemon thread (returns immediately)."""
+    if _ready.is_set() or _finbert_state == "loading":
+        return
+    if background:
+        threading.Thread(target=_ensure_finbert, name="sentiment-warmup", daemon=True).start()
+    else:
+        _ensure_finbert()
+
+
+def is_ready() -> bool:
+    """True once the model (or the VADER fallback) is loaded and calls will not block on loading."""
+    return _ready.is_set()
+
+
+def sentiment_status() -> Dict[str, any]:
+    return {
+        "state": _finbert_state,
+        "ready": _ready.is_set(),
+        "model": sentiment_model_name() if _ready.is_set() else None,
+        "backend": SENTIMENT_BACKEND if _FINBERT_AVAILABLE else None,
+        "load_seconds": round(_finbert_load_seconds, 2) if _finbert_load_seconds is not None else None,
+        "cache": get_sentiment_cache().snapshot(),
+    }
 
 
 def _analyze_sentiment_vader(text: str) -> Dict[str, any]:
@@ -53,7 +146,7 @@ def _analyze_sentiment_vader(text: str) -> Dict[str, any]:
             'confidence': 0.0
         }
 
-    scores = _vader.polarity_scores(text)
+    scores = _ensure_vader().polarity_scores(text)
     compound = scores['compound']
     if compound >= 0.05:
         label = 'positive'
@@ -76,29 +169,21 @@ def _analyze_sentiment_vader(text: str) -> Dict[str, any]:
     }
 
 
-def _analyze_sentiment_finbert(text: str) -> Dict[str, any]:
-    """FinBERT-based sentiment analysis for financial/news text."""
-    if not text or len(text.strip()) == 0:
-        return {
-            'score': 0.0,
-            'label': 'neutral',
-            'compound': 0.0,
-            'positive': 0.0,
-            'negative': 0.0,
-            'neutral': 1.0,
-            'confidence': 0.0
-        }
+def _empty_result() -> Dict[str, any]:
+    return {
+        'score': 0.0,
+        'label': 'neutral',
+        'compound': 0.0,
+        'positive': 0.0,
+        'negative': 0.0,
+        'neutral': 1.0,
+        'confidence': 0.0
+    }
 
-    assert _finbert_model is not None and _finbert_tokenizer is not None
-    with torch.no_grad():
-        inputs = _finbert_tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-        outputs = _finbert_model(**inputs)
-        logits = outputs.logits  # shape [1, 3]
-        probs = torch.softmax(logits, dim=1)[0].tolist()
 
+def _finbert_result(probs: List[float]) -> Dict[str, any]:
     # Map probs to labels via id2label
-    id2label = {i: _finbert_model.config.id2label[i].lower() for i in range(len(probs))}
-    distro = {id2label[i]: probs[i] for i in range(len(probs))}
+    distro = {_finbert_id2label.get(i, str(i)): probs[i] for i in range(len(probs))}
     pos = float(distro.get('positive', 0.0))
     neg = float(distro.get('negative', 0.0))
     neu = float(distro.get('neutral', 0.0))
@@ -122,11 +207,98 @@ def _analyze_sentiment_finbert(text: str) -> Dict[str, any]:
     }
 
 
+def _analyze_sentiments_finbert(texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, any]]:
+    """Batched FinBERT inference; results are returned in input order.
+
+    Texts are tokenized together, sorted by token length so each batch pads to a
+    similar length, and run in fixed-size batches under torch.no_grad().
+    """
+    assert _finbert_backend is not None and _finbert_tokenizer is not None
+    batch_size = max(1, batch_size or SENTIMENT_BATCH_SIZE)
+    results: List[Optional[Dict[str, any]]] = [None] * len(texts)
+    todo = []
+    for i, text in enumerate(texts):
+        if not text or len(text.strip()) == 0:
+            results[i] = _empty_result()
+        else:
+            todo.append(i)
+    if not todo:
+        return results
+
+    encoded = _finbert_tokenizer([texts[i] for i in todo], truncation=True, max_length=512)
+    input_ids = encoded["input_ids"]
+    order = sorted(range(len(todo)), key=lambda k: len(input_ids[k]))
+    for b in range(0, len(order), batch_size):
+        chunk = order[b:b + batch_size]
+        features = [{key: encoded[key][k] for key in encoded.keys()} for k in chunk]
+        inputs = _finbert_tokenizer.pad(features, return_tensors="pt")
+        # Backend runs the forward pass under no_grad and returns softmax rows
+        for k, p in zip(chunk, _finbert_backend.probs(inputs)):
+            results[todo[k]] = _finbert_result(p)
+    return results
+
+
+def _analyze_sentiment_finbert(text: str) -> Dict[str, any]:
+    """FinBERT-based sentiment analysis for financial/news text."""
+    if not text or len(text.strip()) == 0:
+        return _empty_result()
+    _ensure_finbert()
+    return _analyze_sentiments_finbert([text])[0]
+
+
+class _MicroBatcher:
+    """Coalesces concurrent single-text requests into batched FinBERT calls.
+
+    Crawler worker threads each score one article; the batcher thread collects
+    requests arriving within SENTIMENT_BATCH_WAIT_MS (up to SENTIMENT_BATCH_SIZE)
+    and runs them as one batch, so the model also runs on a single thread pool.
+    """
+
+    def __init__(self, batch_size: int, wait_seconds: float) -> None:
+        self.batch_size = batch_size
+        self.wait_seconds = wait_seconds
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> "Future":
+        fut: Future = Future()
+        self._queue.put((text, fut))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._loop, name="sentiment-batcher", daemon=True)
+                    self._thread.start()
+        return fut
+
+    def _loop(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            try:
+                while len(items) < self.batch_size:
+                    items.append(self._queue.get(timeout=self.wait_seconds))
+            except queue.Empty:
+                pass
+            try:
+                results = _analyze_sentiments_finbert([t for t, _ in items], batch_size=self.batch_size)
+                for (_, fut), res in zip(items, results):
+                    fut.set_result(res)
+            except Exception as e:
+                for _, fut in items:
+                    fut.set_exception(e)
+
+
+_batcher = _MicroBatcher(SENTIMENT_BATCH_SIZE, _BATCH_WAIT_SECONDS)
+
+
 def analyze_sentiment(text: str) -> Dict[str, any]:
     """Public API: use FinBERT when available, else fallback to VADER."""
-    if _FINBERT_AVAILABLE:
+    if _ensure_finbert():
+        if not text or len(text.strip()) == 0:
+            return _empty_result()
         try:
-            return _analyze_sentiment_finbert(text)
+            # Cached by content hash; misses are batched with concurrent callers (crawler worker threads)
+            return _cached_finbert([text], lambda ts: [_batcher.submit(t).result() for t in ts])[0]
         except Exception:
             # In case of runtime error, fallback silently
             return _analyze_sentiment_vader(text)
@@ -134,6 +306,44 @@ def analyze_sentiment(text: str) -> Dict[str, any]:
         return _analyze_sentiment_vader(text)
 
 
+def analyze_sentiments(texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, any]]:
+    """Batch API: score many texts at once (FinBERT batches, else VADER), input order kept."""
+    if _ensure_finbert():
+        try:
+            return _cached_finbert(list(texts), lambda ts: _analyze_sentiments_finbert(ts, batch_size=batch_size))
+        except Exception:
+            pass
+    return [_analyze_sentiment_vader(t) for t in texts]
+
+
+def _model_id() -> str:
+    return f"FinBERT:{_FINBERT_MODEL_NAME}:{SENTIMENT_BACKEND}"
+
+
+def _cached_finbert(texts: List[str], compute) -> List[Dict[str, any]]:
+    """Serve FinBERT results from the content-hash cache; `compute` scores the misses.
+
+    Identical texts within one call are scored once. VADER results are not
+    cached (recomputing is cheaper than a lookup).
+    """
+    cache = get_sentiment_cache()
+    if not cache.enabled:
+        return compute(texts)
+    model_id = _model_id()
+    keys = [content_key(model_id, t) for t in texts]
+    found = cache.get_many(keys)
+    first: Dict[str, int] = {}
+    for i, k in enumerate(keys):
+        if k not in found and k not in first:
+            first[k] = i
+    computed: Dict[str, Dict[str, any]] = {}
+    if first:
+        results = compute([texts[i] for i in first.values()])
+        computed = dict(zip(first.keys(), results))
+        cache.put_many(model_id, computed)
+    return [dict(found.get(k) or computed[k]) for k in keys]
+
+
 def analyze_news_sentiment(title: str, content: str = None, summary: str = None) -> Dict[str, any]:
     """
     Analyze sentiment of a news article (title + content + summary)
@@ -147,20 +357,40 @@ def analyze_news_sentiment(title: str, content: str = None, summary: str = None)
         Sentiment analysis result
     """
     
+    return analyze_sentiment(_news_text(title, content, summary))
+
+
+def _news_text(title: str, content: str = None, summary: str = None) -> str:
     # Combine title, summary, and content for better analysis
-    texts = [title]
+    texts = [title or ""]
     if summary:
         texts.append(summary)
     if content:
         texts.append(content)
-    
-    combined_text = " ".join(texts)
-    return analyze_sentiment(combined_text)
+    return " ".join(texts)
+
+
+def analyze_news_sentiment_batch(news_items: list, batch_size: Optional[int] = None) -> List[Dict[str, any]]:
+    """
+    Analyze sentiment of many news articles in batches
+
+    Args:
+        news_items: List of dicts with 'title', 'content', 'summary'
+        batch_size: Texts per forward pass (default SENTIMENT_BATCH_SIZE)
+
+    Returns:
+        Sentiment results in the same order as news_items
+    """
+    texts = [
+        _news_text(item.get('title') or '', item.get('content'), item.get('summary'))
+        for item in news_items
+    ]
+    return analyze_sentiments(texts, batch_size=batch_size)
 
 
 def sentiment_model_name() -> str:
-    """Return the sentiment model name currently in use."""
-    return "FinBERT" if _FINBERT_AVAILABLE else "VADER"
+    """Return the sentiment model name currently in use (loads the model if needed)."""
+    return "FinBERT" if _ensure_finbert() else "VADER"
 
 
 def batch_analyze_sentiment(news_items: list) -> list:
@@ -174,13 +404,8 @@ def batch_analyze_sentiment(news_items: list) -> list:
         List of news items with added 'sentiment_label' and 'sentiment_score'
     """
     
-    for item in news_items:
-        result = analyze_news_sentiment(
-            title=item.get('title', ''),
-            content=item.get('content', ''),
-            summary=item.get('summary', '')
-        )
-        
+    results = analyze_news_sentiment_batch(news_items)
+    for item, result in zip(news_items, results):
         item['sentiment_score'] = result['score']
         item['sentiment_label'] = result['label']
     
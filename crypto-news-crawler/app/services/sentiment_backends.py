@@ -0,0 +1,182 @@
+"""
+app/services/sentiment_backends.py
+
+CPU inference backends for the FinBERT classifier.
+
+- torch       : the fp32 HuggingFace model as loaded (reference)
+- torch-int8  : dynamic int8 quantization of the Linear layers (torch.ao)
+- onnx        : the model exported to ONNX and run with onnxruntime (CPU)
+
+Every backend takes a padded batch from the tokenizer (PyTorch tensors) and
+returns softmax probabilities per row. A non-reference backend is checked
+against fp32 on a small calibration set; if label agreement is below
+SENTIMENT_MIN_AGREEMENT the analyzer falls back to fp32.
+
+Env vars:
+- SENTIMENT_BACKEND (default torch)           # torch | torch-int8 | onnx
+- SENTIMENT_ONNX_PATH (default ~/.cache/crypto-news/<model>.onnx)
+- SENTIMENT_MIN_AGREEMENT (default 0.95)      # label agreement vs fp32
+"""
+
+import copy
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import torch
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+# Calibration headlines used to validate a backend against fp32
+CALIBRATION_TEXTS = [
+    "Bitcoin Reaches New All-Time High as ETF inflows accelerate",
+    "Crypto Market Crashes Amid Regulatory Concerns; traders brace for more losses",
+    "Ethereum Foundation Announces New Upgrade to improve scalability and reduce fees",
+    "Bitcoin Faces Pressure from Bearish Sentiment after miners sell reserves",
+    "SEC Approves First Bitcoin Futures ETF, marking a milestone for the industry",
+    "Exchange halts withdrawals after security breach; users report missing funds",
+    "Solana network suffers outage for the third time this quarter",
+    "Stablecoin issuer publishes attestation showing full reserves backing",
+    "Shares of the miner fell 12% after quarterly revenue missed estimates",
+    "The company reported record profit and raised its full-year guidance",
+    "Regulators fined the exchange $4 million over compliance failures",
+    "Trading volume was flat on Tuesday as investors awaited inflation data",
+    "Analysts upgraded the stock citing strong demand for its custody services",
+    "The token plunged 30% after the team disclosed an exploit in its bridge",
+    "The central bank left interest rates unchanged, in line with expectations",
+    "Venture funding for crypto startups dropped to its lowest level in three years",
+]
+
+
+class TorchBackend:
+    name = "torch"
+
+    def __init__(self, model) -> None:
+        self.model = model
+
+    def probs(self, inputs) -> List[List[float]]:
+        with torch.no_grad():
+            logits = self.model(**inputs).logits  # shape [batch, num_labels]
+            return torch.softmax(logits, dim=1).tolist()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    name = "torch-int8"
+
+    def __init__(self, model) -> None:
+        # Dynamic quantization: int8 weights for Linear layers, activations quantized on the fly
+        quantized = torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        quantized.eval()
+        super().__init__(quantized)
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, model, tokenizer, model_name: str) -> None:
+        import onnxruntime as ort
+
+        path = Path(os.getenv("SENTIMENT_ONNX_PATH") or self.default_path(model_name))
+        if not path.exists():
+            self.export(model, tokenizer, path)
+        opts = ort.SessionOptions()
+        threads = torch.get_num_threads()
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(path), sess_options=opts, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.path = path
+
+    @staticmethod
+    def default_path(model_name: str) -> Path:
+        safe = model_name.strip("/").replace("/", "__")
+        return Path.home() / ".cache" / "crypto-news" / f"{safe}.onnx"
+
+    @staticmethod
+    def export(model, tokenizer, path: Path) -> None:
+        """Export the classifier with dynamic batch/sequence axes."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sample = tokenizer(["export sample", "a longer export sample text"], padding=True, return_tensors="pt")
+        names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+        axes = {n: {0: "batch", 1: "sequence"} for n in names}
+        axes["logits"] = {0: "batch"}
+        tmp = path.with_suffix(".onnx.tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[n] for n in names),
+                str(tmp),
+                input_names=names,
+                output_names=["logits"],
+                dynamic_axes=axes,
+                opset_version=17,
+                dynamo=False,
+            )
+        os.replace(tmp, path)
+        print(f"[Sentiment] Exported ONNX model to {path}")
+
+    def probs(self, inputs) -> List[List[float]]:
+        feed = {n: inputs[n].numpy() for n in self.input_names if n in inputs}
+        logits = torch.from_numpy(self.session.run(["logits"], feed)[0])
+        return torch.softmax(logits, dim=1).tolist()
+
+
+def create_backend(name: str, model, tokenizer, model_name: str):
+    if name == "torch":
+        return TorchBackend(model)
+    if name == "torch-int8":
+        return QuantizedTorchBackend(model)
+    if name == "onnx":
+        return OnnxBackend(model, tokenizer, model_name)
+    raise ValueError(f"Unknown sentiment backend '{name}' (expected one of {', '.join(BACKENDS)})")
+
+
+def _batch_probs(backend, tokenizer, texts: List[str], batch_size: int = 8) -> List[List[float]]:
+    out: List[List[float]] = []
+    for b in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[b:b + batch_size], padding=True, truncation=True, max_length=512, return_tensors="pt")
+        out.extend(backend.probs(inputs))
+    return out
+
+
+def compare_backends(reference, candidate, tokenizer, texts: Optional[List[str]] = None) -> Dict[str, float]:
+    """Label agreement and max absolute probability difference of `candidate` vs `reference`."""
+    texts = texts or CALIBRATION_TEXTS
+    ref = _batch_probs(reference, tokenizer, texts)
+    cand = _batch_probs(candidate, tokenizer, texts)
+    agree = sum(
+        1 for r, c in zip(ref, cand) if max(range(len(r)), key=r.__getitem__) == max(range(len(c)), key=c.__getitem__)
+    )
+    max_diff = max((abs(a - b) for r, c in zip(ref, cand) for a, b in zip(r, c)), default=0.0)
+    return {"agreement": agree / len(texts) if texts else 1.0, "max_prob_diff": max_diff, "n": len(texts)}
+
+
+def load_backend(name: str, model, tokenizer, model_name: str) -> Tuple[object, Dict[str, float]]:
+    """Build the configured backend and validate it against fp32.
+
+    Returns (backend, report). Falls back to the fp32 TorchBackend when the
+    backend cannot be built or agreement is below SENTIMENT_MIN_AGREEMENT.
+    """
+    reference = TorchBackend(model)
+    if name == "torch":
+        return reference, {"agreement": 1.0, "max_prob_diff": 0.0, "n": 0}
+    min_agreement = float(os.getenv("SENTIMENT_MIN_AGREEMENT", "0.95"))
+    try:
+        backend = create_backend(name, model, tokenizer, model_name)
+        report = compare_backends(reference, backend, tokenizer)
+    except Exception as e:
+        print(f"[Sentiment] Backend '{name}' unavailable ({type(e).__name__}: {e}); using fp32 torch")
+        return reference, {"agreement": 1.0, "max_prob_diff": 0.0, "n": 0}
+    if report["agreement"] < min_agreement:
+        print(
+            f"[Sentiment] Backend '{name}' agreement {report['agreement']:.2%} < {min_agreement:.0%} "
+            f"vs fp32; using fp32 torch"
+        )
+        return reference, report
+    print(
+        f"[Sentiment] Using backend '{name}' (agreement {report['agreement']:.2%}, "
+        f"max prob diff {report['max_prob_diff']:.3f} vs fp32)"
+    )
+    return backend, report
@@ -0,0 +1,140 @@
+"""
+app/services/sentiment_cache.py
+
+Content-hash cache for sentiment results.
+
+Key = SHA-1 of (model id, whitespace-normalized text). Results live in an
+in-process LRU and, with the Mongo backend, in the `SentimentCache` collection
+so re-crawls, API reads, backfills and syndicated copies of a story reuse one
+inference across processes.
+
+Env vars:
+- SENTIMENT_CACHE_SIZE (default 10000)  # LRU entries, 0 disables the cache
+- SENTIMENT_CACHE_MONGO (default 1)     # persist results in MongoDB
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+_WS_RE = re.compile(r"\s+")
+
+
+def content_key(model_id: str, text: str) -> str:
+    norm = _WS_RE.sub(" ", text or "").strip()
+    return hashlib.sha1(f"{model_id}\0{norm}".encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    def __init__(self, max_size: Optional[int] = None, use_mongo: Optional[bool] = None) -> None:
+        self.max_size = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000")) if max_size is None else max_size
+        if use_mongo is None:
+            use_mongo = os.getenv("SENTIMENT_CACHE_MONGO", "1") == "1"
+        self.use_mongo = use_mongo
+        self._lru: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stored": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _remember(self, key: str, result: Dict) -> None:
+        self._lru[key] = result
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def _collection(self):
+        if not self.use_mongo:
+            return None
+        try:
+            from app.core.storage import BACKEND, db_session
+
+            if BACKEND != "mongo":
+                self.use_mongo = False
+                return None
+            with db_session() as db:
+                return db.SentimentCache
+        except Exception as e:
+            print(f"[SentimentCache] Mongo unavailable, memory only: {e}")
+            self.use_mongo = False
+            return None
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Cached results for `keys` (memory first, then one batched Mongo query)."""
+        found: Dict[str, Dict] = {}
+        if not self.enabled:
+            return found
+        with self._lock:
+            for k in keys:
+                hit = self._lru.get(k)
+                if hit is not None:
+                    self._lru.move_to_end(k)
+                    found[k] = hit
+            self.stats["memory_hits"] += len(found)
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        coll = self._collection() if missing else None
+        if coll is not None:
+            try:
+                docs = coll.find({"_id": {"$in": missing}}, {"result": 1})
+                with self._lock:
+                    for d in docs:
+                        if isinstance(d.get("result"), dict):
+                            found[d["_id"]] = d["result"]
+                            self._remember(d["_id"], d["result"])
+                            self.stats["db_hits"] += 1
+            except Exception as e:
+                print(f"[SentimentCache] Lookup failed: {e}")
+        with self._lock:
+            self.stats["misses"] += sum(1 for k in missing if k not in found)
+        return found
+
+    def put_many(self, model_id: str, items: Dict[str, Dict]) -> None:
+        if not self.enabled or not items:
+            return
+        with self._lock:
+            for k, v in items.items():
+                self._remember(k, v)
+            self.stats["stored"] += len(items)
+        coll = self._collection()
+        if coll is None:
+            return
+        now = datetime.utcnow()
+        docs = [{"_id": k, "model": model_id, "result": v, "CreatedAt": now} for k, v in items.items()]
+        try:
+            coll.insert_many(docs, ordered=False)
+        except Exception as e:
+            # Duplicate keys mean another process stored the same content first
+            if "E11000" not in str(e) and "duplicate" not in str(e).lower():
+                print(f"[SentimentCache] Store failed: {e}")
+
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["db_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            out = dict(self.stats)
+            out["size"] = len(self._lru)
+        out["hit_rate"] = round(self.hit_rate(), 4)
+        return out
+
+
+_cache: Optional[SentimentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache() -> SentimentCache:
+    """Process-wide SentimentCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SentimentCache()
+    return _cache
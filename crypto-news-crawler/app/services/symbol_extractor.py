@@ -4,7 +4,10 @@ app/services/symbol_extractor.py
 Service để trích xuất các cryptocurrency symbols được nhắc đến trong bài viết.
 """
 
+import os
 import re
+import threading
+import time
 from typing import List, Set, Dict, Optional
 from app.core.storage import db_session, BACKEND
 
@@ -53,23 +56,187 @@ CRYPTO_ALIASES = {
 }
 
 
+# Từ viết hoa thông dụng không coi là symbol
+STOPWORDS = {"US", "UK", "USA", "CEO", "CTO", "CFO", "API", "USD", "EUR"}
+
+_TOKEN_RE = re.compile(r"\w+")
+_PAIR_SEPARATORS = {"-", "/"}
+_QUOTES = ("USDT", "USD")
+
+
+def _is_code(tok: str) -> bool:
+    """2-10 ASCII letters (the [A-Z]{2,10} part of the symbol patterns)."""
+    return 2 <= len(tok) <= 10 and tok.isascii() and tok.isalpha()
+
+
+class _SymbolMatcher:
+    """All symbol patterns compiled into one token scan.
+
+    Text is split once into word runs; each run is checked with set/dict
+    lookups for the four patterns: $SYMBOL, standalone upper-case codes, alias
+    names (one or more words) and trading pairs (BTCUSDT, BTC/USD, BTC-USDT).
+    """
+
+    def __init__(self, bases: Set[str], aliases: Dict[str, str], stopwords: Set[str]):
+        self.bases = frozenset(bases)
+        self.codes = frozenset(b for b in bases if b not in stopwords)
+        self.words: Dict[str, str] = {}
+        # first word -> [(remaining words, symbol)] for multi-word aliases ("shiba inu")
+        self.phrases: Dict[str, List] = {}
+        for alias, symbol in aliases.items():
+            if symbol not in self.bases:
+                continue
+            parts = alias.lower().split(" ")
+            if len(parts) == 1:
+                self.words[parts[0]] = symbol
+            else:
+                self.phrases.setdefault(parts[0], []).append((parts[1:], symbol))
+        self._memo: Dict[str, Optional[tuple]] = {}
+
+    def _phrase_at(self, text: str, tokens: List, i: int, rest: List[str]) -> bool:
+        prev = tokens[i]
+        for k, word in enumerate(rest, start=1):
+            if i + k >= len(tokens):
+                return False
+            nxt = tokens[i + k]
+            if nxt.start() != prev.end() + 1 or text[prev.end()] != " " or nxt.group().lower() != word:
+                return False
+            prev = nxt
+        return True
+
+    def _classify(self, tok: str):
+        """What a word run can contribute, independent of its context (memoized)."""
+        code = _is_code(tok)
+        up = tok.upper()
+        low = tok.lower()
+        base_code = up if code and up in self.bases else None  # for $SYMBOL and X/USD
+        plain = tok if code and tok.isupper() and tok in self.codes else None
+        alias = self.words.get(low)
+        phrases = self.phrases.get(low)
+        pair = None
+        for quote in _QUOTES:
+            if up.endswith(quote):
+                base = up[: -len(quote)]
+                if _is_code(base) and base in self.bases:
+                    pair = base
+                break
+        if not (base_code or plain or alias or phrases or pair):
+            return None
+        return base_code, plain, alias, phrases, pair
+
+    def find(self, text: str) -> List[str]:
+        """Symbols in order of first appearance."""
+        found: Dict[str, None] = {}
+        tokens = list(_TOKEN_RE.finditer(text))
+        memo = self._memo
+        if len(memo) > 50000:
+            memo.clear()
+        for i, m in enumerate(tokens):
+            tok = m.group()
+            try:
+                info = memo[tok]
+            except KeyError:
+                info = memo[tok] = self._classify(tok)
+            if info is None:
+                continue
+            base_code, plain, alias, phrases, pair = info
+            # $SYMBOL
+            if base_code and m.start() > 0 and text[m.start() - 1] == "$":
+                found[base_code] = None
+            # Standalone code written in capitals (BTC, ETH)
+            if plain:
+                found[plain] = None
+            # Alias names (bitcoin, ether, shiba inu)
+            if alias:
+                found[alias] = None
+            if phrases:
+                for rest, sym in phrases:
+                    if self._phrase_at(text, tokens, i, rest):
+                        found[sym] = None
+            # Trading pair in one run: BTCUSDT, ETHUSD
+            if pair:
+                found[pair] = None
+            # Trading pair with separator: BTC/USD, BTC-USDT
+            if base_code and i + 1 < len(tokens):
+                nxt = tokens[i + 1]
+                if (nxt.start() == m.end() + 1 and text[m.end()] in _PAIR_SEPARATORS
+                        and nxt.group().upper() in _QUOTES):
+                    found[base_code] = None
+        return list(found)
+
+
 class SymbolExtractor:
-    """Extract cryptocurrency symbols from article text."""
+    """Extract cryptocurrency symbols from article text.
+
+    The Symbols collection is cached and reloaded after SYMBOL_CACHE_TTL seconds
+    (default 3600) or when `refresh()` is called (e.g. on a change notification).
+    """
     
-    def __init__(self):
+    def __init__(self, ttl: Optional[float] = None):
         self._cache: Optional[Dict[str, Set[str]]] = None
+        self._matcher: Optional[_SymbolMatcher] = None
+        self._loaded_at = 0.0
+        self.ttl = float(os.getenv("SYMBOL_CACHE_TTL", "3600")) if ttl is None else ttl
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Drop the cached symbols; the next call reloads them from the DB."""
+        with self._lock:
+            self._cache = None
+            self._matcher = None
+
+    def _expired(self) -> bool:
+        return self._cache is None or (self.ttl > 0 and time.time() - self._loaded_at > self.ttl)
+
+    def _get_matcher(self) -> _SymbolMatcher:
+        while True:
+            self._load_symbols_from_db()
+            matcher = self._matcher
+            if matcher is not None:  # None only if refresh() ran in between
+                return matcher
+
+    def watch_changes(self) -> Optional[threading.Thread]:
+        """Refresh on every Symbols change via a Mongo change stream (replica set required).
+
+        Returns the watcher thread, or None when change streams are unavailable
+        (the TTL still applies).
+        """
+        if BACKEND == "sql":
+            return None
+
+        def _watch():
+            try:
+                with db_session() as db:
+                    with db.get_collection("Symbols").watch() as stream:
+                        for _ in stream:
+                            self.refresh()
+            except Exception as e:
+                print(f"[SymbolExtractor] Change stream stopped, relying on TTL: {e}")
+
+        t = threading.Thread(target=_watch, name="symbols-watch", daemon=True)
+        t.start()
+        return t
     
     def _load_symbols_from_db(self) -> Dict[str, Set[str]]:
-        """Load active symbols from database and cache them.
+        """Load active symbols from database and cache them (TTL-bound).
         
         Returns:
             Dict with keys:
                 - 'symbols': Set of full trading pairs (BTCUSDT, ETHUSDT)
                 - 'bases': Set of base assets (BTC, ETH)
         """
-        if self._cache is not None:
+        if not self._expired():
             return self._cache
-        
+        with self._lock:
+            if not self._expired():
+                return self._cache
+            cache = self._fetch_symbols()
+            self._matcher = _SymbolMatcher(cache["bases"], CRYPTO_ALIASES, STOPWORDS)
+            self._cache = cache
+            self._loaded_at = time.time()
+            return cache
+
+    def _fetch_symbols(self) -> Dict[str, Set[str]]:
         try:
             with db_session() as db:
                 if BACKEND == "sql":
@@ -100,21 +267,19 @@ class SymbolExtractor:
                     symbols = {str(d.get("Symbol", "")).upper() for d in docs if d.get("Symbol")}
                     bases = {str(d.get("BaseAsset", "")).upper() for d in docs if d.get("BaseAsset")}
 
-                self._cache = {
+                return {
                     "symbols": symbols,
                     "bases": bases
                 }
         except Exception as e:
             print(f"[SymbolExtractor] Failed to load from DB: {e}")
             # Fallback to common crypto bases
-            self._cache = {
+            return {
                 "symbols": set(),
                 "bases": {"BTC", "ETH", "XRP", "ADA", "SOL", "DOT", "DOGE", "AVAX", 
                          "MATIC", "LINK", "LTC", "UNI", "BNB", "XLM", "ATOM", "XMR", 
                          "TRX", "TON", "SHIB"}
             }
-        
-        return self._cache
     
     def map_to_trading_pairs(self, base_symbols: List[str], quote_currency: str = "USDT") -> Dict[str, str]:
         """Map base symbols to full trading pairs.
@@ -165,54 +330,11 @@ class SymbolExtractor:
         if not text:
             return []
         
-        found_symbols: Set[str] = set()
-        text_lower = text.lower()
-        text_upper = text.upper()
-        
-        # Load valid symbols from DB
-        symbol_data = self._load_symbols_from_db()
-        valid_bases = symbol_data["bases"]
-        valid_symbols = symbol_data["symbols"]
-        
-        # Pattern 1: $SYMBOL format (e.g., $BTC, $ETH)
-        # Tìm $XXX với 2-10 ký tự chữ hoa
-        for match in re.finditer(r'\$([A-Z]{2,10})\b', text_upper):
-            sym = match.group(1)
-            if sym in valid_bases:
-                found_symbols.add(sym)
-        
-        # Pattern 2: Standalone crypto codes (e.g., BTC, ETH)
-        # Tìm từ viết hoa 2-10 ký tự, không phải đầu câu
-        for match in re.finditer(r'(?<![A-Z])\b([A-Z]{2,10})\b(?![A-Z])', text):
-            sym = match.group(1)
-            # Kiểm tra không phải từ thông dụng tiếng Anh
-            if sym in valid_bases and sym not in {"US", "UK", "USA", "CEO", "CTO", "CFO", "API", "USD", "EUR"}:
-                found_symbols.add(sym)
-        
-        # Pattern 3: Full crypto names (e.g., Bitcoin, Ethereum)
-        # Tìm tên tiền mã hóa phổ biến
-        for alias, symbol in CRYPTO_ALIASES.items():
-            # Dùng word boundary để tránh match một phần từ
-            pattern = r'\b' + re.escape(alias) + r'\b'
-            if re.search(pattern, text_lower):
-                if symbol in valid_bases:
-                    found_symbols.add(symbol)
-        
-        # Pattern 4: Trading pairs (e.g., BTC/USD, BTC-USD, BTCUSDT)
-        for match in re.finditer(r'\b([A-Z]{2,10})[\-/]?USD[T]?\b', text_upper):
-            base = match.group(1)
-            if base in valid_bases:
-                found_symbols.add(base)
-        
-        # Sắp xếp theo thứ tự xuất hiện trong text (ưu tiên symbols xuất hiện trước)
-        # và giới hạn số lượng
-        result = []
-        for sym in found_symbols:
-            if len(result) >= max_results:
-                break
-            result.append(sym)
-        
-        return sorted(result)  # Sort alphabetically for consistency
+        # One pass over the text: $SYMBOL, standalone codes (BTC), alias names
+        # (Bitcoin, Ethereum) and trading pairs (BTC/USD, BTCUSDT), keeping the
+        # order of first appearance so the earliest mentions win the limit
+        found = self._get_matcher().find(text)
+        return sorted(found[:max_results])  # Sort alphabetically for consistency
     
     def extract_with_trading_pairs(self, text: str, max_results: int = 10, quote_currency: str = "USDT") -> Dict[str, List[str]]:
         """Extract symbols and map to trading pairs.
@@ -251,6 +373,8 @@ def get_symbol_extractor() -> SymbolExtractor:
     global _symbol_extractor
     if _symbol_extractor is None:
         _symbol_extractor = SymbolExtractor()
+        if os.getenv("SYMBOL_CACHE_WATCH", "0") == "1":
+            _symbol_extractor.watch_changes()
     return _symbol_extractor
 
 
@@ -0,0 +1,72 @@
+"""
+Measure cold import time and resident memory for each entry point.
+
+Each module is imported in a fresh interpreter; the child reports wall time of
+the import and VmRSS / peak RSS afterwards. With --score the child also scores
+one headline, which shows the cost that moved from import to first use.
+
+Usage:
+    python scripts/bench_cold_start.py
+    python scripts/bench_cold_start.py --score
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "app.services.sentiment_analyzer",
+    "app.crawlers.base_crawler",
+    "app.scripts.run_all_crawlers",
+    "app.api.main_api",
+]
+
+_CHILD = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+__import__(sys.argv[1])
+t1 = time.perf_counter()
+first = None
+if sys.argv[2] == "1":
+    from app.services.sentiment_analyzer import analyze_sentiment
+    analyze_sentiment("Bitcoin Reaches New All-Time High")
+    first = time.perf_counter() - t1
+rss = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss = int(line.split()[1]) / 1024.0
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+print(json.dumps({"import_s": t1 - t0, "first_score_s": first, "rss_mb": rss, "peak_mb": peak}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time / RSS per entry point")
+    parser.add_argument("--score", action="store_true", help="Also time the first sentiment call")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    print(f"{'entry point':<36}{'import s':>10}{'1st score s':>13}{'RSS MB':>9}{'peak MB':>9}")
+    for module in args.modules:
+        proc = subprocess.run(
+            [sys.executable, "-c", _CHILD, module, "1" if args.score else "0"],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            err = (proc.stderr.strip().splitlines() or ["?"])[-1][:120]
+            print(f"{module:<36} failed: {err}")
+            continue
+        r = json.loads(lines[-1])
+        first = f"{r['first_score_s']:.2f}" if r["first_score_s"] is not None else "-"
+        print(f"{module:<36}{r['import_s']:>10.2f}{first:>13}{r['rss_mb']:>9.0f}{r['peak_mb']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark crawler config lookups: disk IO per article with and without the
+in-memory config cache (BaseNewsCrawler.get_config).
+
+For each article of a simulated crawl the config is looked up once, either
+resolved from the *_config_cache.json file every time (what get_config did
+before the cache, now `_resolve_config`) or through get_config. Reports per
+lookup: µs, files opened (Python audit hook) and read/write syscalls plus
+bytes (kernel counters in /proc/self/io, Linux only; process-wide, so run it
+on an otherwise idle interpreter).
+
+Scenarios:
+- cache-file: the crawler's cache file exists and is valid;
+- default: no cache file, so the first resolve writes the default config.
+
+The crawler's cache file is copied to a temporary directory; the one in
+app/crawlers is never modified. Finally the cache is checked to pick up an
+edited file (mtime change) and `refresh_config()`.
+
+Usage:
+    python scripts/bench_config.py
+    python scripts/bench_config.py --crawler decrypt --articles 5000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.scripts.run_all_crawlers import AVAILABLE
+
+_opens = 0
+
+
+def _audit(event, args):
+    global _opens
+    if event == "open":
+        _opens += 1
+
+
+def _io_counters():
+    try:
+        with open("/proc/self/io") as f:
+            return {k: int(v) for k, v in (line.split(":") for line in f)}
+    except OSError:
+        return None
+
+
+def _measure(fn, n: int):
+    global _opens
+    before_io = _io_counters()
+    # Opening /proc/self/io is itself counted: start the open counter after it
+    opens_before = _opens
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - t0
+    opens = _opens - opens_before
+    after_io = _io_counters()
+    row = {"us": elapsed / n * 1e6, "opens": opens / n}
+    if before_io and after_io:
+        for key in ("syscr", "syscw", "rchar", "wchar"):
+            row[key] = (after_io[key] - before_io[key]) / n
+    return row
+
+
+def _print(name: str, row: dict) -> None:
+    io = (
+        f"  read syscalls {row['syscr']:7.2f}  write syscalls {row['syscw']:6.2f}"
+        f"  read B {row['rchar']:8.0f}  written B {row['wchar']:6.0f}"
+        if "syscr" in row
+        else "  (no /proc/self/io: syscall counts unavailable)"
+    )
+    print(f"  {name:9} {row['us']:9.1f} µs  opens {row['opens']:5.2f}{io}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler config lookup benchmark")
+    parser.add_argument("--crawler", default="coindesk", choices=sorted(AVAILABLE))
+    parser.add_argument("--articles", type=int, default=2000, help="Config lookups (one per article)")
+    args = parser.parse_args()
+    sys.addaudithook(_audit)
+
+    crawler = AVAILABLE[args.crawler]()
+    original = crawler._cache_path
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in ("cache-file", "default"):
+            print(f"{args.crawler} / {scenario}: {args.articles} lookups, per lookup")
+            for name in ("uncached", "cached"):
+                path = Path(tmp) / f"{scenario}-{name}.json"
+                if scenario == "cache-file" and original.exists():
+                    shutil.copyfile(original, path)
+                crawler._cache_path = path
+                crawler._config = None
+                fn = crawler._resolve_config if name == "uncached" else crawler.get_config
+                _print(name, _measure(fn, args.articles))
+
+        # Invalidation: an edited cache file is picked up once its mtime changes
+        os.environ["CRAWLER_CONFIG_RECHECK_SECONDS"] = "0"
+        path = crawler._cache_path
+        cfg = dict(crawler.get_config())
+        cfg["url_prefix"] = (cfg.get("url_prefix") or "") + "/edited"
+        time.sleep(0.01)
+        path.write_text(json.dumps(cfg), encoding="utf-8")
+        picked_up = crawler.get_config().get("url_prefix") == cfg["url_prefix"]
+        cfg["url_prefix"] += "-again"
+        path.write_text(json.dumps(cfg), encoding="utf-8")
+        os.utime(path, ns=(crawler._config_mtime, crawler._config_mtime))
+        stale = crawler.get_config().get("url_prefix") != cfg["url_prefix"]
+        refreshed = crawler.refresh_config().get("url_prefix") == cfg["url_prefix"]
+        print(
+            f"invalidation: edited file picked up {'yes' if picked_up else 'NO'}, "
+            f"same mtime kept {'yes' if stale else 'NO'}, refresh_config {'yes' if refreshed else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark date parsing: dateparser.parse vs app.core.dates.parse_date.
+
+Samples are the date strings the crawler actually reads: RSS/Atom
+published/updated values, article:published_time meta tags, <time datetime>
+attributes and JSON-LD dates. They are taken from a recorded fetch archive
+(see scripts/bench_replay.py) or, without one, from built-in samples in the
+formats of the crawled sources.
+
+Reports µs/date for dateparser, for parse_date without memoization (fast paths
+only) and for parse_date with the memo over the per-article access pattern
+(each date read several times), plus the share of strings served by each path
+and the number of strings where the two parsers disagree.
+
+Usage:
+    python scripts/bench_dates.py
+    python scripts/bench_dates.py --archive scripts/fixtures/archive --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timezone
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import dateparser
+
+from app.core.dates import DateParser
+
+BUILTIN_SAMPLES = [
+    # RSS pubDate (coindesk, cointelegraph, cnbc)
+    "Tue, 14 Oct 2025 12:01:02 +0000",
+    "Tue, 14 Oct 2025 08:01:02 -0400",
+    "Tue, 14 Oct 2025 12:01:02 GMT",
+    "Tue, 14 Oct 2025 12:01:02 EDT",
+    "Tue, 14 Oct 2025 19:01:02 +0700",
+    # Atom / meta / JSON-LD (decrypt, article:published_time, datePublished)
+    "2025-10-14T12:01:02.000Z",
+    "2025-10-14T12:01:02Z",
+    "2025-10-14T12:01:02+00:00",
+    "2025-10-14T15:01:02+03:00",
+    "2025-10-14T12:01:02.123456+00:00",
+    # trafilatura date, <time> text
+    "2025-10-14",
+    "Oct 14, 2025",
+    "October 14, 2025 at 12:01 PM UTC",
+]
+
+
+def _archive_samples(path: str):
+    import feedparser
+
+    from app.core.article_document import ArticleDocument
+    from app.core.fetch_archive import FetchArchive
+
+    archive = FetchArchive(path)
+    samples = []
+    for entries in archive._entries.values():
+        entry = entries[-1]
+        body = archive.body(entry)
+        feed = feedparser.parse(body)
+        if feed.entries:
+            for e in feed.entries:
+                samples += [e.get(k) for k in ("published", "updated") if e.get(k)]
+            continue
+        doc = ArticleDocument(entry["url"], body.decode("utf-8", errors="replace"))
+        for attr in ("property", "name", "itemprop"):
+            for name in ("article:published_time", "datePublished", "pubdate"):
+                value = doc.meta_content(attr, name)
+                if value:
+                    samples.append(value)
+        if doc.time_tag is not None and doc.time_tag.get("datetime"):
+            samples.append(doc.time_tag.get("datetime"))
+        for item in doc.jsonld_items():
+            if isinstance(item, dict):
+                samples += [str(item[k]) for k in ("datePublished", "dateModified") if item.get(k)]
+    return samples
+
+
+def _utc(dt):
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _time(fn, samples, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for s in samples:
+            fn(s)
+    return (time.perf_counter() - start) / (repeat * len(samples)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Date parsing benchmark")
+    parser.add_argument("--archive", help="Fetch archive directory with recorded feeds and pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=3, help="Times each date is read per article (memo run)")
+    args = parser.parse_args()
+
+    samples = _archive_samples(args.archive) if args.archive else []
+    if not samples:
+        if args.archive:
+            print(f"No dates found in {args.archive}; using built-in samples.")
+        samples = list(BUILTIN_SAMPLES)
+    distinct = list(dict.fromkeys(samples))
+
+    baseline = _time(dateparser.parse, samples, args.repeat)
+    fast = DateParser(cache_size=0)
+    fast_us = _time(fast.parse, samples, args.repeat)
+    memo = DateParser()
+    memo_us = _time(memo.parse, [s for s in samples for _ in range(max(1, args.reads))], args.repeat)
+
+    differ = [s for s in distinct if _utc(dateparser.parse(s)) != _utc(fast.parse(s))]
+    total = sum(fast.stats[k] for k in ("iso", "rfc822", "fallback", "failed")) or 1
+    print(f"dates: {len(samples)}  distinct: {len(distinct)}")
+    print(f"dateparser:           {baseline:9.1f} µs/date")
+    print(f"parse_date (no memo): {fast_us:9.1f} µs/date  ({baseline / fast_us:.0f}x)")
+    print(f"parse_date (memo):    {memo_us:9.1f} µs/read  ({args.reads} reads per date)")
+    print(
+        "paths: "
+        + ", ".join(f"{k} {fast.stats[k] / total:.0%}" for k in ("iso", "rfc822", "fallback", "failed"))
+    )
+    print(f"differing results: {len(differ)}")
+    for s in differ[:10]:
+        print(f"  {s!r}: dateparser={dateparser.parse(s)} parse_date={fast.parse(s)}")
+
+
+if __name__ == "__main__":
+    main()
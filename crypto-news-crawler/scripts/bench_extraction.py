@@ -0,0 +1,120 @@
+"""
+Benchmark per-article extraction CPU time on saved HTML fixtures.
+
+Fixtures are plain HTML files plus an `index.json` mapping file name -> {source, url}.
+No network access is needed to run the benchmark.
+
+Usage:
+    # Save up to 10 articles per crawler from the live feeds (one-time)
+    python scripts/bench_extraction.py --save 10 --fixtures scripts/fixtures
+    # Run the benchmark (each fixture extracted --repeat times)
+    python scripts/bench_extraction.py --fixtures scripts/fixtures --repeat 5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.core.fetcher import fetch_html
+from app.core.feed_snapshot import FeedSnapshot
+from app.crawlers.cnbc_crawler import CNBCCrawler
+from app.crawlers.coindesk_crawler import CoindeskCrawler
+from app.crawlers.cointelegraph_crawler import CointelegraphCrawler
+from app.crawlers.decrypt import DecryptCrawler
+
+CRAWLERS = {
+    "coindesk": CoindeskCrawler,
+    "cointelegraph": CointelegraphCrawler,
+    "decrypt": DecryptCrawler,
+    "cnbc": CNBCCrawler,
+}
+
+
+def _load_index(fixtures: str) -> dict:
+    path = os.path.join(fixtures, "index.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_fixtures(fixtures: str, per_source: int) -> None:
+    os.makedirs(fixtures, exist_ok=True)
+    index = _load_index(fixtures)
+    for code, cls in CRAWLERS.items():
+        crawler = cls()
+        urls = crawler.get_urls(crawler.get_config())[:per_source]
+        for url in urls:
+            try:
+                html = fetch_html(url)
+            except Exception as e:
+                print(f"[{code}] skip {url}: {e}")
+                continue
+            name = f"{code}__{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.html"
+            with open(os.path.join(fixtures, name), "w", encoding="utf-8") as f:
+                f.write(html)
+            index[name] = {"source": code, "url": url}
+            print(f"[{code}] saved {name}")
+    with open(os.path.join(fixtures, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def run_benchmark(fixtures: str, repeat: int) -> None:
+    index = _load_index(fixtures)
+    if not index:
+        print(f"No fixtures in {fixtures}; run with --save first.")
+        return
+    crawlers = {}
+    per_source = {}
+    for name, meta in sorted(index.items()):
+        code = meta.get("source")
+        if code not in CRAWLERS:
+            continue
+        if code not in crawlers:
+            crawler = CRAWLERS[code]()
+            cfg = crawler.get_config()
+            # Empty feed snapshot so extraction never touches the network
+            crawler._feed = FeedSnapshot(cfg.get("list_url") or "")
+            crawlers[code] = (crawler, cfg)
+        crawler, cfg = crawlers[code]
+        with open(os.path.join(fixtures, name), "r", encoding="utf-8") as f:
+            html = f.read()
+        for _ in range(repeat):
+            t0 = time.process_time()
+            crawler.extract_article(meta["url"], cfg, html=html)
+            per_source.setdefault(code, []).append((time.process_time() - t0) * 1000.0)
+
+    print(f"{'source':<15}{'n':>6}{'mean ms':>10}{'median':>10}{'p95':>10}")
+    all_samples = []
+    for code, samples in per_source.items():
+        all_samples.extend(samples)
+        p95 = sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+        print(f"{code:<15}{len(samples):>6}{statistics.mean(samples):>10.1f}"
+              f"{statistics.median(samples):>10.1f}{p95:>10.1f}")
+    if all_samples:
+        print(f"{'all':<15}{len(all_samples):>6}{statistics.mean(all_samples):>10.1f}"
+              f"{statistics.median(all_samples):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-article extraction CPU benchmark")
+    parser.add_argument("--fixtures", default=os.path.join(ROOT, "scripts", "fixtures"))
+    parser.add_argument("--save", type=int, default=0, help="Download N articles per source as fixtures")
+    parser.add_argument("--repeat", type=int, default=3, help="Extraction runs per fixture")
+    args = parser.parse_args()
+    if args.save:
+        save_fixtures(args.fixtures, args.save)
+    run_benchmark(args.fixtures, max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
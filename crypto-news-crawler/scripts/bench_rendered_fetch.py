@@ -0,0 +1,80 @@
+"""
+Benchmark rendered (Playwright) fetches through the persistent browser pool.
+
+Reports pages/min, average render time, blocked sub-requests and peak RSS of the
+crawler process plus its Chromium children.
+
+Usage:
+    ENABLE_RENDERED_FETCH=1 python scripts/bench_rendered_fetch.py --urls urls.txt --threads 4
+    ENABLE_RENDERED_FETCH=1 python scripts/bench_rendered_fetch.py --source cointelegraph --limit 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.core.browser_pool import get_browser_pool
+from app.core.fetcher import fetch_html_rendered
+
+
+def _source_urls(code: str, limit: int):
+    from app.crawlers.cnbc_crawler import CNBCCrawler
+    from app.crawlers.coindesk_crawler import CoindeskCrawler
+    from app.crawlers.cointelegraph_crawler import CointelegraphCrawler
+    from app.crawlers.decrypt import DecryptCrawler
+
+    crawlers = {
+        "coindesk": CoindeskCrawler,
+        "cointelegraph": CointelegraphCrawler,
+        "decrypt": DecryptCrawler,
+        "cnbc": CNBCCrawler,
+    }
+    crawler = crawlers[code]()
+    return crawler.get_urls(crawler.get_config())[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendered fetch throughput benchmark")
+    parser.add_argument("--urls", help="File with one URL per line")
+    parser.add_argument("--source", help="Crawler code to take URLs from (coindesk, cointelegraph, ...)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers")
+    parser.add_argument("--wait-selector", default=None, help="CSS selector for early exit, e.g. article")
+    args = parser.parse_args()
+
+    if os.getenv("ENABLE_RENDERED_FETCH") != "1":
+        print("ENABLE_RENDERED_FETCH=1 is required, otherwise plain HTTP is measured.")
+        return
+
+    if args.urls:
+        with open(args.urls, "r", encoding="utf-8") as f:
+            urls = [line.strip() for line in f if line.strip()][: args.limit]
+    elif args.source:
+        urls = _source_urls(args.source, args.limit)
+    else:
+        parser.error("--urls or --source is required")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.threads)) as pool:
+        sizes = list(pool.map(lambda u: len(fetch_html_rendered(u, wait_selector=args.wait_selector)), urls))
+    elapsed = time.perf_counter() - start
+
+    stats = get_browser_pool().render_stats()
+    print(f"pages:          {len(sizes)} in {elapsed:.1f}s ({len(sizes) / elapsed * 60:.1f} pages/min)")
+    print(f"rendered:       {int(stats['pages'])} ok, {int(stats['failures'])} failed, "
+          f"avg {stats['avg_render_seconds']:.2f}s/page")
+    print(f"blocked:        {int(stats['blocked_requests'])} sub-requests")
+    print(f"browser starts: {int(stats['launches'])}")
+    peak = stats.get("peak_rss_kb") or 0
+    print(f"peak RSS:       {peak / 1024:.0f} MB" if peak else "peak RSS:       n/a")
+
+
+if __name__ == "__main__":
+    main()
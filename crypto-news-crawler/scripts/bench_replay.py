@@ -0,0 +1,171 @@
+"""
+Deterministic crawl throughput benchmark on a recorded fetch archive.
+
+Feeds, list pages and article pages are recorded once from the live sites
+into a content-addressed archive (app/core/fetch_archive.py). The benchmark
+then replays them through the normal crawl path (feed discovery, CrawlEngine,
+extraction, symbols, breaking, sentiment) without network access or database
+writes, and reports articles/s plus wall and CPU time per stage for each crawler.
+
+Usage:
+    # Record up to 20 articles per crawler from the live sites (one-time)
+    python scripts/bench_replay.py --record 20 --archive scripts/fixtures/archive
+    # Replay (offline, CI)
+    python scripts/bench_replay.py --archive scripts/fixtures/archive --repeat 3
+    python scripts/bench_replay.py --crawlers coindesk decrypt --json bench.json
+
+The sentiment cache is disabled unless --sentiment-cache is given, so repeated
+runs measure inference rather than cache hits. Stage CPU is the calling
+thread's CPU time; work done in native thread pools (torch intra-op threads
+during sentiment) only shows up in the process-wide "cpu ms/art" column.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+CRAWLER_CODES = ["coindesk", "cointelegraph", "decrypt", "cnbc"]
+REPORT_STAGES = ["discover", "fetch", "parse", "extract", "near_dup", "symbols", "breaking", "sentiment"]
+
+
+def _crawlers():
+    from app.crawlers.cnbc_crawler import CNBCCrawler
+    from app.crawlers.coindesk_crawler import CoindeskCrawler
+    from app.crawlers.cointelegraph_crawler import CointelegraphCrawler
+    from app.crawlers.decrypt import DecryptCrawler
+
+    return {
+        "coindesk": CoindeskCrawler,
+        "cointelegraph": CointelegraphCrawler,
+        "decrypt": DecryptCrawler,
+        "cnbc": CNBCCrawler,
+    }
+
+
+def crawl_once(cls, limit: int) -> dict:
+    """One cycle of `cls` over the active transport; articles are enriched but not stored."""
+    from app.core.crawl_engine import CrawlEngine
+    from app.core.crawl_metrics import CycleMetrics
+
+    crawler = cls()
+    metrics = crawler._metrics = CycleMetrics(crawler.source_code)
+    cpu0 = time.process_time()
+    cfg = crawler.get_config()
+    with metrics.stage("discover"):
+        urls = crawler.get_urls(cfg)
+    if limit:
+        urls = urls[:limit]
+    enriched = []
+
+    def _process(url: str, html: str) -> None:
+        if crawler.enrich_article(url, cfg, html=html) is not None:
+            enriched.append(url)
+
+    stats = CrawlEngine(metrics=metrics).run(urls, _process)
+    metrics.incr("fetched", stats.fetched)
+    metrics.incr("failed", stats.failed)
+    report = metrics.finish()
+    report["cpu_s"] = time.process_time() - cpu0
+    report["articles"] = len(enriched)
+    return report
+
+
+def record(codes, limit: int) -> None:
+    from app.core.fetch_archive import get_fetch_archive
+
+    crawlers = _crawlers()
+    for code in codes:
+        print(f"\n=== Recording {code} ===")
+        report = crawl_once(crawlers[code], limit)
+        print(f"[{code}] {report['articles']} articles, {report['counters']['failed']} failed")
+    archive = get_fetch_archive()
+    print(f"\nArchive {archive.path}: {len(archive)} responses, {archive.stats}")
+
+
+def replay(codes, limit: int, repeat: int) -> dict:
+    from app.core.fetch_archive import get_fetch_archive
+    from app.core.near_duplicates import get_near_duplicate_index
+    from app.services.sentiment_analyzer import warm_up as warm_up_sentiment
+
+    archive = get_fetch_archive()
+    if not len(archive):
+        print(f"Archive {archive.path} is empty; run with --record first.")
+        return {}
+    # Model load is a one-time cost, not part of the per-article numbers
+    warm_up_sentiment(background=False)
+    crawlers = _crawlers()
+    results = {}
+    for code in codes:
+        runs = []
+        for _ in range(repeat):
+            archive.rewind()
+            # Otherwise every article of a repeat is a near-duplicate of the previous run
+            get_near_duplicate_index().clear()
+            runs.append(crawl_once(crawlers[code], limit))
+        results[code] = runs
+
+    print(f"\n{'source':<15}{'articles':>9}{'wall s':>9}{'art/s':>9}{'cpu ms/art':>12}")
+    summary = {}
+    for code, runs in results.items():
+        arts = runs[-1]["articles"]
+        wall = statistics.median(r["elapsed_s"] for r in runs)
+        cpu = statistics.median(r["cpu_s"] for r in runs)
+        rate = arts / wall if wall > 0 else 0.0
+        summary[code] = {"articles": arts, "wall_s": wall, "articles_per_s": rate, "cpu_s": cpu, "stages": {}}
+        print(f"{code:<15}{arts:>9}{wall:>9.2f}{rate:>9.2f}{(cpu * 1000 / arts if arts else 0.0):>12.1f}")
+
+    print(f"\nPer-stage time per article, median of {repeat} run(s) (wall ms / cpu ms)")
+    print(f"{'source':<15}" + "".join(f"{s:>18}" for s in REPORT_STAGES))
+    for code, runs in results.items():
+        cells = []
+        arts = max(1, runs[-1]["articles"])
+        for stage in REPORT_STAGES:
+            wall = statistics.median(r["stages"].get(stage, {}).get("total_ms", 0.0) for r in runs) / arts
+            cpu_values = [r["stages"][stage]["cpu_ms"] for r in runs if "cpu_ms" in r["stages"].get(stage, {})]
+            cpu = statistics.median(cpu_values) / arts if cpu_values else None
+            summary[code]["stages"][stage] = {"wall_ms": wall, "cpu_ms": cpu}
+            cells.append(f"{wall:.1f} / {cpu:.1f}" if cpu is not None else f"{wall:.1f} / -")
+        print(f"{code:<15}" + "".join(f"{c:>18}" for c in cells))
+    print(f"\nArchive: {archive.stats}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl throughput benchmark on recorded responses")
+    parser.add_argument("--archive", default=os.path.join(ROOT, "scripts", "fixtures", "archive"))
+    parser.add_argument("--record", type=int, default=0, help="Record N articles per crawler from the live sites")
+    parser.add_argument("--crawlers", nargs="*", default=CRAWLER_CODES, choices=CRAWLER_CODES)
+    parser.add_argument("--limit", type=int, default=0, help="Articles per crawler when replaying (0 = all recorded)")
+    parser.add_argument("--repeat", type=int, default=3, help="Replay runs per crawler (median reported)")
+    parser.add_argument("--sentiment-cache", action="store_true", help="Keep the sentiment result cache enabled")
+    parser.add_argument("--json", help="Write the summary to this file")
+    args = parser.parse_args()
+
+    # Must be set before the first HTTP client is created
+    os.environ["FETCH_ARCHIVE_MODE"] = "record" if args.record else "replay"
+    os.environ["FETCH_ARCHIVE_DIR"] = args.archive
+    os.environ["FEED_CONDITIONAL_GET"] = "0"
+    os.environ.setdefault("SKIP_AI_CONFIG", "1")
+    if not args.sentiment_cache:
+        os.environ["SENTIMENT_CACHE_SIZE"] = "0"
+        os.environ["SENTIMENT_CACHE_MONGO"] = "0"
+
+    if args.record:
+        record(args.crawlers, args.record)
+        return
+    summary = replay(args.crawlers, args.limit, max(1, args.repeat))
+    if args.json and summary:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
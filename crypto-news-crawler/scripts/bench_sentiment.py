@@ -0,0 +1,123 @@
+"""
+Benchmark sentiment inference throughput (texts/s) for several batch sizes.
+
+Texts come from the News collection (Title + Summary + Content) when MongoDB is
+reachable, otherwise from a built-in set of headlines repeated to --n texts.
+
+Usage:
+    python scripts/bench_sentiment.py --n 256 --batch-sizes 1 4 8 16 32
+    SENTIMENT_THREADS=4 python scripts/bench_sentiment.py --from-db
+    # Compare CPU backends (agreement vs fp32, latency, throughput, RSS)
+    python scripts/bench_sentiment.py --backends torch torch-int8 onnx
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SAMPLE_TEXTS = [
+    "Bitcoin Reaches New All-Time High as ETF inflows accelerate",
+    "Crypto Market Crashes Amid Regulatory Concerns; traders brace for more losses",
+    "Ethereum Foundation Announces New Upgrade to improve scalability and reduce fees",
+    "Bitcoin Faces Pressure from Bearish Sentiment after miners sell reserves",
+    "SEC Approves First Bitcoin Futures ETF, marking a milestone for the industry",
+    "Exchange halts withdrawals after security breach; users report missing funds",
+    "Solana network suffers outage for the third time this quarter",
+    "Stablecoin issuer publishes attestation showing full reserves backing",
+]
+
+
+def _db_texts(n: int):
+    from app.core.storage import db_session
+    from app.services.sentiment_analyzer import _news_text
+
+    with db_session() as db:
+        docs = db.News.find({}, {"Title": 1, "Summary": 1, "Content": 1}).sort("_id", -1).limit(n)
+        return [_news_text(d.get("Title") or "", d.get("Content"), d.get("Summary")) for d in docs]
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return 0.0
+
+
+def compare_backends(names, texts, batch_size: int) -> None:
+    import statistics
+
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    from app.services.sentiment_analyzer import _FINBERT_MODEL_NAME
+    from app.services.sentiment_backends import TorchBackend, _batch_probs, compare_backends, create_backend
+
+    tokenizer = AutoTokenizer.from_pretrained(_FINBERT_MODEL_NAME)
+    model = AutoModelForSequenceClassification.from_pretrained(_FINBERT_MODEL_NAME).eval()
+    reference = TorchBackend(model)
+    print(f"{'backend':<12}{'agree':>8}{'maxdiff':>9}{'ms/text@1':>11}{'texts/s@' + str(batch_size):>13}{'+RSS MB':>9}")
+    for name in names:
+        before = _rss_mb()
+        try:
+            backend = create_backend(name, model, tokenizer, _FINBERT_MODEL_NAME)
+        except Exception as e:
+            print(f"{name:<12} unavailable: {type(e).__name__}: {e}")
+            continue
+        report = compare_backends(reference, backend, tokenizer, texts[:64])
+        _batch_probs(backend, tokenizer, texts[:4], 4)  # warm-up
+        latencies = []
+        for t in texts[:32]:
+            start = time.perf_counter()
+            _batch_probs(backend, tokenizer, [t], 1)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        start = time.perf_counter()
+        _batch_probs(backend, tokenizer, texts, batch_size)
+        rate = len(texts) / (time.perf_counter() - start)
+        print(f"{name:<12}{report['agreement']:>8.1%}{report['max_prob_diff']:>9.3f}"
+              f"{statistics.median(latencies):>11.1f}{rate:>13.1f}{_rss_mb() - before:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment throughput benchmark")
+    parser.add_argument("--n", type=int, default=256, help="Number of texts")
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--from-db", action="store_true", help="Use recent News documents as input")
+    parser.add_argument("--backends", nargs="*", default=None,
+                        help="Compare backends instead (torch, torch-int8, onnx)")
+    args = parser.parse_args()
+
+    from app.services.sentiment_analyzer import analyze_sentiments, sentiment_model_name
+
+    texts = _db_texts(args.n) if args.from_db else []
+    if not texts:
+        texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.n)]
+    print(f"model: {sentiment_model_name()}  texts: {len(texts)}  "
+          f"avg chars: {sum(len(t) for t in texts) / len(texts):.0f}")
+
+    if args.backends:
+        compare_backends(args.backends, texts, max(args.batch_sizes or [16]))
+        return
+
+    analyze_sentiments(texts[:4])  # warm-up
+    baseline = None
+    print(f"{'batch':>6}{'seconds':>10}{'texts/s':>10}{'speedup':>9}")
+    for bs in args.batch_sizes:
+        start = time.perf_counter()
+        analyze_sentiments(texts, batch_size=bs)
+        elapsed = time.perf_counter() - start
+        rate = len(texts) / elapsed if elapsed > 0 else 0.0
+        baseline = baseline or rate
+        print(f"{bs:>6}{elapsed:>10.2f}{rate:>10.1f}{rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
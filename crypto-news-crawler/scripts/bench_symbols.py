@@ -0,0 +1,91 @@
+"""
+Benchmark symbol extraction on stored articles.
+
+Compares the previous per-alias regex implementation with the compiled
+single-pass matcher used by SymbolExtractor: time per article and the number of
+articles where the extracted symbol sets differ.
+
+Usage:
+    python scripts/bench_symbols.py --limit 2000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+# Ensure repo root is on sys.path when running directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.services.symbol_extractor import CRYPTO_ALIASES, STOPWORDS, get_symbol_extractor
+
+
+def legacy_extract(text: str, valid_bases) -> set:
+    """The previous implementation: four regex scans plus one re.search per alias."""
+    found = set()
+    text_lower = text.lower()
+    text_upper = text.upper()
+    for match in re.finditer(r'\$([A-Z]{2,10})\b', text_upper):
+        if match.group(1) in valid_bases:
+            found.add(match.group(1))
+    for match in re.finditer(r'(?<![A-Z])\b([A-Z]{2,10})\b(?![A-Z])', text):
+        sym = match.group(1)
+        if sym in valid_bases and sym not in STOPWORDS:
+            found.add(sym)
+    for alias, symbol in CRYPTO_ALIASES.items():
+        if re.search(r'\b' + re.escape(alias) + r'\b', text_lower) and symbol in valid_bases:
+            found.add(symbol)
+    for match in re.finditer(r'\b([A-Z]{2,10})[\-/]?USD[T]?\b', text_upper):
+        if match.group(1) in valid_bases:
+            found.add(match.group(1))
+    return found
+
+
+def _load_texts(limit: int):
+    try:
+        from app.core.storage import db_session
+
+        with db_session() as db:
+            docs = db.News.find({}, {"Title": 1, "Content": 1}).sort("_id", -1).limit(limit)
+            return [f"{d.get('Title') or ''}\n\n{d.get('Content') or ''}" for d in docs]
+    except Exception as e:
+        print(f"Could not read News: {e}")
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol extraction benchmark")
+    parser.add_argument("--limit", type=int, default=2000, help="Number of stored articles")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = _load_texts(args.limit)
+    if not texts:
+        print("No articles to benchmark.")
+        return
+    extractor = get_symbol_extractor()
+    bases = extractor._load_symbols_from_db()["bases"]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        legacy = [legacy_extract(t, bases) for t in texts]
+    legacy_s = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        new = [set(extractor._get_matcher().find(t)) for t in texts]
+    new_s = (time.perf_counter() - start) / args.repeat
+
+    diff = sum(1 for a, b in zip(legacy, new) if a != b)
+    avg_chars = sum(len(t) for t in texts) / len(texts)
+    print(f"articles: {len(texts)}  avg chars: {avg_chars:.0f}  bases: {len(bases)}")
+    print(f"legacy:   {legacy_s / len(texts) * 1e6:8.1f} µs/article")
+    print(f"compiled: {new_s / len(texts) * 1e6:8.1f} µs/article  ({legacy_s / new_s:.1f}x)")
+    print(f"differing symbol sets: {diff}")
+
+
+if __name__ == "__main__":
+    main()